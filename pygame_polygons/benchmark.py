@@ -0,0 +1,281 @@
+"""Headless benchmark of the ViewHome frame loop
+
+Boots the App under the SDL dummy video driver, fills the scene with N polygons of V vertices plus S stars, then replays
+a scripted mouse path (drag a polygon by its centroid, rotate it with the wheel, drag one of its vertices) for a fixed
+number of frames. The report is printed (or written) as JSON: frame time percentiles and a per-phase breakdown (the
+phases measured by the app FrameProfiler), so that the results of two versions can be compared.
+
+    python benchmark.py --polygons 30 --vertices 100 --stars 10 --frames 600 --output bench.json
+
+The frames are uncapped by default, to measure how fast they can go: --pacing capped (or busy_loop, vsync) measures
+the frame pacing of the app instead (see FramePacer), e.g. the jitter of the frame times.
+"""
+import os
+
+# no window, no sound: must be set before pygame is initialized
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keeps stdout a valid JSON document
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+from typing import Iterator, Optional
+import pygame as pg
+
+PERCENTILES: tuple = (50, 90, 95, 99)
+
+
+class ScriptedMouse:
+    """Stands in for the real mouse, the dummy video driver has neither a pointer nor system cursors.
+    Position and buttons are read by the app through pygame.mouse, clicks and wheel are posted as events.
+    """
+
+    def __init__(self):
+        self.position: tuple[int, int] = (0, 0)
+        self.pressed: bool = False
+        self.cursor: int = pg.SYSTEM_CURSOR_ARROW
+
+    def install(self) -> None:
+        pg.mouse.get_pos = lambda: self.position
+        pg.mouse.get_pressed = lambda num_buttons=3: (self.pressed, False, False, False, False)[:num_buttons]
+        pg.mouse.get_cursor = lambda: self.cursor
+        pg.mouse.set_cursor = self.set_cursor
+
+    def set_cursor(self, cursor: int, *_) -> None:
+        self.cursor = cursor
+
+    def move(self, position) -> None:
+        self.position = (int(position[0]), int(position[1]))
+
+    def press(self) -> None:
+        self.pressed = True
+        pg.event.post(pg.event.Event(pg.MOUSEBUTTONDOWN, button=1, pos=self.position))
+
+    def release(self) -> None:
+        self.pressed = False
+        pg.event.post(pg.event.Event(pg.MOUSEBUTTONUP, button=1, pos=self.position))
+
+    def wheel(self, direction: int) -> None:
+        pg.event.post(pg.event.Event(pg.MOUSEWHEEL, x=0, y=direction, flipped=False))
+
+
+def mouse_script(view, mouse: ScriptedMouse) -> Iterator[str]:
+    """Endless mouse path, one step per frame. Cycles through the polygons of the view:
+    drags a polygon by its centroid along a circle, rotates it both ways and drags its first vertex
+
+    :return: Iterator[str] name of the current action
+    """
+    if not view.polygons:
+        while True:
+            yield 'idle'
+    poly_index = 0
+    while True:
+        polygon = view.polygons[poly_index % len(view.polygons)]
+        poly_index += 1
+
+        # drag the centroid
+        start = polygon.centroid.copy()
+        mouse.move(start)
+        yield 'hover'
+        mouse.press()
+        yield 'press'
+        for step in range(30):
+            angle = 2 * math.pi * step / 30
+            mouse.move((start.x + 80 * math.sin(angle), start.y - 80 + 80 * math.cos(angle)))
+            yield 'drag_polygon'
+        mouse.release()
+        yield 'release'
+
+        # rotate
+        mouse.move(polygon.centroid)
+        yield 'hover'
+        for direction in (1, -1):
+            for _ in range(10):
+                mouse.wheel(direction)
+                yield 'rotate'
+
+        # drag a vertex
+        vertex = polygon.vertices[0].tolist()
+        mouse.move(vertex)
+        yield 'hover'
+        mouse.press()
+        yield 'press'
+        for step in range(20):
+            mouse.move((vertex[0] + step * 3, vertex[1] + step * 2))
+            yield 'drag_vertex'
+        mouse.release()
+        yield 'release'
+
+
+def build_scene(view, app, polygons: int, vertices: int, stars: int, seed: int) -> None:
+    """Fills the view with random polygons and stars, placed at the right of the left panel"""
+    from src.application.services import ShapeController
+
+    rng = random.Random(seed)
+    width, height = app.win_width, app.win_height
+    for _ in range(polygons):
+        radius = rng.randint(30, 120)
+        position = (rng.uniform(300 + radius, max(300 + radius, width - radius)),
+                    rng.uniform(radius, max(radius, height - radius)))
+        view.polygon_add(ShapeController.make_polygon(app, vertices, radius, position))
+    for _ in range(stars):
+        position = (rng.uniform(300, width), rng.uniform(0, height))
+        view.stars.append(ShapeController.make_polygon(app, 3, 150, position))
+
+
+def summary(values: list[float]) -> dict:
+    """Mean, percentiles and max of a list of milliseconds timings"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    result = {'mean': sum(ordered) / len(ordered)}
+    for percentile in PERCENTILES:
+        result[f'p{percentile}'] = percentile_of(ordered, percentile)
+    result['max'] = ordered[-1]
+    result['total'] = sum(ordered)
+    return {key: round(value, 4) for key, value in result.items()}
+
+
+def percentile_of(ordered: list[float], percentile: float) -> float:
+    """Linear interpolated percentile of an already sorted list"""
+    position = (len(ordered) - 1) * percentile / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def run_frames(view, update, script: Iterator[str], frames: int, warmup: int) -> tuple[list[float], dict]:
+    """Runs the frame loop of a view (see ViewManager.game_frame) collecting the app profiler timings of every frame
+
+    :return: tuple frame times, phase name -> phase times (ms, warmup frames excluded)
+    """
+    profiler = view.app.profiler
+    frame_times: list[float] = []
+    phase_times: dict[str, list[float]] = {}
+    for frame in range(warmup + frames):
+        next(script)
+        view.game_frame(update)
+        if frame < warmup:
+            continue
+        timings, _ = profiler.last
+        frame_times.append(timings[profiler.FRAME] * 1000)
+        for phase, seconds in timings.items():
+            if phase != profiler.FRAME:
+                # a phase may not run in every frame (e.g. polygon settings), count it as 0 ms
+                phase_times.setdefault(phase, [0.] * (len(frame_times) - 1)).append(seconds * 1000)
+        for times in phase_times.values():
+            times.extend([0.] * (len(frame_times) - len(times)))
+    return frame_times, phase_times
+
+
+def benchmark(polygons: int, vertices: int, stars: int, frames: int, warmup: int, win_size: tuple[int, int],
+              seed: int, dirty_rects: bool = False, pacing: str = 'uncapped', fps: int = 60,
+              render_scale: float = 1.) -> dict:
+    """Runs the benchmark and returns the report"""
+    pg.init()
+    mouse = ScriptedMouse()
+    mouse.install()
+
+    # initialize pygame before importing src
+    from src.app_runner import AppRunner
+    from src.application.views import ViewHome
+    from src.application.services import StartupTimer
+    from src.version import __app__
+
+    width, height = win_size
+    app = AppRunner.create_app(
+        frames=0 if pacing == 'uncapped' else fps,
+        pacing=pacing,
+        startup=StartupTimer(),
+        render_scale=render_scale,
+        screen_size='benchmark',
+        win_size=win_size,
+        win_width=width,
+        win_height=height,
+        chunk=max(1, width // 20)
+    )
+    app.dirty_rects.enabled = dirty_rects
+
+    view = ViewHome(app)
+    view.app.view_current = 'home'
+    update = view.view_logic()
+    app.startup.mark('view home')
+    build_scene(view, app, polygons, vertices, stars, seed)
+
+    frame_times, phase_times = run_frames(view, update, mouse_script(view, mouse), frames, warmup)
+    mean = sum(frame_times) / len(frame_times) if frame_times else 0
+    return {
+        'app': __app__,
+        'python': platform.python_version(),
+        'pygame': pg.version.ver,
+        'sdl': '.'.join(str(part) for part in pg.get_sdl_version()),
+        'video_driver': pg.display.get_driver(),
+        'scene': {
+            'polygons': polygons,
+            'vertices': vertices,
+            'stars': stars,
+            'win_size': list(win_size),
+            'seed': seed,
+            'dirty_rects': dirty_rects,
+            'render_scale': app.render_scale,
+        },
+        'startup_ms': app.startup.as_dict(),  # first_frame includes building the scene
+        'pacing': app.pacing,
+        'simulation': {'steps': app.timestep.steps, 'dropped_s': round(app.timestep.dropped, 4)},
+        'frames': len(frame_times),
+        'warmup': warmup,
+        'fps': round(mean and 1000 / mean or 0, 2),
+        'frame_ms': summary(frame_times),
+        'phases_ms': {phase: summary(times) for phase, times in phase_times.items()},
+        'counters': app.profiler.counters(),
+        'label_cache': app.label_cache.stats(),
+    }
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'size must be WIDTHxHEIGHT, got {value!r}')
+    return width, height
+
+
+def run(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--polygons', type=int, default=20, help='polygons in the scene')
+    parser.add_argument('--vertices', type=int, default=50, help='vertices of each polygon')
+    parser.add_argument('--stars', type=int, default=5, help='stars in the scene')
+    parser.add_argument('--frames', type=int, default=600, help='measured frames')
+    parser.add_argument('--warmup', type=int, default=30, help='frames run before measuring')
+    parser.add_argument('--size', type=parse_size, default=(1280, 720), help='window size, WIDTHxHEIGHT')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the scene')
+    parser.add_argument('--dirty-rects', action='store_true', help='use the dirty-rectangle rendering mode')
+    parser.add_argument('--pacing', default='uncapped', choices=('capped', 'vsync', 'busy_loop', 'uncapped'),
+                        help='frame pacing mode')
+    parser.add_argument('--fps', type=int, default=60, help='frames per second of the capped and busy_loop pacing')
+    parser.add_argument('--render-scale', type=float, default=1.,
+                        help='resolution the frames are drawn at, relative to the window size')
+    parser.add_argument('--output', help='write the JSON report to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    try:
+        report = benchmark(args.polygons, args.vertices, args.stars, args.frames, args.warmup, args.size, args.seed,
+                           args.dirty_rects, args.pacing, args.fps, args.render_scale)
+    finally:
+        pg.quit()
+
+    document = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(document + '\n')
+    else:
+        print(document)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
@@ -0,0 +1,87 @@
+"""Memory benchmark of the polygon model
+
+Creates N polygons of V vertices in a VertexStore (no window is needed, the polygons don't reference the app) and
+reports, as JSON, the bytes per polygon measured with tracemalloc, split between the polygon objects and the vertex
+store arrays.
+
+    python benchmark_memory.py --polygons 10000 --vertices 8 --dtype float32
+"""
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keeps stdout a valid JSON document
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import tracemalloc
+from typing import Optional
+import numpy as np
+
+
+def measure(polygons: int, vertices: int, dtype: str, seed: int) -> dict:
+    """Builds the scene and returns the report"""
+    from src.application.shapes import Polygon, VertexStore
+
+    rng = random.Random(seed)
+    positions = [(rng.uniform(0, 1920), rng.uniform(0, 1080)) for _ in range(polygons)]
+    Polygon.draw_regular_polygon(vertices, 1, (0, 0))  # warm up the unit polygon cache, it is shared by all
+
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+
+    # sized up-front, the growth of the arrays would make the peak depend on the doubling policy
+    store = VertexStore(capacity=polygons * (vertices + VertexStore.SLOT_HEADROOM), slots=polygons, dtype=dtype)
+    after_store, _ = tracemalloc.get_traced_memory()
+    shapes = [Polygon(store, vertices, 50, position) for position in positions]
+    gc.collect()
+    end, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = end - start
+    store_bytes = store.nbytes
+    objects_bytes = total - (after_store - start)
+    sample = shapes[0]
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scene': {
+            'polygons': polygons,
+            'vertices': vertices,
+            'dtype': np.dtype(dtype).name,
+            'seed': seed,
+        },
+        'bytes_total': total,
+        'bytes_peak': peak - start,
+        'bytes_per_polygon': round(total / polygons, 1),
+        'store_bytes_per_polygon': round(store_bytes / polygons, 1),
+        'objects_bytes_per_polygon': round(objects_bytes / polygons, 1),
+        'polygon_instance_bytes': sys.getsizeof(sample),
+        'polygon_has_dict': hasattr(sample, '__dict__'),
+    }
+
+
+def run(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--polygons', type=int, default=10_000, help='polygons in the scene')
+    parser.add_argument('--vertices', type=int, default=8, help='vertices of each polygon')
+    parser.add_argument('--dtype', choices=('float64', 'float32'), default='float64', help='vertex store coordinates')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the positions')
+    parser.add_argument('--output', help='write the JSON report to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    report = measure(args.polygons, args.vertices, args.dtype, args.seed)
+    document = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(document + '\n')
+    else:
+        print(document)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
@@ -1,3 +1,6 @@
+from time import perf_counter
+STARTED: float = perf_counter()  # the startup timing begins before pygame is imported
+
 import pygame as pg
 import traceback
 
@@ -13,8 +16,11 @@ def run():
         pg.init()
         # initialize pygame before importing src
         from src.app_runner import AppRunner
+        from src.application.services import StartupTimer
 
-        game = AppRunner()
+        startup = StartupTimer(STARTED)
+        startup.mark('import')
+        game = AppRunner(startup)
         game.on()
     except Exception as exception:
         print(repr(exception))
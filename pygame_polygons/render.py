@@ -0,0 +1,222 @@
+"""Headless offline render of a scene to an image sequence
+
+Opens a saved scene (see SceneFile, CTRL + S in the app) and renders an animation of it, without a window, as numbered
+PNG files: frame_00000.png, frame_00001.png... The frames are independent of each other (the state of frame N is
+computed from its time, N / fps), so they are split in chunks across a pool of processes, each one running its own
+headless pygame (SDL dummy video driver): the more cores, the faster.
+
+The animation is described by a JSON spec, every key is optional (the defaults are in DEFAULT_SPEC):
+
+    {
+        "frames": 120,                  frames rendered
+        "fps": 60,                      frames per second of the animation
+        "size": [1280, 720],            image size
+        "background": [0, 0, 0],        background color
+        "star_speed": null,             radians per second the stars spin, null is the speed of the app
+        "polygon_speed": 0,             radians per second the polygons rotate around their centroid
+        "camera": {"position": [0, 0], "zoom": 1}   camera of the app, see Camera
+    }
+
+    python render.py scene.pgs --spec animation.json --output frames --workers 8
+
+A JSON report (frames, time, frames per second) is printed at the end.
+"""
+import os
+
+# no window, no sound: must be set before pygame is initialized (in the workers too, they import this module)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keeps stdout a valid JSON document
+
+import argparse
+import json
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+from typing import Optional
+import pygame as pg
+
+DEFAULT_SPEC: dict = {
+    'frames': 120,
+    'fps': 60,
+    'size': [1280, 720],
+    'background': [0, 0, 0],
+    'star_speed': None,
+    'polygon_speed': 0.,
+    'camera': {'position': [0, 0], 'zoom': 1.},
+}
+CHUNKS_PER_WORKER: int = 4  # smaller chunks balance the load when some frames are slower than others
+FILE_NAME: str = 'frame_{:05d}.png'
+
+# state of a worker process, see worker_init
+_worker: dict = {}
+
+
+def load_spec(path: Optional[str] = None, **overrides) -> dict:
+    """The animation spec: the defaults, updated by the JSON file at path, updated by the overrides that are not None
+
+    :raises ValueError: when the spec is not valid
+    """
+    spec = {**DEFAULT_SPEC, 'camera': dict(DEFAULT_SPEC['camera'])}
+    if path:
+        with open(path, encoding='utf-8') as file:
+            document = json.load(file)
+        if not isinstance(document, dict):
+            raise ValueError(f'{path}: the animation spec must be a JSON object')
+        unknown = set(document) - set(DEFAULT_SPEC)
+        if unknown:
+            raise ValueError(f'{path}: unknown animation spec keys {sorted(unknown)}')
+        spec.update({key: value for key, value in document.items() if key != 'camera'})
+        spec['camera'].update(document.get('camera') or {})
+    spec.update({key: value for key, value in overrides.items() if value is not None})
+    if spec['frames'] < 0 or spec['fps'] <= 0 or min(spec['size']) <= 0 or spec['camera']['zoom'] <= 0:
+        raise ValueError(f'Animation spec not valid: {spec}')
+    return spec
+
+
+def worker_init(scene_path: str, spec: dict) -> None:
+    """Starts the headless pygame of a worker process and opens the scene, once per process"""
+    pg.init()
+
+    # initialize pygame before importing src
+    from src.application.services import SceneFile, Camera
+    from src.application.shapes import PolygonRenderer
+    from src.config.constants import STAR_ROTATION_SPEED
+
+    store, polygons, stars = SceneFile.load(scene_path)
+    surface = pg.Surface(spec['size'], pg.SRCALPHA)
+    camera = Camera(surface.get_rect())
+    camera.position[:] = spec['camera']['position']
+    camera.zoom = float(spec['camera']['zoom'])
+    _worker.update(
+        spec=spec,
+        surface=surface,
+        camera=camera,
+        renderer=PolygonRenderer(surface, None, None, camera),  # only rasterize is used: no labels, no dirty rects
+        polygons=polygons,
+        stars=stars,
+        # the frames are rotations of the shapes as they are saved
+        outlines=[(shape, shape.vertices.copy(), shape.centroid, is_star)
+                  for shapes, is_star in ((polygons, False), (stars, True)) for shape in shapes],
+        star_speed=STAR_ROTATION_SPEED if spec['star_speed'] is None else float(spec['star_speed']),
+        rasters={},  # polygon -> raster, offset: reused while the polygons do not rotate
+    )
+
+
+def render_frame(frame: int) -> pg.Surface:
+    """Renders a frame of the animation in the worker surface"""
+    from src.application.shapes import Polygon
+    from src.application.services import ShapeController
+
+    spec = _worker['spec']
+    seconds = frame / spec['fps']
+    polygon_angle, star_angle = float(spec['polygon_speed']) * seconds, _worker['star_speed'] * seconds
+    for shape, outline, centroid, is_star in _worker['outlines']:
+        angle = star_angle if is_star else polygon_angle
+        if angle:
+            shape.vertices = Polygon.polygon_rotate(outline, centroid, angle)
+
+    surface, camera, renderer = _worker['surface'], _worker['camera'], _worker['renderer']
+    surface.fill(spec['background'])
+    screen = surface.get_rect()
+    min_x, min_y, max_x, max_y = camera.world_rect()
+    for polygon in _worker['polygons']:
+        left, top, right, bottom = polygon.bounds
+        if right < min_x or left > max_x or bottom < min_y or top > max_y:
+            continue  # out of the image
+        cached = _worker['rasters'].get(polygon)
+        if cached is None or polygon_angle:
+            cached = renderer.rasterize(polygon, clip=screen)
+            if not polygon_angle:
+                _worker['rasters'][polygon] = cached
+        raster, offset = cached
+        surface.blit(raster, (round(offset.x), round(offset.y)))
+    ShapeController.draw_stars(surface, _worker['stars'], camera=camera)
+    return surface
+
+
+def render_frames(frames: range, output: str) -> list[str]:
+    """Renders frames in a worker process and writes them as PNG files
+
+    :return: list[str] paths written
+    """
+    paths = []
+    for frame in frames:
+        path = os.path.join(output, FILE_NAME.format(frame))
+        pg.image.save(render_frame(frame), path)
+        paths.append(path)
+    return paths
+
+
+def chunks(frames: int, workers: int) -> list[range]:
+    """Splits the frames in consecutive chunks, a few per worker"""
+    size = max(1, -(-frames // (workers * CHUNKS_PER_WORKER)))
+    return [range(start, min(start + size, frames)) for start in range(0, frames, size)]
+
+
+def render(scene_path: str, spec: dict, output: str, workers: int) -> dict:
+    """Renders the animation of the scene and returns the report
+
+    :param scene_path: str scene file
+    :param spec: dict animation spec, see load_spec
+    :param output: str directory of the images, created if missing
+    :param workers: int processes
+    :return: dict
+    """
+    os.makedirs(output, exist_ok=True)
+    time_start = perf_counter()
+    written = 0
+    # spawn: every worker starts its own pygame instead of inheriting the one of this process
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=worker_init, initargs=(scene_path, spec)) as executor:
+        futures = [executor.submit(render_frames, frames, output) for frames in chunks(spec['frames'], workers)]
+        for future in as_completed(futures):
+            written += len(future.result())
+    seconds = perf_counter() - time_start
+    return {
+        'scene': scene_path,
+        'output': output,
+        'spec': spec,
+        'workers': workers,
+        'frames': written,
+        'seconds': round(seconds, 3),
+        'fps': round(seconds and written / seconds, 2),
+    }
+
+
+def parse_size(value: str) -> list[int]:
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'size must be WIDTHxHEIGHT, got {value!r}')
+    return [width, height]
+
+
+def run(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('scene', help='scene file saved by the app')
+    parser.add_argument('--spec', help='JSON animation spec')
+    parser.add_argument('--output', default='frames', help='directory of the PNG files')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='processes rendering the frames')
+    parser.add_argument('--frames', type=int, help='frames rendered, overrides the spec')
+    parser.add_argument('--fps', type=float, help='frames per second of the animation, overrides the spec')
+    parser.add_argument('--size', type=parse_size, help='image size, WIDTHxHEIGHT, overrides the spec')
+    args = parser.parse_args(argv)
+
+    try:
+        spec = load_spec(args.spec, frames=args.frames, fps=args.fps, size=args.size)
+    except (OSError, ValueError) as err:
+        print(f"Error while reading the animation spec {args.spec} | {err!r}", file=sys.stderr)
+        return 2
+    if not os.path.isfile(args.scene):
+        print(f"Error while opening the scene {args.scene} | not found", file=sys.stderr)
+        return 2
+
+    report = render(args.scene, spec, args.output, max(1, args.workers))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
@@ -2,6 +2,20 @@ import os
 from pygame.math import Vector2
 from typing import Optional
 from .application.services.event_listener import EventListener
+from .application.services.pointer_router import PointerRouter
+from .application.services.label_cache import LabelCache
+from .application.services.dirty_rects import DirtyRects
+from .application.services.frame_profiler import FrameProfiler
+from .application.services.frame_hud import FrameHud
+from .application.services.camera import Camera
+from .application.services.frame_pacer import FramePacer
+from .application.services.fixed_timestep import FixedTimestep
+from .application.services.geometry_jobs import GeometryJobs
+from .application.services.font_cache import FontCache
+from .application.services.startup_timer import StartupTimer
+from .application.display import display_format
+from .application.shapes.vertex_store import VertexStore
+from .application.shapes.polygon_renderer import PolygonRenderer
 from .config.constants import *
 from .version import (
     __version__,
@@ -42,6 +56,11 @@ class App:
         # App data
         self.clock: pygame.time.Clock = app["clock"]
         self.frames: int = app["frames"]
+        self.pacing: str = app.get("pacing", FramePacer.DEFAULT_MODE)
+        # time to the first frame, see StartupTimer
+        self.startup: StartupTimer = app.get("startup") or StartupTimer()
+        # below 1 the app is drawn at a lower resolution and scaled up to the window size by SDL
+        self.render_scale: float = min(1., max(.1, app.get("render_scale", 1.)))
 
         # world data
         self.display_info: pygame.display.Info = world["display_info"]
@@ -55,25 +74,59 @@ class App:
         self.win_width: int = world["win_width"]
         self.win_height: int = world["win_height"]
         self.chunk: int = world["chunk"]
+        if self.render_scale != 1.:
+            # everything (gui, mouse, camera) works in the pixels of the lower resolution
+            self.win_width = max(1, round(self.win_width * self.render_scale))
+            self.win_height = max(1, round(self.win_height * self.render_scale))
+            self.win_size = (self.win_width, self.win_height)
+            self.chunk = max(1, round(self.chunk * self.render_scale))
 
         window, background = self.create_app()
+        self.startup.mark('window')
+        # frames pace and the fixed-timestep clock of the animations
+        self.pacer: FramePacer = FramePacer(self.clock, self.frames, self.pacing)
+        self.timestep: FixedTimestep = FixedTimestep(SIMULATION_RATE, SIMULATION_MAX_STEPS)
 
         self.window: pygame.Surface = window
         self.background: pygame.Surface = background
+        # regions of the screen changed in the current frame, only used in dirty-rectangle mode
+        self.dirty_rects: DirtyRects = DirtyRects(self.window.get_rect(), DIRTY_RECTS)
 
         self.event_listener: EventListener = EventListener(self)
+        # mouse hover / click of the gui elements
+        self.pointer_router: PointerRouter = PointerRouter(self.event_listener)
 
-        # Load fonts
-        self.font: pygame.font.SysFont = pygame.font.SysFont("Ariel", 24)
-        self.font_small: pygame.font.SysFont = pygame.font.SysFont("lucidasans", 12)
+        # vertices of all the shapes of the scene
+        self.vertex_store: VertexStore = VertexStore()
+
+        # Load fonts, the font files found are kept on disk for the next start (SysFont lists all the system fonts)
+        self.font_cache: FontCache = FontCache(FONT_CACHE_FILE)
+        self.font: pygame.font.Font = self.font_cache.font("Ariel", 24)
+        self.font_small: pygame.font.Font = self.font_cache.font("lucidasans", 12)
         # gui fonts
         self.font_gui_family: str = GUI_STYLES["gui"]["font"]["font_family"]
         self.font_gui_size: int = GUI_STYLES["gui"]["font"]["font_size"]
         self.font_gui_color: tuple = GUI_STYLES["gui"]["font"]["font_color"]
-        self.font_gui = pygame.font.SysFont(self.font_gui_family, self.font_gui_size)  # todo: move to app level !!!
+        self.font_gui = self.font_cache.font(self.font_gui_family, self.font_gui_size)  # todo: move to app level !!!
+        self.font_cache.save()
+        self.startup.mark('fonts')
+        # rendered vertex coordinates labels
+        self.label_cache: LabelCache = LabelCache(self.font_small, LABEL_CACHE_COLOR, LABEL_CACHE_SIZE)
+        # pan and zoom of the scene
+        self.camera: Camera = Camera(self.window.get_rect())
+        # draws the shapes of the scene
+        self.polygon_renderer: PolygonRenderer = PolygonRenderer(self.background, self.label_cache, self.dirty_rects,
+                                                                 self.camera)
+
+        # frame timings and their overlay
+        self.profiler: FrameProfiler = FrameProfiler(PROFILER_FRAMES)
+        self.hud: FrameHud = FrameHud(self.profiler, self.font_small, HUD_VISIBLE)
+        # heavy geometry computed in background, applied between two frames
+        self.geometry_jobs: GeometryJobs = GeometryJobs(GEOMETRY_WORKERS)
 
         # views
         self.view_current: Optional[str] = None
+        self.startup.mark('app')
 
     def create_app(self) -> tuple:
         pygame.display.set_caption(self.app_name)
@@ -89,8 +142,23 @@ class App:
         if self.screen_size == "large":
             self.win_flags = pygame.NOFRAME | pygame.FULLSCREEN | pygame.DOUBLEBUF
 
-        window = pygame.display.set_mode(self.win_size, self.win_flags, 32, display=self.DEFAULT_DISPLAY)
-        background = pygame.Surface(self.win_size, pygame.SRCALPHA)
+        window = None
+        if self.pacing == 'vsync' or self.render_scale != 1.:
+            # vsync needs a renderer, SCALED gives one. The renderer also scales the window up to fit the screen, the
+            # mouse positions are scaled back to win_size by pygame
+            try:
+                window = pygame.display.set_mode(self.win_size, self.win_flags | pygame.SCALED, 32,
+                                                 display=self.DEFAULT_DISPLAY, vsync=int(self.pacing == 'vsync'))
+            except pygame.error as err:
+                if self.pacing == 'vsync':
+                    print(f"VSync not available, frames are capped instead | {err!r}")
+                    self.pacing = 'capped'
+                if self.render_scale != 1.:
+                    print(f"Scaled display not available, the app is drawn at {self.win_size} unscaled | {err!r}")
+        if window is None:
+            window = pygame.display.set_mode(self.win_size, self.win_flags, 32, display=self.DEFAULT_DISPLAY)
+        # opaque and in the pixel format of the window: painting it on the window every frame is a plain copy
+        background = display_format(pygame.Surface(self.win_size), alpha=False)
 
         # load the icon
         # app_icon = pygame.image.load(os.path.join(os.getcwd(), 'resources', 'icon.ico', )).convert()
@@ -103,6 +171,7 @@ class App:
     def switch_off(self):
         """Stops the execution of the application. Add here any clean-up """
         self.run = False
+        self.geometry_jobs.shutdown()
         # ... clean-up resource , close db connections etc...
 
     def window_get_4_sides(self) -> dict:
@@ -1,36 +1,25 @@
 import sys
+from typing import Optional
 
 from .app import App
 from .config.constants import *
+from .application.services.startup_timer import StartupTimer
 # from .application.views.Vi import ViewHome
 # from .application.views import ViewHome
 from .application.views import Views
 
 class AppRunner:
 
-    def __init__(self): ...
+    def __init__(self, startup: Optional[StartupTimer] = None):
+        """
+        :param startup: StartupTimer|None started before the app was imported (see main.py)
+        """
+        self.startup: StartupTimer = startup or StartupTimer()
 
     def on(self):
 
         # pygame setup
-        app = App(
-            "Pygame Polygons",
-            {
-                'clock': CLOCK,
-                'frames': FRAMES
-            },
-            {
-                'display_info': display_info,
-                'screen_size': SCREEN_SELECT,
-                'screen_size_type': SCREEN_SIZE_TYPE,
-                'display_width': DISPLAY_WIDTH,
-                'display_height': DISPLAY_HEIGHT,
-
-                'win_size': WIN_SIZE,
-                'win_width': WIN_WIDTH,
-                'win_height': WIN_HEIGHT,
-                'chunk': FLOOR_CHUNK,
-            })
+        app = self.create_app(startup=self.startup)
 
         views = Views(app)
         views.game_beat()
@@ -39,5 +28,79 @@ class AppRunner:
         pygame.quit()
         sys.exit(0)
 
+    @staticmethod
+    def create_app(frames: int = FRAMES, pacing: str = FRAME_PACING, startup: Optional[StartupTimer] = None,
+                   render_scale: float = RENDER_SCALE, **world) -> App:
+        """Creates the App from the config constants.
+
+        :param frames: int frame rate cap (0 means uncapped)
+        :param pacing: str frame pacing mode, see FramePacer
+        :param startup: StartupTimer|None where the steps of the startup are timed
+        :param render_scale: float resolution the app is drawn at, relative to the window size (see App)
+        :param world: overrides of the world data (screen_size, win_size, win_width, win_height, chunk ...)
+        :return: App
+        """
+        world = {**AppRunner.probe_display(), **world}
+        if startup is not None:
+            startup.mark('display')
+        return App(
+            "Pygame Polygons",
+            {
+                'clock': CLOCK,
+                'frames': frames,
+                'pacing': pacing,
+                'startup': startup,
+                'render_scale': render_scale
+            },
+            world)
+
+    @staticmethod
+    def probe_display(screen_size: str = SCREEN_SELECT, size_type: str = SCREEN_SIZE_TYPE,
+                      chunk: int = FLOOR_CHUNK) -> dict:
+        """Reads the size of the display and computes the window size from it, pygame must be initialized
+
+        :param screen_size: str one of SCREEN_SIZE
+        :param size_type: str one of SCREEN_SIZE_CALCS, static sizes do not depend on the display
+        :param chunk: int size of the floor chunks of the static sizes
+        :return: dict the world data of the App
+        """
+        display_info = pygame.display.Info()
+        display_width, display_height = display_info.current_w, display_info.current_h
+        if size_type == "static":
+            if screen_size == "large":
+                win_width = chunk * 30  # 1920
+                win_height = int(chunk * 16.875)  # 1080
+            elif screen_size == "medium":
+                win_width = chunk * 20  # 1280
+                win_height = chunk * 10  # 640
+            else:  # Small
+                win_width = chunk * 10  # 640
+                win_height = chunk * 5  # 320
+        else:
+            if screen_size == "large":
+                win_width = display_width - 0
+                win_height = display_height - 0
+                chunk = int(win_width / 30)  # at best should be 64
+            elif screen_size == "medium":
+                win_width = int(display_width / 1.5)
+                win_height = int(display_height / 1.5)
+                chunk = int(win_width / 20)
+            else:  # Small
+                win_width = int(display_width / 3)
+                win_height = int(display_height / 3.375)
+                chunk = int(win_width / 10)
 
+        # ensure no decimal in the screen size
+        win_width, win_height = int(win_width), int(win_height)
+        return {
+            'display_info': display_info,
+            'screen_size': screen_size,
+            'screen_size_type': size_type,
+            'display_width': display_width,
+            'display_height': display_height,
 
+            'win_size': (win_width, win_height),
+            'win_width': win_width,
+            'win_height': win_height,
+            'chunk': int(chunk),
+        }
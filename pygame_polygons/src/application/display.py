@@ -0,0 +1,16 @@
+import pygame
+
+
+def display_format(surface: pygame.Surface, alpha: bool = True) -> pygame.Surface:
+    """The surface in the pixel format of the display, blitting it to the screen is then a plain copy (or a blend)
+    instead of a conversion of every pixel. Meant for the surfaces kept for many frames.
+
+    Without a display (e.g. the offline renderer) the surface is returned as it is.
+
+    :param surface: pygame.Surface
+    :param alpha: bool keeps the transparency of the pixels (convert_alpha), otherwise the surface is opaque (convert)
+    :return: pygame.Surface a new surface, or the same one without a display
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
@@ -1,5 +1,6 @@
 import pygame 
 from pygame.math import Vector2
+from typing import Optional
 
 from ...config.constants import *
 
@@ -39,37 +40,44 @@ class GuiButton(GuiPanel):
 
         self.text: str = text
         self.text_img = self.app.font_gui.render(self.text, True, self.font_color)
+        self.text_imgs: dict[tuple, pygame.Surface] = {tuple(self.font_color): self.text_img}  # by font color
 
         # events
         self.mouse_pointer = pygame.SYSTEM_CURSOR_HAND
 
+    @property
+    def text_img(self) -> pygame.Surface:
+        return self._text_img
+
+    @text_img.setter
+    def text_img(self, value: pygame.Surface) -> None:
+        if getattr(self, '_text_img', None) is not value:
+            self._text_img = value
+            self.mark_dirty()
+
     def update(self, *args, **kwargs):
         super().update(*args, **kwargs)
 
-        # check if is clicked
-        if self.mouse_action == "MOUSE_ENTERED":
-            events = self.app.event_listener.events
-            if pygame.MOUSEBUTTONDOWN in events:
-                button_clicks = events[pygame.MOUSEBUTTONDOWN]
-                if "MOUSE_LEFT" in button_clicks and not self.element_clicked:
-                    self.surface_clear()  # makes the button 'light-turn off'
-                    topleft = self.rect.topleft
-                    # makes button go down givin the impression that is pressed
-                    self.rect = self.image.get_rect().move(topleft[0], topleft[1] + 3)
-                    self.element_clicked = True
-                    self.element_clicked_timer = 8
+        # click animation, see _on_mouse_click
         if self.element_clicked:
             if self.element_clicked_timer <= 0:
                 self.element_clicked = False
                 self.element_clicked_timer = 0
                 topleft = self.rect.topleft
                 self.rect = self.image.get_rect().move(topleft[0], topleft[1] - 3)
+                self._moved()
             else:
                 self.element_clicked_timer -= 1
 
+    def compose(self) -> None:
+        super().compose()
         # render text
         self.image.blit(self.text_img, self.text_img.get_rect(center=self.image.get_rect().center))
 
+    def surface_clear(self):
+        super().surface_clear()
+        self.image.blit(self.text_img, self.text_img.get_rect(center=self.image.get_rect().center))
+
     def _on_mouse_enter(self):
         super()._on_mouse_enter()
         if self.mouse_action != "MOUSE_ENTERED":
@@ -96,6 +104,17 @@ class GuiButton(GuiPanel):
             new_border_color.append(new_c)
         self.border_color = tuple(new_border_color)
 
+    def _on_mouse_click(self, event_click: dict) -> None:
+        if "MOUSE_LEFT" in event_click and not self.element_clicked:
+            self.surface_clear()  # makes the button 'light-turn off'
+            topleft = self.rect.topleft
+            # makes button go down givin the impression that is pressed
+            self.rect = self.image.get_rect().move(topleft[0], topleft[1] + 3)
+            self.element_clicked = True
+            self.element_clicked_timer = 8
+            self._moved()
+        super()._on_mouse_click(event_click)
+
     def _on_mouse_leave(self):
         super()._on_mouse_leave()
         if self.mouse_action != "MOUSE_LEAVED":
@@ -110,6 +129,25 @@ class GuiButton(GuiPanel):
         :param color: tuple (rgb) color
         :return:
         """
+        color = tuple(color)
+        text_img = self.text_imgs.get(color)
+        if text_img is None:
+            text_img = self.text_imgs[color] = self.app.font_gui.render(self.text, True, color)
+        self.text_img = text_img
+
+    def change_default_colors(self, background_color: Optional[tuple], border_color: Optional[tuple]) -> None:
+        """Changes the button colors restored when the mouse leaves it, and the current ones when not hovered
 
-        self.text_img = self.app.font_gui.render(self.text, True, color)
+        :param background_color: tuple|None (rgba) color, None leaves it as is
+        :param border_color: tuple|None (rgb) color, None leaves it as is
+        :return:
+        """
+        if background_color is not None:
+            self.background_color_default = background_color
+            if not self.mouse_over:
+                self.background_color = background_color
+        if border_color is not None:
+            self.border_color_default = border_color
+            if not self.mouse_over:
+                self.border_color = border_color
 
@@ -49,10 +49,10 @@ class GuiComponent:
               'border_color': self.DEFAULT_BTN_CLOSE_BORDER_COLOR
           }
         )
-        self.gui_group.add(self.btn_window_close)
         self.window.children_add(self.btn_window_close)
         self.btn_window_close.add_event_listener("click", self.close_component)
 
+        self.context_center: Optional[tuple] = None  # context the window position was calculated for
         self.window_position: Vector2 = Vector2(0, 0)
         self.btn_window_close_position: Vector2 = Vector2(self.window_size.x - self.btn_window_close_size.x * 2,
                                                           self.btn_window_close_size.y + 15)
@@ -65,7 +65,8 @@ class GuiComponent:
         :param __:
         :return:
         """
-        if context_center:
+        if context_center and (context_center.x, context_center.y) != self.context_center:
+            self.context_center = (context_center.x, context_center.y)
             self._calculate_new_component_position(context_center)
         self._pre_render(*_, **__)
         self._render()
@@ -73,8 +74,9 @@ class GuiComponent:
     def _render(self):
         self._draw_component_default_guis()
         # Update Gui Components
-        self.gui_group.draw(self.screen)
         self.gui_group.update()
+        self.gui_group.draw(self.screen)
+        self.app.dirty_rects.add_sprites(self.gui_group)
 
     def _pre_render(self, *args: Any, **kwargs: Any) -> Any:
         """Child classes shoudl define render logic here
@@ -1,12 +1,17 @@
 from __future__ import annotations
 import pygame
-from typing import Any
+from typing import Any, Optional
 from pygame.math import Vector2
 
 from ...config.constants import *
 from ...app import App
+from ..display import display_format
 
 class GuiElement(pygame.sprite.Sprite):
+    """Base gui element, rendered in retained mode: the element image is composed (background, border, overlays and
+        children) only when something changed, see mark_dirty. Otherwise update() keeps the image of the previous
+        frame and drawing the element is a single blit.
+    """
 
     DEFAULT_BLIT_TYPES: tuple = ("surface", "draw")
     DEFAULT_BLIT_TYPE: str = "surface"
@@ -31,6 +36,12 @@ class GuiElement(pygame.sprite.Sprite):
         super().__init__(*args)
         self.app: App = app
 
+        # retained rendering
+        self._dirty: bool = True  # the image must be composed again
+        self._flash: bool = False  # the image was cleared on purpose (see surface_clear), keep it for one frame
+        self.container: Optional[GuiElement] = None  # element whose image this element is composed into
+        self.overlays: dict[str, tuple[pygame.Surface, tuple]] = {}  # surfaces blitted over the background
+
         self.settings: dict = settings and settings or {}
 
         self.blit_type: str = settings.get("blit_type", "surface")
@@ -45,11 +56,9 @@ class GuiElement(pygame.sprite.Sprite):
 
         self.register_default_element_values()
 
-        self.image = pygame.Surface(size, pygame.SRCALPHA)
+        self.image = display_format(pygame.Surface(size, pygame.SRCALPHA))
         self.rect = self.image.get_rect(topleft=pos)
         self.rect.topleft = pos
-        if self.blit_type == "surface":
-            self.image.fill(self.background_color)
 
         self.screen = screen
         self.pos = pos
@@ -77,23 +86,111 @@ class GuiElement(pygame.sprite.Sprite):
         self.element_clicked_timer: int = 0
 
     def update(self, *args, **kwargs):
+        # mouse events are dispatched by the app pointer router, only to the elements drawn in the frame
+        self.app.pointer_router.track(self)
+
+        # Update childrens, a child that changed marks this element dirty
+        self.children.update()
+
         # Update self
+        if self._flash:
+            self._flash = False
+            self.mark_dirty()  # composed again the next frame
+        elif self._dirty:
+            self._dirty = False
+            self.compose()
+
+    def compose(self) -> None:
+        """Draws the element image: background, border, overlays and children
+        @ovverride to draw more, after calling super
+        """
+        self.image.fill((0, 0, 0, 0))
+        if self.blit_type == "surface":
+            self.image.fill(self.background_color)
         self.draw_background()
         self.draw_border()
-
-        # Check events
-        self._register_mouse_hover()
-        # ****** Mouse Events ****** #
-        self._on_mouse_leave()
-        self._on_mouse_enter()
-        self._on_mouse_click()
-
-        # Update childrens
-        self.children.draw(self.screen)
-        self.children.update()
+        for surface, position in self.overlays.values():
+            self.image.blit(surface, position)
+        # children positions are screen positions
+        x, y = self.rect.topleft
+        for child in self.children:
+            self.image.blit(child.image, (child.rect.x - x, child.rect.y - y))
+
+    def mark_dirty(self) -> None:
+        """The element look changed, its image (and the one of its container) will be composed again"""
+        self._dirty = True
+        if self.container is not None:
+            self.container.mark_dirty()
+
+    def _moved(self) -> None:
+        """The element rect changed"""
+        self.app.pointer_router.invalidate()
+        if self.container is not None:
+            self.container.mark_dirty()
 
     def children_add(self, child: GuiElement) -> None:
         self.children.add(child)
+        child.container = self
+        self.mark_dirty()
+
+    def overlay_set(self, key: str, surface: pygame.Surface, position: tuple) -> None:
+        """Blits surface over the element background (e.g. a text), until removed or replaced
+
+        :param key: str name of the overlay, setting it again replaces the previous one
+        :param surface: pygame.Surface
+        :param position: tuple x,y in the element
+        :return:
+        """
+        self.overlays[key] = (surface, (position[0], position[1]))
+        self.mark_dirty()
+
+    def overlay_remove(self, key: str) -> None:
+        if self.overlays.pop(key, None) is not None:
+            self.mark_dirty()
+
+    # -----------------------
+    # Style
+    # -----------------------
+
+    @property
+    def background_color(self) -> tuple:
+        return self._background_color
+
+    @background_color.setter
+    def background_color(self, value: tuple) -> None:
+        if getattr(self, '_background_color', None) != value:
+            self._background_color = value
+            self.mark_dirty()
+
+    @property
+    def border_color(self) -> tuple:
+        return self._border_color
+
+    @border_color.setter
+    def border_color(self, value: tuple) -> None:
+        if getattr(self, '_border_color', None) != value:
+            self._border_color = value
+            self.mark_dirty()
+
+    @property
+    def border_width(self) -> int:
+        return self._border_width
+
+    @border_width.setter
+    def border_width(self, value: int) -> None:
+        if getattr(self, '_border_width', None) != value:
+            self._border_width = value
+            self.mark_dirty()
+
+    @property
+    def border_radius(self) -> int:
+        return self._border_radius
+
+    @border_radius.setter
+    def border_radius(self, value: int) -> None:
+        if getattr(self, '_border_radius', None) != value:
+            self._border_radius = value
+            self.mark_dirty()
 
     def draw_background(self) -> None:
         if self.blit_type == "draw":
@@ -109,8 +206,10 @@ class GuiElement(pygame.sprite.Sprite):
 
     def surface_clear(self):
         """When do it in a button click it makes a cool effect"""
-        self.image.fill(self.background_color)
         self.image.fill((0, 0, 0))
+        self._flash = True
+        if self.container is not None:
+            self.container.mark_dirty()
 
     def move_gui_into(self, position: Vector2) -> None:
         """Move the gui component at exatly x, y coordinates
@@ -118,10 +217,12 @@ class GuiElement(pygame.sprite.Sprite):
         :param position: Vector2 x,y coords of the new position
         :return:
         """
+        topleft = self.rect.topleft
         self.rect.topleft = position
         self.pos = position
         self.image.get_rect(topleft=position)
-
+        if self.rect.topleft != topleft:
+            self._moved()
 
     def register_default_element_values(self):
         """Register to a secondary property a value that may change in time, so by calling
@@ -160,48 +261,26 @@ class GuiElement(pygame.sprite.Sprite):
     # API Low
     # -----------------------
 
-    def _register_mouse_hover(self) -> str:
-        mouse_leaved = self._is_mouse_leave()
-        mouse_entered = False
-        some_element_is_hovered: GuiElement = self.app.event_listener.element_hovered
-        if not mouse_leaved:
-            mouse_entered = self._is_mouse_enter()
-
-        if mouse_leaved:
-            self.mouse_action = "MOUSE_LEAVED"
-
-        elif mouse_entered:
-            self.mouse_action = "MOUSE_ENTERED"
-            if not some_element_is_hovered:
-                self.app.event_listener.element_hovered = self
-        else:
-            self.mouse_action = "MOUSE_LEAVED"
-            if some_element_is_hovered is self:
-                self.app.event_listener.element_hovered = None
-        return self.mouse_action
-
-    def _is_mouse_leave(self) -> bool:
-        if not self.mouse_over:
-            return False
-        mouse_position = pygame.mouse.get_pos()
-        mouse_collider = pygame.Rect(*mouse_position, 1, 1)
-        collision = self.rect.colliderect(mouse_collider)
-        if collision:
-            return False
+    def _pointer_enter(self) -> None:
+        """Called by the pointer router when the mouse enters the element"""
+        self.mouse_over = True
+        self.mouse_action = "MOUSE_ENTERED"
+        self._on_mouse_enter()
 
+    def _pointer_leave(self) -> None:
+        """Called by the pointer router when the mouse leaves the element"""
         self.mouse_over = False
         self.mouse_just_leaved = True
-        return True
+        self.mouse_action = "MOUSE_LEAVED"
+        self._on_mouse_leave()
 
-    def _is_mouse_enter(self) -> bool:
-        mouse_position = pygame.mouse.get_pos()
-        mouse_collider = pygame.Rect(*mouse_position, 1, 1)
-        collision = self.rect.colliderect(mouse_collider)
-        if not collision:
-            return False
+    def _pointer_click(self, event_click: dict) -> None:
+        """Called by the pointer router when a mouse button is pressed on the element
 
-        self.mouse_over = True
-        return True
+        :param event_click: dict mouse buttons pressed (e.g. 'MOUSE_LEFT')
+        :return:
+        """
+        self._on_mouse_click(event_click)
 
     def _on_mouse_enter(self) -> None:
         """@ovverride"""
@@ -229,16 +308,11 @@ class GuiElement(pygame.sprite.Sprite):
         for (event, args, kwargs) in events:
             event(*args, **kwargs)
 
-    def _on_mouse_click(self) -> None:
+    def _on_mouse_click(self, event_click: dict) -> None:
         """@ovverride"""
         if self.mouse_action != "MOUSE_ENTERED":
             return
-        # Did the user click ? TODO: make event for each mouse button? or should be 'callable' that checks that?
-        app_events = self.app.event_listener.events
-        event_click = app_events.get(pygame.MOUSEBUTTONDOWN, {})
-        if not event_click:  # if empty, then user did not click
-            return
-
+        # TODO: make event for each mouse button? or should be 'callable' that checks that?
         events = self.events['click']
         for (event, args, kwargs) in events:
             event(event_click, *args, **kwargs) # call callbacks
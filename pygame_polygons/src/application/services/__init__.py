@@ -1,2 +1,19 @@
 from .event_listener import EventListener
-from .shape_controler import ShapeController
\ No newline at end of file
+from .shape_controler import ShapeController
+from .label_cache import LabelCache
+from .dirty_rects import DirtyRects
+from .frame_profiler import FrameProfiler
+from .frame_hud import FrameHud
+from .spatial_hash import SpatialHash
+from .edit_journal import EditJournal
+from .pointer_router import PointerRouter
+from .scene_file import SceneFile
+from .scene_exporter import SceneExporter
+from .shape_importer import ShapeImporter
+from .camera import Camera
+from .frame_pacer import FramePacer
+from .fixed_timestep import FixedTimestep
+from .geometry_jobs import GeometryJobs
+from .font_cache import FontCache
+from .startup_timer import StartupTimer
+from .sweep_and_prune import SweepAndPrune
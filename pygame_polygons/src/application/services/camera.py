@@ -0,0 +1,79 @@
+from typing import Sequence
+import numpy as np
+import pygame
+
+
+class Camera:
+    """Pan and zoom of the scene: the polygons live in world coordinates and are drawn, and hit-tested, through the
+        world to screen transform of the camera
+
+            screen = (world - position) * zoom
+
+        The camera starts with no pan and no zoom, world and screen coordinates are then the same. The viewport is the
+        region of the screen the scene is drawn in: world_rect is the part of the scene that can be visible, anything
+        outside it is culled.
+    """
+    ZOOM_MIN: float = .05
+    ZOOM_MAX: float = 20.
+    ZOOM_STEP: float = 1.1  # zoom factor of a mouse wheel step
+
+    def __init__(self, viewport: Sequence):
+        """
+        :param viewport: Sequence x, y, width, height of the screen region the scene is drawn in (e.g. pygame.Rect)
+        """
+        self.viewport: pygame.Rect = pygame.Rect(viewport)
+        self.position: np.ndarray = np.zeros(2)  # world coordinates at the top-left corner of the screen
+        self.zoom: float = 1.
+        self.version: int = 0  # bumped at every pan or zoom
+
+    def to_screen(self, points: np.ndarray) -> np.ndarray:
+        """World coordinates to screen coordinates
+
+        :param points: np.ndarray (n, 2) or (2,) x,y
+        :return: np.ndarray same shape
+        """
+        return (np.asarray(points, dtype=np.float64) - self.position) * self.zoom
+
+    @property
+    def is_identity(self) -> bool:
+        """No pan and no zoom: world and screen coordinates are the same"""
+        return self.zoom == 1. and not self.position.any()
+
+    def to_world(self, point: Sequence) -> tuple[float, float]:
+        """Screen coordinates (e.g. the mouse position) to world coordinates"""
+        return (float(point[0] / self.zoom + self.position[0]),
+                float(point[1] / self.zoom + self.position[1]))
+
+    def world_rect(self) -> tuple[float, float, float, float]:
+        """min x, min y, max x, max y of the visible part of the world"""
+        min_x, min_y = self.to_world(self.viewport.topleft)
+        max_x, max_y = self.to_world(self.viewport.bottomright)
+        return min_x, min_y, max_x, max_y
+
+    def pan(self, delta: Sequence) -> None:
+        """Moves the view by delta screen pixels, the scene follows the delta (as when dragged)"""
+        if delta[0] or delta[1]:
+            self.position -= (delta[0] / self.zoom, delta[1] / self.zoom)
+            self.version += 1
+
+    def zoom_at(self, point: Sequence, factor: float) -> None:
+        """Zooms by factor, keeping the world point under the screen point (e.g. the mouse pointer) where it is
+
+        :param point: Sequence x,y screen coordinates
+        :param factor: float greater than 1 zooms in, lower zooms out
+        :return:
+        """
+        zoom = min(self.ZOOM_MAX, max(self.ZOOM_MIN, self.zoom * factor))
+        if zoom == self.zoom:
+            return
+        world = self.to_world(point)
+        self.zoom = zoom
+        self.position = np.array((world[0] - point[0] / zoom, world[1] - point[1] / zoom))
+        self.version += 1
+
+    def reset(self) -> None:
+        """Back to no pan and no zoom"""
+        if self.zoom != 1. or self.position.any():
+            self.zoom = 1.
+            self.position = np.zeros(2)
+            self.version += 1
@@ -0,0 +1,80 @@
+from typing import Iterable, Optional
+import pygame
+
+
+class DirtyRects:
+    """Collects the screen regions changed during a frame, for the dirty-rectangle rendering mode.
+
+        Everything that draws on the app background reports the rect it touched (pygame.draw.* and Surface.blit
+        already return it). A frame then only needs to:
+            - clear the regions drawn in the previous frame (nothing else is on the background)
+            - repaint and update the regions drawn in the previous frame and in the current one
+
+        When disabled, add() is a no-op and the views clear, repaint and update the whole screen as usual.
+    """
+    MAX_RECTS: int = 64  # above this amount, the rects are merged in a single one
+
+    def __init__(self, screen_rect: pygame.Rect, enabled: bool = False):
+        self.screen_rect: pygame.Rect = pygame.Rect(screen_rect)
+        self.enabled: bool = enabled
+
+        self.current: list[pygame.Rect] = []  # drawn in the current frame
+        self.previous: list[pygame.Rect] = []  # drawn in the previous frame
+        self.painted: list[pygame.Rect] = []  # repainted in the previous frame, still to send to the display
+
+    def add(self, rect: Optional[pygame.Rect]) -> None:
+        """Report a region changed in the current frame"""
+        if not self.enabled or not rect:
+            return
+        self.current.append(rect)
+
+    def add_many(self, rects: Iterable[pygame.Rect]) -> None:
+        if not self.enabled:
+            return
+        self.current.extend(rect for rect in rects if rect)
+
+    def add_sprites(self, group: pygame.sprite.AbstractGroup) -> None:
+        """Report the rects of all the sprites of a group, after a group.draw"""
+        if not self.enabled:
+            return
+        self.current.extend(sprite.rect for sprite in group)
+
+    def frame_end(self) -> list[pygame.Rect]:
+        """Closes the current frame, returning the regions to repaint: everything drawn now or in the previous frame
+
+        :return: list[pygame.Rect]
+        """
+        rects = self.merge(self.previous + self.current)
+        self.previous = self.merge(self.current)
+        self.current = []
+        self.painted = rects
+        return rects
+
+    def reset(self) -> None:
+        """Forgets the regions of the frames drawn so far (e.g. by another view): the next frame clears, repaints and
+        updates the whole screen"""
+        self.current.clear()
+        self.previous = [self.screen_rect.copy()]
+        self.painted = [self.screen_rect.copy()]
+
+    def merge(self, rects: list[pygame.Rect]) -> list[pygame.Rect]:
+        """Clips the rects to the screen, merging the overlapping ones
+
+        :param rects: list[pygame.Rect]
+        :return: list[pygame.Rect]
+        """
+        merged: list[pygame.Rect] = []
+        for rect in rects:
+            rect = rect.clip(self.screen_rect)
+            if not rect:
+                continue
+            # grows the rect with every rect that overlaps it, until no more overlaps are found
+            overlap = rect.collidelist(merged)
+            while overlap != -1:
+                rect.union_ip(merged.pop(overlap))
+                overlap = rect.collidelist(merged)
+            merged.append(rect)
+
+        if len(merged) > self.MAX_RECTS:
+            return [merged[0].unionall(merged[1:])]
+        return merged
@@ -0,0 +1,296 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from typing import Any, Optional
+import numpy as np
+from pygame.math import Vector2
+
+from ..shapes import Polygon
+
+
+class Edit(ABC):
+    """A single change of a polygon, small enough to keep many of them in memory.
+        Continuous changes (a drag, a wheel rotation) are merged in the latest edit, see EditJournal.seal
+    """
+    __slots__ = ('polygon',)
+
+    def __init__(self, polygon: Polygon):
+        self.polygon: Polygon = polygon
+
+    @property
+    def size(self) -> int:
+        """Memory 'cost' of the edit, in vertices"""
+        return 1
+
+    @abstractmethod
+    def undo(self) -> None:
+        """Reverts the change"""
+
+    @abstractmethod
+    def redo(self) -> None:
+        """Applies the change again"""
+
+    def merge(self, edit: Edit) -> bool:
+        """Merges edit, which comes right after this one, into this one. Returns False if they can't be merged"""
+        return False
+
+
+class TranslateEdit(Edit):
+    __slots__ = ('delta',)
+
+    def __init__(self, polygon: Polygon, delta: Vector2):
+        super().__init__(polygon)
+        self.delta: Vector2 = Vector2(delta)
+
+    def undo(self) -> None:
+        self.polygon.translate(-self.delta)
+
+    def redo(self) -> None:
+        self.polygon.translate(self.delta)
+
+    def merge(self, edit: Edit) -> bool:
+        if type(edit) is not TranslateEdit or edit.polygon is not self.polygon:
+            return False
+        self.delta += edit.delta
+        return True
+
+
+class RotateEdit(Edit):
+    __slots__ = ('angle',)
+
+    def __init__(self, polygon: Polygon, angle: float):
+        super().__init__(polygon)
+        self.angle: float = angle
+
+    def undo(self) -> None:
+        self.polygon.rotate(-self.angle)
+
+    def redo(self) -> None:
+        self.polygon.rotate(self.angle)
+
+    def merge(self, edit: Edit) -> bool:
+        if type(edit) is not RotateEdit or edit.polygon is not self.polygon:
+            return False
+        self.angle += edit.angle
+        return True
+
+
+class VertexMoveEdit(Edit):
+    __slots__ = ('vertex_index', 'position_old', 'position_new')
+
+    def __init__(self, polygon: Polygon, vertex_index: int, position_old: tuple, position_new: tuple):
+        super().__init__(polygon)
+        self.vertex_index: int = vertex_index
+        self.position_old: tuple = position_old
+        self.position_new: tuple = position_new
+
+    def undo(self) -> None:
+        self.polygon.move_vertix(self.vertex_index, self.position_old)
+
+    def redo(self) -> None:
+        self.polygon.move_vertix(self.vertex_index, self.position_new)
+
+    def merge(self, edit: Edit) -> bool:
+        if type(edit) is not VertexMoveEdit or edit.polygon is not self.polygon \
+                or edit.vertex_index != self.vertex_index:
+            return False
+        self.position_new = edit.position_new
+        return True
+
+
+class VertexInsertEdit(Edit):
+    __slots__ = ('vertex_index', 'position', 'added')
+
+    def __init__(self, polygon: Polygon, vertex_index: int, position: tuple, added: bool):
+        super().__init__(polygon)
+        self.vertex_index: int = vertex_index
+        self.position: tuple = position
+        self.added: bool = added
+
+    def undo(self) -> None:
+        self.polygon.vertex_remove(self.vertex_index, self.added)
+
+    def redo(self) -> None:
+        self.polygon.vertex_insert(self.vertex_index, self.position, self.added)
+
+
+class VertexRemoveEdit(VertexInsertEdit):
+    __slots__ = ()
+
+    def undo(self) -> None:
+        super().redo()
+
+    def redo(self) -> None:
+        super().undo()
+
+
+class StyleEdit(Edit):
+    """Change of a polygon style property (border_color, background_color, border_width)"""
+    __slots__ = ('name', 'value_old', 'value_new')
+
+    def __init__(self, polygon: Polygon, name: str, value_old: Any, value_new: Any):
+        super().__init__(polygon)
+        self.name: str = name
+        self.value_old: Any = value_old
+        self.value_new: Any = value_new
+
+    def undo(self) -> None:
+        setattr(self.polygon, self.name, self.value_old)
+
+    def redo(self) -> None:
+        setattr(self.polygon, self.name, self.value_new)
+
+    def merge(self, edit: Edit) -> bool:
+        if type(edit) is not StyleEdit or edit.polygon is not self.polygon or edit.name != self.name:
+            return False
+        self.value_new = edit.value_new
+        return True
+
+
+class VerticesEdit(Edit):
+    """All the vertices replaced at once (e.g. a polygon reset), the only edit that keeps whole snapshots"""
+    __slots__ = ('vertices_old', 'vertices_new', 'added_old', 'added_new')
+
+    def __init__(self, polygon: Polygon, vertices_old: np.ndarray, vertices_new: np.ndarray,
+                 added_old: array, added_new: array):
+        super().__init__(polygon)
+        self.vertices_old: np.ndarray = vertices_old
+        self.vertices_new: np.ndarray = vertices_new
+        self.added_old: array = added_old
+        self.added_new: array = added_new
+
+    @property
+    def size(self) -> int:
+        return len(self.vertices_old) + len(self.vertices_new)
+
+    def undo(self) -> None:
+        self.polygon.vertices = self.vertices_old
+        self.polygon.vertices_added = array('i', self.added_old)
+
+    def redo(self) -> None:
+        self.polygon.vertices = self.vertices_new
+        self.polygon.vertices_added = array('i', self.added_new)
+
+
+class EditJournal:
+    """Undo / redo history of the polygons edits.
+
+        Polygons record their own changes (see Polygon.journal) as small deltas, the latest edit stays 'open' and the
+        following edits of the same kind are merged into it, until seal() is called (e.g. when the mouse is released),
+        so a whole drag is a single undo step.
+        The memory is bounded both by the number of edits and by their size: the oldest edits are dropped first.
+    """
+    DEFAULT_MAX_EDITS: int = 512
+    DEFAULT_MAX_SIZE: int = 100_000  # vertices
+
+    def __init__(self, max_edits: int = DEFAULT_MAX_EDITS, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_edits: int = max(1, max_edits)
+        self.max_size: int = max(1, max_size)
+
+        self._undo: deque[Edit] = deque()
+        self._redo: list[Edit] = []
+        self._size: int = 0
+        self._sealed: bool = True
+        self._applying: bool = False  # while undoing / redoing the polygons changes must not be recorded
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def record(self, edit: Edit) -> None:
+        """Adds an edit, merging it in the latest one when possible"""
+        if self._applying:
+            return
+        self._redo.clear()
+        if not self._sealed and self._undo:
+            latest = self._undo[-1]
+            size = latest.size
+            if latest.merge(edit):
+                self._size += latest.size - size
+                return
+        self._undo.append(edit)
+        self._size += edit.size
+        self._sealed = False
+        self._trim()
+
+    # ------------------------------------------
+    # Recorders, called by the Polygon mutators
+
+    def translated(self, polygon: Polygon, delta: Vector2) -> None:
+        self.record(TranslateEdit(polygon, delta))
+
+    def rotated(self, polygon: Polygon, angle: float) -> None:
+        self.record(RotateEdit(polygon, angle))
+
+    def vertex_moved(self, polygon: Polygon, vertex_index: int, position_old: tuple, position_new: tuple) -> None:
+        self.record(VertexMoveEdit(polygon, vertex_index, position_old, position_new))
+
+    def vertex_inserted(self, polygon: Polygon, vertex_index: int, position: tuple, added: bool) -> None:
+        self.record(VertexInsertEdit(polygon, vertex_index, position, added))
+
+    def vertex_removed(self, polygon: Polygon, vertex_index: int, position: tuple, added: bool) -> None:
+        self.record(VertexRemoveEdit(polygon, vertex_index, position, added))
+
+    def style_changed(self, polygon: Polygon, name: str, value_old: Any, value_new: Any) -> None:
+        self.record(StyleEdit(polygon, name, value_old, value_new))
+
+    def vertices_replaced(self, polygon: Polygon, vertices_old: np.ndarray, vertices_new: np.ndarray,
+                          added_old: array, added_new: array) -> None:
+        self.record(VerticesEdit(polygon, vertices_old, vertices_new, added_old, added_new))
+
+    def seal(self) -> None:
+        """Closes the latest edit, the next one won't be merged into it"""
+        self._sealed = True
+
+    def undo(self) -> Optional[Edit]:
+        """Reverts the latest edit
+
+        :return: Edit|None the edit reverted, None if there is nothing to undo
+        """
+        if not self._undo:
+            return None
+        edit = self._undo.pop()
+        self._size -= edit.size
+        self._apply(edit.undo)
+        self._redo.append(edit)
+        self._sealed = True
+        return edit
+
+    def redo(self) -> Optional[Edit]:
+        """Re-applies the latest reverted edit
+
+        :return: Edit|None the edit re-applied, None if there is nothing to redo
+        """
+        if not self._redo:
+            return None
+        edit = self._redo.pop()
+        self._apply(edit.redo)
+        self._undo.append(edit)
+        self._size += edit.size
+        self._sealed = True
+        return edit
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self._size = 0
+        self._sealed = True
+
+    def _apply(self, action) -> None:
+        self._applying = True
+        try:
+            action()
+        finally:
+            self._applying = False
+
+    def _trim(self) -> None:
+        while len(self._undo) > 1 and (len(self._undo) > self.max_edits or self._size > self.max_size):
+            self._size -= self._undo.popleft().size
@@ -76,6 +76,13 @@ class EventListener:
 
     # ~~~~~~~~~~~~~~~~~ keyboard ~~~~~~~~~~~~~~~~~ #
 
+    def is_key_pressed_event(self, key: int) -> bool:
+        return pygame.KEYDOWN in self.events and key in self.events[pygame.KEYDOWN]
+
+    def is_ctrl_key_pressed_event(self, key: int) -> bool:
+        """A key pressed while holding CTRL (e.g. CTRL + Z)"""
+        return self.is_key_pressed_event(key) and bool(pygame.key.get_mods() & pygame.KMOD_CTRL)
+
     def is_ctrl_left_pressed_event(self) -> bool:
         return pygame.KEYDOWN in self.events and pygame.K_LCTRL in self.events[pygame.KEYDOWN]
 
@@ -0,0 +1,52 @@
+class FixedTimestep:
+    """Fixed-timestep simulation clock. The real time of the frames is accumulated and spent in steps of the same
+        duration, so the animations advance by the same amount per second whatever the frame rate:
+
+            steps = timestep.advance(frame_seconds)
+            for _ in range(steps):
+                simulate(timestep.step)
+
+        At a high frame rate some frames run no step, under load a frame runs several of them. When a frame is so late
+        that more than max_steps are due, the extra time is dropped (and counted in dropped) instead of making the
+        next frames even later.
+    """
+    DEFAULT_RATE: int = 60
+    DEFAULT_MAX_STEPS: int = 5
+
+    def __init__(self, rate: int = DEFAULT_RATE, max_steps: int = DEFAULT_MAX_STEPS):
+        """
+        :param rate: int steps per second
+        :param max_steps: int steps run in a frame at most
+        """
+        self.step: float = 1. / max(1, rate)  # seconds of simulation of a step
+        self.max_steps: int = max(1, max_steps)
+        self.accumulator: float = 0.  # seconds not simulated yet, less than a step after advance
+
+        # counters
+        self.steps: int = 0
+        self.dropped: float = 0.  # seconds of simulation skipped because of late frames
+
+    def advance(self, elapsed: float) -> int:
+        """Adds the real time elapsed and returns how many steps must be simulated
+
+        :param elapsed: float seconds
+        :return: int steps
+        """
+        self.accumulator += max(0., elapsed)
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            self.dropped += (steps - self.max_steps) * self.step
+            steps = self.max_steps
+            self.accumulator = 0.
+        else:
+            self.accumulator -= steps * self.step
+        self.steps += steps
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """How far the real time is between the latest step and the next one, from 0 to 1 (for interpolation)"""
+        return self.accumulator / self.step
+
+    def reset(self) -> None:
+        self.accumulator = 0.
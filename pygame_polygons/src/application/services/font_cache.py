@@ -0,0 +1,68 @@
+import json
+import os
+from typing import Optional
+import pygame
+
+
+class FontCache:
+    """Resolves system font names to font files once, and keeps the result on disk for the next starts.
+
+        pygame.font.SysFont enumerates all the fonts of the system (fc-list on Linux, the registry on Windows) the
+        first time it is called, which is a good part of the startup. The file of each font name is looked up once
+        with pygame.font.match_font and written to the cache file; the next starts open the file directly with
+        pygame.font.Font. A cached file that does not exist anymore is looked up again.
+
+        A name with no matching font is cached too, as the default font of pygame (as SysFont falls back to it).
+    """
+    VERSION: int = 1
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        :param path: str|None JSON cache file, None keeps the lookups in memory only
+        """
+        self.path: Optional[str] = path
+        self._files: dict[str, Optional[str]] = {}  # font name -> font file, None is the default font
+        self._changed: bool = False
+
+        self.load()
+
+    def font(self, name: str, size: int) -> pygame.font.Font:
+        """The font named name (comma separated names are tried in order, as with SysFont), at size
+
+        :param name: str
+        :param size: int
+        :return: pygame.font.Font
+        """
+        key = name.lower()
+        file = self._files.get(key, '')
+        if file is not None and not (file and os.path.isfile(file)):  # not cached, or the cached file is gone
+            file = pygame.font.match_font(name)  # enumerates the system fonts at its first call
+            self._files[key] = file
+            self._changed = True
+        return pygame.font.Font(file, size)
+
+    def load(self) -> None:
+        """Reads the cache file, a missing or unreadable file is an empty cache"""
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                document = json.load(file)
+        except (OSError, ValueError) as err:
+            print(f"Error while reading the font cache {self.path} | {err!r}")
+            return
+        if isinstance(document, dict) and document.get('version') == self.VERSION:
+            self._files.update(document.get('fonts') or {})
+
+    def save(self) -> None:
+        """Writes the cache file, if a font was looked up since it was read"""
+        if not self.path or not self._changed:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as file:
+                json.dump({'version': self.VERSION, 'fonts': self._files}, file, indent=2)
+        except OSError as err:
+            print(f"Error while writing the font cache {self.path} | {err!r}")
+            return
+        self._changed = False
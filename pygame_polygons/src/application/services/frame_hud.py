@@ -0,0 +1,90 @@
+from typing import Optional
+import pygame
+
+from ..display import display_format
+from .frame_profiler import FrameProfiler
+
+
+class FrameHud:
+    """On-screen overlay with the frame timings (average, p95 and max of every phase) and the frame counters.
+        The text is rendered again only every REFRESH_FRAMES frames, in between the same surface is blitted.
+    """
+    REFRESH_FRAMES: int = 15
+    MARGIN: int = 10
+    PADDING: int = 6
+    LINE_HEIGHT: int = 16
+    COLUMNS: tuple[int, ...] = (130, 60, 60, 60)  # phase, avg, p95, max
+
+    BACKGROUND_COLOR: tuple[int, int, int, int] = (0, 0, 0, 170)
+    TEXT_COLOR: tuple[int, int, int] = (255, 255, 255)
+    TITLE_COLOR: tuple[int, int, int] = (255, 176, 0)
+
+    # main phases of ViewManager.game_beat, any other phase is measured inside the view logic
+    PHASES_ORDER: tuple[str, ...] = (FrameProfiler.FRAME, 'clear', 'logic', 'hud', 'events', 'update', 'paint', 'tick')
+
+    def __init__(self, profiler: FrameProfiler, font: pygame.font.Font, visible: bool = False):
+        self.profiler: FrameProfiler = profiler
+        self.font: pygame.font.Font = font
+        self.visible: bool = visible
+
+        self._image: Optional[pygame.Surface] = None
+        self._refresh_in: int = 0
+
+    def toggle(self) -> None:
+        self.visible = not self.visible
+        self._image = None
+
+    def draw(self, screen: pygame.Surface) -> Optional[pygame.Rect]:
+        """Draws the overlay at the top-right corner of screen
+
+        :param screen: pygame.Surface
+        :return: pygame.Rect|None the region drawn, None when the hud is hidden
+        """
+        if not self.visible:
+            return None
+        if self._image is None or self._refresh_in <= 0:
+            self._image = display_format(self._render())
+            self._refresh_in = self.REFRESH_FRAMES
+        self._refresh_in -= 1
+        position = (screen.get_width() - self._image.get_width() - self.MARGIN, self.MARGIN)
+        return screen.blit(self._image, position)
+
+    def _render(self) -> pygame.Surface:
+        stats = self.profiler.stats()
+        rows: list[tuple[tuple, tuple]] = [(('phase (ms)', 'avg', 'p95', 'max'), self.TITLE_COLOR)]
+        for name in self._phases_ordered(stats):
+            label = name if name in self.PHASES_ORDER else f'  {name}'
+            phase = stats[name]
+            rows.append(((label, f"{phase['avg']:.2f}", f"{phase['p95']:.2f}", f"{phase['max']:.2f}"), self.TEXT_COLOR))
+
+        counters = self.profiler.counters()
+        counters_text = '  '.join(f'{name} {amount}' for name, amount in counters.items())
+
+        width = sum(self.COLUMNS) + self.PADDING * 2
+        height = self.LINE_HEIGHT * (len(rows) + (1 if counters_text else 0)) + self.PADDING * 2
+        if counters_text:
+            width = max(width, self.font.size(counters_text)[0] + self.PADDING * 2)
+
+        image = pygame.Surface((width, height), pygame.SRCALPHA)
+        image.fill(self.BACKGROUND_COLOR)
+        y = self.PADDING
+        for cells, color in rows:
+            x = self.PADDING
+            for cell, column_width in zip(cells, self.COLUMNS):
+                image.blit(self.font.render(cell, True, color), (x, y))
+                x += column_width
+            y += self.LINE_HEIGHT
+        if counters_text:
+            image.blit(self.font.render(counters_text, True, self.TITLE_COLOR), (self.PADDING, y))
+        return image
+
+    def _phases_ordered(self, stats: dict) -> list[str]:
+        """Main phases in frame order, with the view logic sub-phases right after 'logic'"""
+        sub_phases = [name for name in stats if name not in self.PHASES_ORDER]
+        ordered: list[str] = []
+        for name in self.PHASES_ORDER:
+            if name in stats:
+                ordered.append(name)
+            if name == 'logic':
+                ordered.extend(sub_phases)
+        return ordered
@@ -0,0 +1,54 @@
+from time import perf_counter
+import pygame
+
+
+class FramePacer:
+    """Ends the frames at the pace of one of the MODES, and measures how long each frame really lasted:
+
+            * capped: waits with pygame.time.Clock.tick, up to frames per second (sleeps, low CPU usage)
+            * vsync: no wait here, the display update waits for the vertical blank of the screen (see App.create_app)
+            * busy_loop: waits with Clock.tick_busy_loop, up to frames per second, spinning instead of sleeping:
+              more CPU usage, far less jitter
+            * uncapped: no wait at all, to measure how fast the frames can go (benchmarks)
+
+        The elapsed time is measured with perf_counter, not with the milliseconds of the clock, and drives the
+        simulation of the views (see FixedTimestep).
+    """
+    MODES: tuple[str, ...] = ('capped', 'vsync', 'busy_loop', 'uncapped')
+    DEFAULT_MODE: str = 'capped'
+
+    def __init__(self, clock: pygame.time.Clock, frames: int, mode: str = DEFAULT_MODE):
+        """
+        :param clock: pygame.time.Clock
+        :param frames: int frames per second of the capped and busy_loop modes (0 means uncapped)
+        :param mode: str one of MODES
+        :raises ValueError: when the mode is not one of MODES
+        """
+        if mode not in self.MODES:
+            raise ValueError(f'Frame pacing {mode} not supported, use one of {list(self.MODES)}')
+        self.clock: pygame.time.Clock = clock
+        self.frames: int = frames
+        self.mode: str = mode
+        self.elapsed: float = 0.  # seconds between the latest two ticks
+        self._tick_time: float = perf_counter()
+
+    def tick(self) -> float:
+        """Ends a frame, waiting as the mode says
+
+        :return: float seconds elapsed since the previous tick
+        """
+        if self.mode == 'capped':
+            self.clock.tick(self.frames)
+        elif self.mode == 'busy_loop':
+            self.clock.tick_busy_loop(self.frames)
+        else:
+            self.clock.tick()  # keeps Clock.get_fps meaningful
+        now = perf_counter()
+        self.elapsed = now - self._tick_time
+        self._tick_time = now
+        return self.elapsed
+
+    def restart(self) -> None:
+        """The next frame is measured from now (e.g. after a pause), not from the previous tick"""
+        self.elapsed = 0.
+        self._tick_time = perf_counter()
@@ -0,0 +1,89 @@
+from collections import deque
+from time import perf_counter
+from typing import Optional
+
+
+class FrameProfiler:
+    """Per-phase timings of the recent frames, kept in a ring buffer.
+
+        Timers are just perf_counter pairs, measure() adds the time elapsed from start to the phase and returns
+        the current time, so that consecutive phases can be chained:
+
+            t = perf_counter()
+            self.screen_clear()
+            t = profiler.measure('clear', t)
+            game_update()
+            t = profiler.measure('logic', t)
+
+        Counters (polygons, vertices, labels drawn ...) are reset every frame as well.
+    """
+    DEFAULT_FRAMES: int = 120
+    FRAME: str = 'frame'  # whole frame time, measured between two frame_end
+
+    def __init__(self, frames: int = DEFAULT_FRAMES):
+        self.frames: deque[tuple[dict[str, float], dict[str, int]]] = deque(maxlen=max(1, frames))
+
+        self._timings: dict[str, float] = {}
+        self._counters: dict[str, int] = {}
+        self._frame_start: float = perf_counter()
+
+    def measure(self, name: str, start: float) -> float:
+        """Adds the time elapsed since start to the phase name of the current frame
+
+        :param name: str phase name
+        :param start: float perf_counter() value at the beginning of the phase
+        :return: float perf_counter() now
+        """
+        now = perf_counter()
+        self._timings[name] = self._timings.get(name, 0.) + (now - start)
+        return now
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increase a counter of the current frame"""
+        self._counters[name] = self._counters.get(name, 0) + amount
+
+    def frame_end(self) -> None:
+        """Closes the current frame, pushing its timings in the ring buffer"""
+        now = perf_counter()
+        self._timings[self.FRAME] = now - self._frame_start
+        self.frames.append((self._timings, self._counters))
+        self._timings = {}
+        self._counters = {}
+        self._frame_start = now
+
+    def reset(self) -> None:
+        self.frames.clear()
+        self._timings = {}
+        self._counters = {}
+        self._frame_start = perf_counter()
+
+    @property
+    def last(self) -> Optional[tuple[dict[str, float], dict[str, int]]]:
+        """Timings (seconds) and counters of the latest completed frame"""
+        return self.frames[-1] if self.frames else None
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Average, 95th percentile and max of every phase over the recent frames, in milliseconds
+
+        :return: dict phase -> {'avg', 'p95', 'max'}
+        """
+        phases: dict[str, list[float]] = {}
+        for timings, _ in self.frames:
+            for name, seconds in timings.items():
+                phases.setdefault(name, []).append(seconds * 1000)
+
+        total = len(self.frames)
+        stats: dict[str, dict[str, float]] = {}
+        for name, values in phases.items():
+            values.extend([0.] * (total - len(values)))  # a phase that did not run in a frame took 0 ms
+            values.sort()
+            stats[name] = {
+                'avg': sum(values) / total,
+                'p95': values[min(total - 1, int(total * .95))],
+                'max': values[-1],
+            }
+        return stats
+
+    def counters(self) -> dict[str, int]:
+        """Counters of the latest completed frame"""
+        return self.frames and self.frames[-1][1] or {}
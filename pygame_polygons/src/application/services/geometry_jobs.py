@@ -0,0 +1,99 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable, Hashable
+
+from ..shapes import Polygon
+
+
+class GeometryJobs:
+    """Runs the heavy geometry of the polygons (convex hull, simplification...) in a pool of worker threads, so the
+        frames go on while it is computed.
+
+        A job works on a snapshot of the polygon vertices, a read-only copy taken when it is submitted, never on the
+        polygon itself: the kernels (see shapes.geometry) are NumPy array operations that release the GIL, the main
+        thread keeps drawing and editing the polygons in the meanwhile. The results are applied by the main thread at
+        a frame boundary (apply_completed, called by the ViewManager before the logic of the view), so a polygon never
+        changes in the middle of a frame. If the polygon changed since the snapshot (its version is not the same) the
+        result is stale and discarded.
+
+        A job submitted for a polygon under the same name as a pending one replaces it, only the latest is applied.
+    """
+    DEFAULT_WORKERS: int = 4
+    APPLY_BUDGET: float = .004  # seconds a frame spends at most applying results
+
+    def __init__(self, workers: int = DEFAULT_WORKERS):
+        """
+        :param workers: int worker threads
+        """
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max(1, workers),
+                                                               thread_name_prefix='geometry')
+        # (polygon id, name) -> (polygon, version of the snapshot, future, apply callback)
+        self._jobs: dict[tuple[int, Hashable], tuple[Polygon, int, Future, Callable]] = {}
+        self._completed: deque = deque()  # keys of the jobs done, appended from the worker threads
+
+    def submit(self, name: Hashable, polygon: Polygon, kernel: Callable[..., Any],
+               apply: Callable[[Polygon, Any], None], *args) -> Future:
+        """Runs kernel(vertices, *args) in a worker thread on a snapshot of the polygon vertices, then
+        apply(polygon, result) in the main thread at the next frame boundary, unless the polygon changed
+
+        :param name: Hashable name of the job, a pending job of the polygon with the same name is replaced
+        :param polygon: Polygon
+        :param kernel: callable(vertices, *args) -> result, must not change its input
+        :param apply: callable(polygon, result)
+        :param args: more arguments of the kernel
+        :return: Future of the result
+        """
+        snapshot = polygon.vertices.copy()
+        snapshot.flags.writeable = False
+        key = (id(polygon), name)
+        previous = self._jobs.get(key)
+        if previous is not None:
+            previous[2].cancel()  # a replaced job that already runs ends unnoticed, see apply_completed
+
+        future = self.executor.submit(kernel, snapshot, *args)
+        self._jobs[key] = (polygon, polygon.version, future, apply)
+        future.add_done_callback(lambda _, completed=key: self._completed.append(completed))
+        return future
+
+    def apply_completed(self, seconds: float = APPLY_BUDGET) -> int:
+        """Applies the results of the completed jobs, to be called by the main thread between two frames. The results
+        left when the time is over wait for the next frame
+
+        :param seconds: float time budget
+        :return: int results applied
+        """
+        applied = 0
+        deadline = perf_counter() + seconds
+        while self._completed and perf_counter() < deadline:
+            key = self._completed.popleft()
+            job = self._jobs.get(key)
+            if job is None or not job[2].done():
+                continue  # replaced by a later job, whose own key comes later
+            polygon, version, future, apply = job
+            del self._jobs[key]
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                print(f"Error while computing the geometry job {key[1]} | {error!r}")
+            elif polygon.version == version:  # otherwise stale, the polygon changed since the job was submitted
+                apply(polygon, future.result())
+                applied += 1
+        return applied
+
+    def cancel(self) -> None:
+        """Forgets all the pending jobs (e.g. the scene is cleared), their results are never applied"""
+        for _, _, future, _ in self._jobs.values():
+            future.cancel()
+        self._jobs.clear()
+        self._completed.clear()
+
+    def shutdown(self) -> None:
+        """Stops the workers, the jobs not started are cancelled"""
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def __len__(self) -> int:
+        """Jobs pending"""
+        return len(self._jobs)
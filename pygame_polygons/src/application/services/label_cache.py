@@ -0,0 +1,75 @@
+from collections import OrderedDict
+import pygame
+
+from ..display import display_format
+
+
+class LabelCache:
+    """Bounded LRU cache of rendered text surfaces.
+        Vertex coordinates are drawn every frame for every vertex, but most of them do not move between two frames,
+        so instead of rasterizing the same text again with font.render we keep the surface around and just blit it.
+
+        The least recently used surface is evicted once the cache reaches its max size.
+    """
+    DEFAULT_MAX_SIZE: int = 4096
+    DEFAULT_TEXT_COLOR: tuple[int, int, int] = (255, 255, 255)
+
+    def __init__(self, font: pygame.font.Font, color: tuple = DEFAULT_TEXT_COLOR, max_size: int = DEFAULT_MAX_SIZE):
+        self.font: pygame.font.Font = font
+        self.color: tuple = color
+        self.max_size: int = max(1, max_size)
+
+        self._surfaces: OrderedDict[str, pygame.Surface] = OrderedDict()
+
+        # counters
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def __contains__(self, text: str) -> bool:
+        return text in self._surfaces
+
+    def render(self, text: str) -> pygame.Surface:
+        """Returns the rendered surface of the given text, rendering it only if is not cached yet
+
+        :param text: str
+        :return: pygame.Surface
+        """
+        surface = self._surfaces.get(text)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(text)
+            return surface
+
+        self.misses += 1
+        surface = display_format(self.font.render(text, True, self.color))
+        self._surfaces[text] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)  # drop the least recently used
+            self.evictions += 1
+        return surface
+
+    def clear(self) -> None:
+        """Drops all cached surfaces and resets the counters"""
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict:
+        """Returns the cache counters
+
+        :return: dict
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._surfaces),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': lookups and self.hits / lookups or 0.0,
+        }
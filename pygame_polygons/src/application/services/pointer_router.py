@@ -0,0 +1,89 @@
+from typing import Any, Optional
+import pygame
+
+
+class PointerRouter:
+    """Routes the mouse pointer to the gui elements.
+
+        The gui elements don't poll the mouse by themselves: every element drawn in a frame calls track(), which
+        records it in z-order (the latter drawn, the upper). Once per frame, after the events are read, route() samples
+        the mouse position, finds the elements under it and calls only the elements affected:
+
+            * _pointer_leave() on the elements no longer under the pointer
+            * _pointer_enter() on the elements newly under the pointer
+            * _pointer_click(event) on the elements under the pointer, when a mouse button is pressed
+
+        The elements under the pointer are looked up again only when the pointer moves or the layout changes (an
+        element moved, see invalidate(), or the elements drawn are not the same of the previous frame), so a still
+        mouse over a still gui costs nothing.
+    """
+
+    def __init__(self, event_listener):
+        """
+        :param event_listener: EventListener where the mouse button events are read, its element_hovered is kept up
+            to date with the upper element under the pointer
+        """
+        self.event_listener = event_listener
+        self.position: tuple[int, int] = (-1, -1)
+
+        self.hovered: list[Any] = []  # elements under the pointer, upper first
+        self._elements: list[Any] = []  # elements drawn in the previous frame, bottom first
+        self._tracking: dict[Any, None] = {}  # elements drawn in the current frame (a dict: some are updated twice)
+        self._layout_changed: bool = True
+
+    def track(self, element: Any) -> None:
+        """Records that element was drawn in the current frame, above the elements tracked before it"""
+        self._tracking[element] = None
+
+    def invalidate(self) -> None:
+        """Tells that an element moved or changed size, the elements under the pointer must be looked up again"""
+        self._layout_changed = True
+
+    def route(self, position: Optional[tuple[int, int]] = None) -> None:
+        """Dispatches the pointer events of the frame
+
+        :param position: tuple|None x, y of the mouse, sampled with pygame.mouse.get_pos() when not given
+        :return:
+        """
+        elements = list(self._tracking)
+        self._tracking = {}
+        if elements != self._elements:
+            self._elements = elements
+            self._layout_changed = True
+
+        position = pygame.mouse.get_pos() if position is None else position
+        if position != self.position or self._layout_changed:
+            self.position = position
+            self._layout_changed = False
+            self._hover(position)
+
+        event_click = self.event_listener.events.get(pygame.MOUSEBUTTONDOWN)
+        if event_click and self.hovered:
+            for element in list(self.hovered):
+                element._pointer_click(event_click)
+
+    def reset(self) -> None:
+        """Leaves all the hovered elements, e.g. when the view changes"""
+        for element in self.hovered:
+            element._pointer_leave()
+        self.hovered = []
+        self._elements = []
+        self._tracking = {}
+        self._layout_changed = True
+        self.event_listener.element_hovered = None
+
+    def _hover(self, position: tuple[int, int]) -> None:
+        hovered = [element for element in reversed(self._elements) if element.rect.collidepoint(position)]
+        hovered_set = set(hovered)
+        previous_set = set(self.hovered)
+
+        for element in self.hovered:
+            if element not in hovered_set:
+                element._pointer_leave()
+        # bottom to top, so that the upper element has the last word (e.g. on the mouse cursor)
+        for element in reversed(hovered):
+            if element not in previous_set:
+                element._pointer_enter()
+
+        self.hovered = hovered
+        self.event_listener.element_hovered = hovered[0] if hovered else None
@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+from typing import Callable, Iterator, Optional, Sequence
+import numpy as np
+
+from ..shapes import Polygon
+
+
+class SceneExporter:
+    """Exports the vertex coordinates of a scene as JSON, CSV, SVG or a python literal (a list of polygons, each a list
+        of (x, y) tuples, ready to paste in a pygame project).
+
+        The exporter takes a snapshot of the polygons when it is created, so the scene can keep changing (and the
+        export run in a background thread, see write_in_background) while the document is written. The documents are
+        produced by generators, a few lines at the time, and are never held in memory as a whole.
+
+            SceneExporter(polygons, (1024, 768)).write_in_background('scene.svg')
+    """
+    FORMATS: dict[str, str] = {'json': '.json', 'csv': '.csv', 'svg': '.svg', 'py': '.py'}  # format: file extension
+    DEFAULT_PRECISION: int = 2  # decimals of the coordinates, same as the labels of the vertices
+    SVG_BACKGROUND_ALPHA: int = 55  # same as PolygonRenderer.BACKGROUND_ALPHA
+    CHUNK_SHAPES: int = 64  # shapes formatted in each chunk
+
+    def __init__(self, polygons: Sequence[Polygon], size: Sequence[int], precision: int = DEFAULT_PRECISION):
+        """
+        :param polygons: Sequence[Polygon] the shapes to export, snapshotted right away
+        :param size: Sequence width, height of the scene (SVG view box)
+        :param precision: int decimals of the coordinates
+        """
+        self.size: tuple[int, int] = (int(size[0]), int(size[1]))
+        self.precision: int = precision
+
+        # snapshot: all the vertices in one array, and the style of each polygon
+        store = polygons[0].store if polygons else None
+        if store is not None and all(polygon.store is store for polygon in polygons):
+            handles = np.fromiter((polygon.handle for polygon in polygons), dtype=np.int64, count=len(polygons))
+            self.vertices: np.ndarray = store.gather(handles).round(precision)
+            lengths = store.lengths[handles]
+        else:
+            self.vertices = np.concatenate([polygon.vertices for polygon in polygons]).round(precision) if polygons \
+                else np.zeros((0, 2))
+            lengths = np.fromiter((polygon.vertex_count for polygon in polygons), dtype=np.int64, count=len(polygons))
+        self.offsets: np.ndarray = np.cumsum(lengths) - lengths
+        self.lengths: np.ndarray = lengths
+        # plain ints, the colors may hold numpy integers that the JSON writer refuses
+        self.styles: list[tuple] = [
+            (self._ints(polygon.border_color), polygon.background_color and self._ints(polygon.background_color),
+             int(polygon.border_width)) for polygon in polygons
+        ]
+
+    def __len__(self) -> int:
+        return len(self.styles)
+
+    # -----------------------
+    # Writers
+    # -----------------------
+
+    def write(self, path: str, file_format: Optional[str] = None) -> int:
+        """Writes the document to path. The file is written aside and then renamed, so a failed export leaves the
+        previous file (if any) as it was
+
+        :param path: str
+        :param file_format: str|None one of FORMATS, guessed from the path extension when None
+        :return: int polygons written
+        :raises ValueError: when the format is not supported
+        """
+        chunks = self.chunks(file_format or self.format_of(path))
+        path_tmp = f'{path}.tmp'
+        try:
+            with open(path_tmp, 'w', encoding='utf-8', newline='') as file:
+                for chunk in chunks:
+                    file.write(chunk)
+        except Exception:
+            if os.path.exists(path_tmp):
+                os.remove(path_tmp)
+            raise
+        os.replace(path_tmp, path)
+        return len(self)
+
+    def write_in_background(self, path: str, file_format: Optional[str] = None,
+                            on_done: Optional[Callable[[str, Optional[Exception]], None]] = None) -> threading.Thread:
+        """Writes the document to path in a daemon thread
+
+        :param path: str
+        :param file_format: str|None see write
+        :param on_done: callable(path, error) called from the thread when the export is over (failed or not), error is
+            None on success
+        :return: threading.Thread already started
+        """
+        def run():
+            error = None
+            try:
+                self.write(path, file_format)
+            except Exception as err:  # any failure is reported to on_done, the thread must not die silently
+                error = err
+            if on_done:
+                on_done(path, error)
+
+        thread = threading.Thread(target=run, name=f'export {os.path.basename(path)}', daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _ints(color: Sequence) -> tuple:
+        return tuple(int(channel) for channel in color)
+
+    @classmethod
+    def format_of(cls, path: str) -> str:
+        """Format of a file path, from its extension
+
+        :raises ValueError: when the extension is not one of FORMATS
+        """
+        extension = os.path.splitext(path)[1].lower()
+        for file_format, format_extension in cls.FORMATS.items():
+            if extension == format_extension:
+                return file_format
+        raise ValueError(f'Export format of {path} not supported, use one of {list(cls.FORMATS.values())}')
+
+    # -----------------------
+    # Documents
+    # -----------------------
+
+    def chunks(self, file_format: str) -> Iterator[str]:
+        """Generator of the document text, in chunks
+
+        :param file_format: str one of FORMATS
+        :raises ValueError: when the format is not supported
+        """
+        if file_format not in self.FORMATS:
+            raise ValueError(f'Export format {file_format} not supported, use one of {list(self.FORMATS)}')
+        return getattr(self, f'_chunks_{file_format}')()
+
+    def _polygons(self) -> Iterator[tuple[int, list[list[float]], tuple]]:
+        """Yields index, vertices (as lists) and style of each polygon"""
+        for start in range(0, len(self), self.CHUNK_SHAPES):
+            end = min(start + self.CHUNK_SHAPES, len(self))
+            # one tolist() call for the whole chunk of shapes
+            first, last = int(self.offsets[start]), int(self.offsets[end - 1] + self.lengths[end - 1])
+            points = self.vertices[first:last].tolist()
+            for i in range(start, end):
+                offset = int(self.offsets[i]) - first
+                yield i, points[offset:offset + int(self.lengths[i])], self.styles[i]
+
+    def _chunks_json(self) -> Iterator[str]:
+        yield '{"polygons": ['
+        for i, vertices, (border_color, background_color, border_width) in self._polygons():
+            polygon = {
+                'vertices': vertices,
+                'border_color': border_color,
+                'background_color': background_color,
+                'border_width': border_width,
+            }
+            yield (',\n  ' if i else '\n  ') + json.dumps(polygon)
+        yield '\n]}\n'
+
+    def _chunks_csv(self) -> Iterator[str]:
+        yield 'polygon,vertex,x,y\r\n'
+        for i, vertices, _ in self._polygons():
+            yield ''.join(f'{i},{j},{x},{y}\r\n' for j, (x, y) in enumerate(vertices))
+
+    def _chunks_svg(self) -> Iterator[str]:
+        width, height = self.size
+        yield f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" ' \
+              f'viewBox="0 0 {width} {height}">\n'
+        for _, vertices, (border_color, background_color, border_width) in self._polygons():
+            points = ' '.join(f'{x},{y}' for x, y in vertices)
+            if background_color:
+                alpha = background_color[3] if len(background_color) == 4 else self.SVG_BACKGROUND_ALPHA
+                fill = f'fill="{self._svg_color(background_color)}" fill-opacity="{round(alpha / 255, 3)}"'
+            else:
+                fill = 'fill="none"'
+            yield f'  <polygon points="{points}" {fill} stroke="{self._svg_color(border_color)}" ' \
+                  f'stroke-width="{border_width}"/>\n'
+        yield '</svg>\n'
+
+    def _chunks_py(self) -> Iterator[str]:
+        yield 'polygons = [\n'
+        for _, vertices, _ in self._polygons():
+            yield '    [' + ', '.join(f'({x}, {y})' for x, y in vertices) + '],\n'
+        yield ']\n'
+
+    @staticmethod
+    def _svg_color(color: Sequence) -> str:
+        return f'rgb({int(color[0])},{int(color[1])},{int(color[2])})'
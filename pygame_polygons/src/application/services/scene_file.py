@@ -0,0 +1,183 @@
+import os
+import struct
+from array import array
+from typing import Sequence
+import numpy as np
+
+from ..shapes import Polygon, VertexStore
+
+
+class SceneFile:
+    """Binary file of a scene: the polygons and stars of the home view, with their colors and border widths.
+
+        Layout, all little-endian:
+
+            * header (HEADER), with the offsets of the following blocks
+            * polygons table: one TABLE record per shape, polygons first and then stars
+            * coordinates block: the x,y of all the vertices, one shape after the other (float64 or float32)
+            * added block: int32 indexes of the vertices added by the user (Polygon.vertices_added), one shape
+              after the other
+            * originals block: float64 x,y of the outlines restored on reset (Polygon.vertices_original, e.g.
+              imported outlines), one shape after the other
+
+        Blocks start on ALIGNMENT bytes. Loading reads the header and the table only: the coordinates block is
+        memory-mapped (copy-on-write, the file is never changed) and becomes the VertexStore block, so the
+        coordinates are paged in when the shapes are drawn, no matter how big the scene is.
+    """
+    MAGIC: bytes = b'PGSC'
+    VERSION: int = 1
+    ALIGNMENT: int = 16
+    # magic, version, coordinate item size, shapes, vertices, added indexes, original vertices,
+    # table / coordinates / added / originals offsets
+    HEADER: struct.Struct = struct.Struct('<4sHHIQQQQQQQ')
+
+    KIND_POLYGON: int = 0
+    KIND_STAR: int = 1
+    FLAG_BACKGROUND: int = 1  # the shape has a background color
+
+    TABLE: np.dtype = np.dtype([
+        ('offset', '<u8'),  # first row of the shape in the coordinates block
+        ('length', '<u4'),  # vertices
+        ('added', '<u4'),  # vertices added by the user
+        ('kind', 'u1'),
+        ('flags', 'u1'),
+        ('border_width', '<u2'),
+        ('border_color', 'u1', (4,)),  # rgba
+        ('background_color', 'u1', (4,)),  # rgba
+        ('vertex_count_initial', '<u4'),
+        ('radius', '<f8'),
+        ('position_initial', '<f8', (2,)),
+        ('centroid', '<f8', (2,)),
+        ('original', '<u4'),  # vertices of the original outline, 0 when it is a regular polygon
+    ])
+
+    @classmethod
+    def save(cls, path: str, polygons: Sequence[Polygon], stars: Sequence[Polygon] = ()) -> None:
+        """Writes the scene to path. The file is written aside and then renamed over path. When the shapes are still
+        mapped on path (saved over the scene they were opened from), their coordinates are first copied to memory and
+        the mapping released, as Windows refuses to replace a mapped file
+
+        :param path: str
+        :param polygons: Sequence[Polygon]
+        :param stars: Sequence[Polygon]
+        :return:
+        """
+        shapes = [*polygons, *stars]
+        table = np.zeros(len(shapes), dtype=cls.TABLE)
+        lengths = np.fromiter((shape.vertex_count for shape in shapes), dtype=np.int64, count=len(shapes))
+        table['length'] = lengths
+        table['offset'] = np.cumsum(lengths) - lengths
+        table['kind'][len(polygons):] = cls.KIND_STAR
+        if shapes:
+            table['border_width'] = [shape.border_width for shape in shapes]
+            table['border_color'] = [cls._rgba(shape.border_color) for shape in shapes]
+            table['flags'] = [cls.FLAG_BACKGROUND if shape.background_color else 0 for shape in shapes]
+            table['background_color'] = [cls._rgba(shape.background_color or (0, 0, 0, 0)) for shape in shapes]
+            table['vertex_count_initial'] = [shape.vertex_count_initial for shape in shapes]
+            table['radius'] = [shape.radius for shape in shapes]
+            table['position_initial'] = [shape.position_initial for shape in shapes]
+            table['centroid'] = [(shape.centroid.x, shape.centroid.y) for shape in shapes]
+            table['added'] = [len(shape.vertices_added) for shape in shapes]
+            table['original'] = [0 if shape.vertices_original is None else len(shape.vertices_original)
+                                 for shape in shapes]
+
+        # the shapes of a scene share its vertex store, their vertices are gathered at once
+        store = shapes[0].store if shapes else None
+        if store is not None and all(shape.store is store for shape in shapes):
+            coordinates = store.gather(shape.handle for shape in shapes)
+            dtype = store.dtype
+        else:
+            coordinates = np.concatenate([shape.vertices for shape in shapes]) if shapes else np.zeros((0, 2))
+            dtype = np.dtype(np.float64)
+        coordinates = coordinates.astype(dtype.newbyteorder('<'), copy=False)
+        added = np.fromiter((index for shape in shapes for index in shape.vertices_added), dtype='<i4')
+        originals = [shape.vertices_original for shape in shapes if shape.vertices_original is not None]
+        originals = np.concatenate(originals).astype('<f8') if originals else np.zeros((0, 2), dtype='<f8')
+
+        table_offset = cls._align(cls.HEADER.size)
+        coordinates_offset = cls._align(table_offset + table.nbytes)
+        added_offset = cls._align(coordinates_offset + coordinates.nbytes)
+        originals_offset = cls._align(added_offset + added.nbytes)
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, dtype.itemsize, len(shapes), len(coordinates), len(added),
+                                 len(originals), table_offset, coordinates_offset, added_offset, originals_offset)
+
+        path_tmp = f'{path}.tmp'
+        with open(path_tmp, 'wb') as file:
+            for offset, block in ((0, header), (table_offset, table.tobytes()),
+                                  (coordinates_offset, coordinates.tobytes()), (added_offset, added.tobytes()),
+                                  (originals_offset, originals.tobytes())):
+                file.write(b'\0' * (offset - file.tell()))  # alignment padding
+                file.write(block)
+        for store in {id(shape.store): shape.store for shape in shapes}.values():
+            if store.mapped_file and os.path.exists(path) and os.path.samefile(store.mapped_file, path):
+                store.load_in_memory()
+        os.replace(path_tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> tuple[VertexStore, list[Polygon], list[Polygon]]:
+        """Opens the scene at path
+
+        :param path: str
+        :return: tuple a new VertexStore (mapped on the file), the polygons and the stars
+        :raises ValueError: when the file is not a scene file or has a newer version
+        """
+        with open(path, 'rb') as file:
+            header = file.read(cls.HEADER.size)
+            if len(header) < cls.HEADER.size or header[:4] != cls.MAGIC:
+                raise ValueError(f'{path} is not a scene file')
+            (magic, version, item_size, shapes, vertices, added_total, originals_total,
+             table_offset, coordinates_offset, added_offset, originals_offset) = cls.HEADER.unpack(header)
+            if version > cls.VERSION:
+                raise ValueError(f'{path} scene file version {version} is not supported (max {cls.VERSION})')
+            if item_size not in (4, 8):
+                raise ValueError(f'{path} has coordinates of {item_size} bytes, expected 4 or 8')
+
+            file.seek(table_offset)
+            table = np.fromfile(file, dtype=cls.TABLE, count=shapes)
+            file.seek(added_offset)
+            added = np.fromfile(file, dtype='<i4', count=added_total)
+            file.seek(originals_offset)
+            originals = np.fromfile(file, dtype='<f8', count=originals_total * 2).reshape(-1, 2)
+        if len(table) != shapes or len(added) != added_total or len(originals) != originals_total:
+            raise ValueError(f'{path} is truncated')
+
+        dtype = np.dtype(f'<f{item_size}')
+        if vertices:
+            coordinates = np.memmap(path, dtype=dtype, mode='c', offset=coordinates_offset, shape=(vertices, 2))
+        else:
+            coordinates = np.zeros((0, 2), dtype=dtype)
+        store = VertexStore.from_block(coordinates, table['length'], table['offset'])
+
+        polygons, stars = [], []
+        added_starts = np.cumsum(table['added'], dtype=np.int64) - table['added']
+        original_starts = np.cumsum(table['original'], dtype=np.int64) - table['original']
+        for handle, record in enumerate(table.tolist()):
+            (_, _, added_count, kind, flags, border_width, border_color, background_color, vertex_count_initial,
+             radius, position_initial, centroid, original_count) = record
+            shape = Polygon(store, vertex_count_initial, radius, position_initial, handle=handle, centroid=centroid)
+            shape.border_color = cls._color(border_color)
+            shape.background_color = cls._color(background_color) if flags & cls.FLAG_BACKGROUND else None
+            shape.border_width = border_width
+            if added_count:
+                start = int(added_starts[handle])
+                shape.vertices_added = array('i', added[start:start + added_count].tolist())
+            if original_count:
+                start = int(original_starts[handle])
+                shape.vertices_original = originals[start:start + original_count].astype(np.float64)
+            (stars if kind == cls.KIND_STAR else polygons).append(shape)
+        return store, polygons, stars
+
+    @classmethod
+    def _align(cls, offset: int) -> int:
+        return -(-offset // cls.ALIGNMENT) * cls.ALIGNMENT
+
+    @staticmethod
+    def _rgba(color: Sequence) -> tuple[int, int, int, int]:
+        """rgb or rgba color (tuple, list or pygame.Color) as rgba"""
+        return int(color[0]), int(color[1]), int(color[2]), int(color[3]) if len(color) > 3 else 255
+
+    @staticmethod
+    def _color(rgba: Sequence) -> tuple:
+        """rgba as saved by _rgba, back to rgb when opaque"""
+        rgba = tuple(int(channel) for channel in rgba)  # the table gives numpy integers
+        return rgba[:3] if rgba[3] == 255 else rgba
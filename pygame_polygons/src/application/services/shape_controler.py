@@ -1,8 +1,12 @@
-from math import pi, cos, sin
+from math import pi, cos, sin, inf
+from typing import Optional
+import numpy as np
 import pygame
 from pygame.math import Vector2
 
 from ..shapes import Polygon
+from .dirty_rects import DirtyRects
+from .camera import Camera
 # from ...app import App
 
 class ShapeController:
@@ -23,10 +27,26 @@ class ShapeController:
         if vertex_count < 3:
             vertex_count = 3
 
-        polygon = Polygon(app, vertex_count, radius, Vector2(position[0], position[1]))
+        polygon = Polygon(app.vertex_store, vertex_count, radius, Vector2(position[0], position[1]))
 
         return polygon
 
+    @staticmethod
+    def make_polygon_from_vertices(app, vertices: np.ndarray) -> Polygon:
+        """Creates a polygon of the given vertices (e.g. an imported outline), which are also its original outline,
+        restored on reset (see Polygon.vertices_original)
+
+        :param vertices: (n, 2) array of x,y coordinates, n min 3
+        :return: Polygon
+        """
+        store = app.vertex_store
+        handle = store.add(vertices)
+        centroid = store.centroid(handle)
+        radius = float(np.sqrt(((store.view(handle) - centroid) ** 2).sum(axis=1).max()))
+        polygon = Polygon(store, store.length(handle), radius, centroid, handle=handle, centroid=centroid)
+        polygon.vertices_original = np.array(vertices, dtype=np.float64)
+        return polygon
+
     @staticmethod
     def shape_centroid_is_near_mouse_pointer(mouse: tuple, centroid: Vector2, margin: int) -> bool:
         mouse_x = mouse[0]
@@ -93,29 +113,49 @@ class ShapeController:
             polygon: Polygon = polygons[current_polygon]  # get the polygon
         except IndexError:
             return
-        vertices: list[Vector2] = polygon.vertices
-        centroid = Polygon.get_polygon_centroid(vertices)  # get the polygon centroid
-        polygon_rotated = Polygon.polygon_rotate(vertices, centroid, angle)  # rotate polygon
-        polygon.update_vertices_positions(polygon_rotated)
-        polygon.centroid = polygon.vertices  # reset the polygon centroid
+        polygon.rotate(angle)  # rotate polygon around its centroid
 
     @staticmethod
-    def draw_stars(screen: pygame.Surface, stars: list[Polygon]) -> None:
-        """Stars are drawn and rotating counter-clockwise
+    def draw_stars(screen: pygame.Surface, stars: list[Polygon], dirty_rects: Optional[DirtyRects] = None,
+                   camera: Optional[Camera] = None) -> None:
+        """Stars are drawn, they are spun by rotate_stars
 
         :param screen: pygame.Surface Screen were stars needs to be drawn
         :param stars: list[list[Vector2]] list of the stars Vector Coordinates, updated in place
+        :param dirty_rects: DirtyRects|None where to report the drawn regions
+        :param camera: Camera|None world to screen transform, the stars out of its view are not drawn
         :return: None
         """
         if not stars:
             return
-            # make the star roating continously making double adges
+        min_x, min_y, max_x, max_y = camera.world_rect() if camera else (-inf, -inf, inf, inf)
         for i, star in enumerate(stars):
-            vertices: list[Vector2] = star.vertices
-
-            centroid = Polygon.get_polygon_centroid(vertices)
-            pygame.draw.circle(screen, (79, 0, 153),  # draw red dot around vertex
-                               Vector2(centroid[0], centroid[1]), 5)
-            pygame.draw.polygon(screen, pygame.Color("pink"), vertices, width=2)
-            star_rotated = Polygon.polygon_rotate(vertices, centroid, -45)
-            star.update_vertices_positions(star_rotated)
+            centroid = star.centroid
+            # a star spins around its centroid, within its radius
+            if centroid.x + star.radius < min_x or centroid.x - star.radius > max_x or \
+                    centroid.y + star.radius < min_y or centroid.y - star.radius > max_y:
+                continue
+            if camera:
+                centroid, vertices = camera.to_screen((centroid.x, centroid.y)), camera.to_screen(star.vertices)
+            else:
+                vertices = star.vertices
+            rect_dot = pygame.draw.circle(screen, (79, 0, 153),  # draw red dot around vertex
+                                          centroid, 5)
+            rect = pygame.draw.polygon(screen, pygame.Color("pink"), vertices, width=2)
+            if dirty_rects:
+                dirty_rects.add(rect_dot)
+                dirty_rects.add(rect)
+
+    @staticmethod
+    def rotate_stars(stars: list[Polygon], angle: float) -> None:
+        """Spins the stars around their centroids
+
+        :param stars: list[Polygon]
+        :param angle: float radians
+        :return: None
+        """
+        if not stars:
+            return
+        # make the star roating continously making double adges
+        # all the stars share the same vertex store, rotate them all at once
+        stars[0].store.rotate_many([star.handle for star in stars], angle)
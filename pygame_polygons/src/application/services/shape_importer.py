@@ -0,0 +1,409 @@
+import json
+import os
+import re
+from time import perf_counter
+from typing import Iterator, Optional, Sequence
+import numpy as np
+
+from ..shapes.simplify import simplify
+
+
+class ShapeImporter:
+    """Imports outlines (map regions, level collision meshes ...) from GeoJSON or WKT files as polygon vertices.
+
+        The file is read in chunks and parsed incrementally: GeoJSON one member at the time, the arrays of positions a
+        chunk at the time (a feature of hundreds of thousands of vertices is not decoded at once), WKT one token at the
+        time. It is read twice: the first pass finds the bounds of all the coordinates, so that the
+        second one can fit the outlines to the area (keeping the aspect ratio) and simplify each of them, in window
+        pixels, to at most max_vertices vertices (see shapes.simplify).
+
+        batches() is a generator of lists of outlines that works for a few milliseconds at each step, so the caller can
+        take one batch per frame (and make the polygons with ShapeController) while a large file loads.
+
+        Only the outlines are imported: polygons holes are dropped (a Polygon has none) and points are skipped.
+    """
+    FORMATS: dict[str, str] = {'.geojson': 'geojson', '.json': 'geojson', '.wkt': 'wkt', '.txt': 'wkt'}
+    CHUNK_SIZE: int = 1 << 16  # bytes read at the time
+    DEFAULT_MAX_VERTICES: int = 1000
+    DEFAULT_TOLERANCE: float = .5  # pixels, vertices closer to the simplified outline are dropped
+    BATCH_SECONDS: float = .008  # work done by each step of batches()
+    BATCH_SHAPES: int = 64  # outlines in a batch at most
+
+    # WKT geometries whose outlines are only the first ring of each polygon (the following ones are the holes)
+    WKT_POLYGONS: tuple = ('POLYGON', 'MULTIPOLYGON', 'TRIANGLE', 'TIN', 'POLYHEDRALSURFACE')
+    WKT_POINTS: tuple = ('POINT', 'MULTIPOINT')
+    WKT_MODIFIERS: tuple = ('Z', 'M', 'ZM', 'EMPTY', 'SRID')
+    WKT_TOKENS: re.Pattern = re.compile(r'[A-Za-z]+|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|[(),]')
+    WKT_DELIMITERS: re.Pattern = re.compile(r'[\s(),;]')
+
+    def __init__(self, path: str, area: Sequence, max_vertices: int = DEFAULT_MAX_VERTICES,
+                 tolerance: float = DEFAULT_TOLERANCE, flip_y: Optional[bool] = None, file_format: Optional[str] = None):
+        """
+        :param path: str
+        :param area: Sequence x, y, width, height (e.g. pygame.Rect) where the outlines are fitted
+        :param max_vertices: int vertices of each outline at most
+        :param tolerance: float pixels, see simplify
+        :param flip_y: bool|None the y axis of the file goes up (geographic coordinates), by default True for
+            GeoJSON and False for WKT
+        :param file_format: str|None 'geojson' or 'wkt', guessed from the path extension when None
+        :raises ValueError: when the format is not supported
+        """
+        self.path: str = path
+        self.area: tuple[float, float, float, float] = (float(area[0]), float(area[1]), float(area[2]), float(area[3]))
+        self.max_vertices: int = max_vertices
+        self.tolerance: float = tolerance
+        self.file_format: str = file_format or self.format_of(path)
+        if self.file_format not in self.FORMATS.values():
+            raise ValueError(f'Import format {self.file_format} not supported')
+        self.flip_y: bool = self.file_format == 'geojson' if flip_y is None else flip_y
+
+    @classmethod
+    def format_of(cls, path: str) -> str:
+        """Format of a file path, from its extension
+
+        :raises ValueError: when the extension is not one of FORMATS
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in cls.FORMATS:
+            raise ValueError(f'Import format of {path} not supported, use one of {list(cls.FORMATS)}')
+        return cls.FORMATS[extension]
+
+    def batches(self, seconds: float = BATCH_SECONDS, shapes: int = BATCH_SHAPES) -> Iterator[list[np.ndarray]]:
+        """Generator of the outlines fitted to the area and simplified, a list of (n, 2) arrays at each step. A step
+        lasts about the given seconds, and may give no outline (e.g. while the bounds are looked for)
+
+        :param seconds: float time spent in each step
+        :param shapes: int outlines in each step at most
+        :raises ValueError: when the file is not valid
+        :raises OSError: when the file can not be read
+        """
+        # 1st pass: bounds
+        minimum, maximum = np.full(2, np.inf), np.full(2, -np.inf)
+        deadline = perf_counter() + seconds
+        for ring in self._rings():
+            if ring is not None:
+                np.minimum(minimum, ring.min(axis=0), out=minimum)
+                np.maximum(maximum, ring.max(axis=0), out=maximum)
+            if perf_counter() > deadline:
+                yield []
+                deadline = perf_counter() + seconds
+        if not np.isfinite(minimum).all():
+            return
+        scale, offset = self._fit(minimum, maximum)
+
+        # 2nd pass: outlines
+        batch = []
+        for ring in self._rings():
+            if ring is not None and len(ring) >= 3:
+                outline = ring * scale + offset
+                outline = outline[simplify(outline, self.tolerance, self.max_vertices)]
+                if len(outline) >= 3:
+                    batch.append(outline)
+            if batch and (len(batch) >= shapes or perf_counter() > deadline):
+                yield batch
+                batch = []
+                deadline = perf_counter() + seconds
+            elif perf_counter() > deadline:
+                yield batch
+                deadline = perf_counter() + seconds
+        if batch:
+            yield batch
+
+    def _fit(self, minimum: np.ndarray, maximum: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Scale and offset that fit the bounds in the area, centered and keeping the aspect ratio"""
+        x, y, width, height = self.area
+        extent = maximum - minimum
+        scales = [size / span for size, span in ((width, extent[0]), (height, extent[1])) if span > 0]
+        scale = min(scales) if scales else 1.
+        margin_x = x + (width - extent[0] * scale) / 2
+        margin_y = y + (height - extent[1] * scale) / 2
+        if self.flip_y:
+            return np.array((scale, -scale)), np.array((margin_x - minimum[0] * scale, margin_y + maximum[1] * scale))
+        return np.array((scale, scale)), np.array((margin_x - minimum[0] * scale, margin_y - minimum[1] * scale))
+
+    def _rings(self) -> Iterator[Optional[np.ndarray]]:
+        """Generator of the outlines of the file as (n, 2) arrays, in the file coordinates. None is given from time to
+        time while parsing, so that the caller can stop for a while"""
+        parse = self._rings_geojson if self.file_format == 'geojson' else self._rings_wkt
+        with open(self.path, 'r', encoding='utf-8') as file:
+            yield from parse(file)
+
+    @staticmethod
+    def _ring(coordinates: Sequence) -> Optional[np.ndarray]:
+        """Ring coordinates (x, y or x, y, z ... positions) as a (n, 2) array, without the closing vertex"""
+        try:
+            ring = np.asarray(coordinates, dtype=np.float64)
+        except ValueError:  # positions of different sizes
+            ring = np.array([position[:2] for position in coordinates], dtype=np.float64)
+        if ring.ndim != 2 or ring.shape[1] < 2 or not len(ring):
+            return None
+        ring = ring[:, :2]
+        if len(ring) > 1 and (ring[0] == ring[-1]).all():
+            ring = ring[:-1]
+        return ring
+
+    # -----------------------
+    # GeoJSON
+    # -----------------------
+
+    def _rings_geojson(self, file) -> Iterator[Optional[np.ndarray]]:
+        stream = _JsonStream(file, self.CHUNK_SIZE)
+        if stream.peek() not in ('[', '{'):
+            raise ValueError(f'{self.path} is not a GeoJSON file')
+        yield from self._geojson_rings(stream)
+
+    def _geojson_rings(self, stream: '_JsonStream') -> Iterator[Optional[np.ndarray]]:
+        """Streams the next value: an array of features or geometries, or an object (feature, geometry, collection).
+        The members of the objects are read one at the time, so the features of a collection never are in memory
+        at once, and the coordinates are read a chunk at the time (see _coordinates)"""
+        first = stream.peek()
+        if first == '[':
+            for _ in stream.items():
+                yield from self._geojson_rings(stream)
+                yield None
+            return
+        if first != '{':
+            stream.value()  # null geometry, or not a GeoJSON object
+            return
+
+        geometry_type, coordinates = None, None
+        for key in stream.object_keys():
+            if key in ('geometry', 'features', 'geometries'):
+                yield from self._geojson_rings(stream)
+            elif key == 'coordinates':
+                coordinates = yield from self._coordinates(stream)
+            elif key == 'type':
+                geometry_type = stream.value()
+            else:  # properties, bbox ...
+                stream.value()
+        if coordinates is not None:  # the type may follow the coordinates
+            yield from self._geometry_rings({'type': geometry_type, 'coordinates': coordinates})
+
+    def _coordinates(self, stream: '_JsonStream'):
+        """Generator reading the next coordinates value, returned as nested lists whose arrays of positions are (n, 2)
+        arrays. The positions are read a chunk at the time, with a None yielded between the chunks"""
+        if stream.match(stream.POSITIONS_START):
+            chunks = []
+            for chunk in stream.positions():
+                chunks.append(chunk)
+                yield None
+            return np.concatenate(chunks) if chunks else np.zeros((0, 2))
+        if stream.peek() != '[' or stream.match(stream.POSITION_START):  # a single position, or not coordinates
+            return stream.value()
+        members = []
+        for _ in stream.items():
+            members.append((yield from self._coordinates(stream)))
+        return members
+
+    def _geometry_rings(self, geometry: dict) -> Iterator[np.ndarray]:
+        if not isinstance(geometry, dict):
+            return
+        geometry_type = geometry.get('type')
+        if geometry_type == 'Feature':
+            yield from self._geometry_rings(geometry.get('geometry'))
+            return
+        if geometry_type in ('FeatureCollection', 'GeometryCollection'):
+            for member in geometry.get('features' if geometry_type == 'FeatureCollection' else 'geometries') or ():
+                yield from self._geometry_rings(member)
+            return
+
+        coordinates = geometry.get('coordinates')
+        if coordinates is None:
+            coordinates = ()
+        if geometry_type == 'Polygon':
+            rings = coordinates[:1]
+        elif geometry_type == 'MultiPolygon':
+            rings = [polygon[0] for polygon in coordinates if polygon]
+        elif geometry_type in ('LineString', 'LinearRing'):
+            rings = (coordinates,)
+        elif geometry_type == 'MultiLineString':
+            rings = coordinates
+        else:  # points
+            rings = ()
+        for coordinates in rings:
+            ring = self._ring(coordinates)
+            if ring is not None:
+                yield ring
+
+    # -----------------------
+    # WKT
+    # -----------------------
+
+    def _rings_wkt(self, file) -> Iterator[Optional[np.ndarray]]:
+        # open parenthesis: [geometry kind, index among its siblings, geometry root, children, vertices, vertex]
+        stack: list[list] = []
+        kind: Optional[str] = None  # latest geometry keyword
+        pending_root: bool = False
+        tail = ''
+        while True:
+            chunk = file.read(self.CHUNK_SIZE)
+            text = tail + chunk
+            if chunk:
+                # a token may be cut at the end of the chunk, keep the text after the latest delimiter for the next one
+                cut = max(text.rfind(delimiter) for delimiter in ' \t\r\n(),;') + 1
+                text, tail = text[:cut], text[cut:]
+            for token in self.WKT_TOKENS.findall(text):
+                first = token[0]
+                if first == '(':
+                    if stack:
+                        parent = stack[-1]
+                        stack.append([parent[0] if not pending_root else kind, parent[3], pending_root, 0, [], []])
+                        parent[3] += 1
+                    else:
+                        stack.append([kind, 0, True, 0, [], []])
+                    pending_root = False
+                elif first == ')':
+                    if not stack:
+                        raise ValueError(f'{self.path} is not a valid WKT file, unbalanced parenthesis')
+                    group_kind, index, root, _, vertices, vertex = stack.pop()
+                    if len(vertex) >= 2:
+                        vertices.append(vertex[:2])
+                    if vertices and group_kind not in self.WKT_POINTS and \
+                            (index == 0 or root or group_kind not in self.WKT_POLYGONS):
+                        ring = self._ring(vertices)
+                        if ring is not None:
+                            yield ring
+                elif first == ',':
+                    if stack and len(stack[-1][5]) >= 2:
+                        stack[-1][4].append(stack[-1][5][:2])
+                    if stack:
+                        stack[-1][5] = []
+                elif first.isalpha():
+                    keyword = token.upper()
+                    if keyword not in self.WKT_MODIFIERS:
+                        kind = keyword
+                        pending_root = True
+                elif stack:  # a number
+                    stack[-1][5].append(float(token))
+            if not chunk:
+                break
+            yield None
+        if stack:
+            raise ValueError(f'{self.path} is not a valid WKT file, unbalanced parenthesis')
+
+
+class _JsonStream:
+    """Minimal incremental JSON reader: decodes the members of objects and arrays one at the time, and arrays of
+    positions (GeoJSON coordinates) a chunk at the time, reading the file only as much as needed"""
+    POSITIONS_START: re.Pattern = re.compile(r'\[\s*\[\s*[-+\d.]')  # array of positions: [[x, ...
+    POSITION_START: re.Pattern = re.compile(r'\[\s*[-+\d.]')  # position: [x, ...
+    # a position (x, y and the other numbers) and the character after it
+    POSITION: re.Pattern = re.compile(r'\s*\[([^,\[\]{}"]*),([^,\[\]{}"]*)(?:,[^\[\]{}"]*)?\]\s*([,\]])')
+    MATCH_AHEAD: int = 4096  # characters available to match the patterns above
+    POSITIONS_CHUNK: int = 1024  # positions decoded at the time
+
+    def __init__(self, file, chunk_size: int):
+        self.file = file
+        self.chunk_size: int = chunk_size
+        self.decoder: json.JSONDecoder = json.JSONDecoder()
+        self.buffer: str = ''
+        self.position: int = 0
+        self.eof: bool = False
+
+    def _read(self) -> bool:
+        """Reads more of the file, at least as much as is buffered (so that decoding a big value again and again
+        costs linear time). Returns False at the end of the file"""
+        if self.eof:
+            return False
+        if self.position:
+            self.buffer = self.buffer[self.position:]
+            self.position = 0
+        chunk = self.file.read(max(self.chunk_size, len(self.buffer)))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Next character that is not a white space, '' at the end of the file"""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in ' \t\r\n':
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._read():
+                return ''
+
+    def expect(self, characters: str) -> str:
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(f'Invalid JSON, expected one of {characters!r} and found {character!r}')
+        self.position += 1
+        return character
+
+    def value(self):
+        """Decodes the next value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # a number at the end of the buffer may continue in the file
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError as error:
+                if self.eof:
+                    raise ValueError(f'Invalid JSON, {error}') from None
+            self._read()
+
+    def match(self, pattern: re.Pattern) -> Optional[re.Match]:
+        """Matches pattern at the next character that is not a white space"""
+        self.peek()
+        while len(self.buffer) - self.position < self.MATCH_AHEAD and self._read():
+            pass
+        return pattern.match(self.buffer, self.position)
+
+    def items(self) -> Iterator[None]:
+        """Goes through the next array: the caller must read each value, as with object_keys"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.position += 1
+            return
+        while True:
+            yield
+            if self.expect(',]') == ']':
+                return
+
+    def positions(self) -> Iterator[np.ndarray]:
+        """Decodes the next array of positions (arrays of 2 numbers or more), as (n, 2) arrays of POSITIONS_CHUNK
+        positions at most"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.position += 1
+            return
+        while True:
+            # the numbers are kept as strings in flat lists, which do not wake up the garbage collector
+            xs, ys, end = [], [], False
+            match = self.POSITION.match(self.buffer, self.position)
+            while match is not None:
+                x, y, after = match.groups()
+                xs.append(x)
+                ys.append(y)
+                self.position = match.end()
+                end = after == ']'
+                if end or len(xs) == self.POSITIONS_CHUNK:
+                    break
+                match = self.POSITION.match(self.buffer, self.position)
+            if xs:
+                try:
+                    yield np.column_stack((np.array(xs, dtype=np.float64), np.array(ys, dtype=np.float64)))
+                except ValueError as error:
+                    raise ValueError(f'Invalid JSON position, {error}') from None
+            if end:
+                return
+            if match is None and not self._read():
+                raise ValueError('Invalid JSON, unterminated array of positions')
+
+    def object_keys(self) -> Iterator[str]:
+        """Decodes the keys of the next object, one at the time: the caller must read the value of each key"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.position += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
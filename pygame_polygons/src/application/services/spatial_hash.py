@@ -0,0 +1,200 @@
+from __future__ import annotations
+import math
+from typing import Optional
+
+from ..shapes import Polygon
+
+
+class SpatialHash:
+    """Uniform grid over the polygons vertices and centroids, used for the mouse hit-testing.
+        Instead of checking every vertex of every polygon against the mouse pointer, only the points stored in
+        the cells around the pointer are checked.
+
+        Every point is stored under the key (polygon, vertex_index), the centroid of a polygon uses the index CENTROID.
+        Polygons keep their own entries up to date when they change, see Polygon.spatial_index
+
+        The bounding boxes of the polygons are kept too, in a coarser grid (BOX_CELLS points cells wide), for the
+        polygons in a rectangle (see query_rect, the culling of the camera view).
+    """
+    CENTROID: int = -1
+    BOX_CELLS: int = 8
+
+    def __init__(self, cell_size: int):
+        self.cell_size: int = max(1, int(cell_size))
+        self._cells: dict[tuple[int, int], set[tuple[Polygon, int]]] = {}
+        # polygon -> vertex index -> (x, y, cell)
+        self._entries: dict[Polygon, dict[int, tuple[float, float, tuple[int, int]]]] = {}
+
+        self.box_cell_size: int = self.cell_size * self.BOX_CELLS
+        self._box_cells: dict[tuple[int, int], set[Polygon]] = {}
+        # polygon -> (order of insertion, min cell x, min cell y, max cell x, max cell y)
+        self._boxes: dict[Polygon, tuple[int, int, int, int, int]] = {}
+        self._box_order: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, polygon: Polygon) -> bool:
+        return polygon in self._entries
+
+    def cell_of(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def insert(self, polygon: Polygon) -> None:
+        """Adds all the vertices and the centroid of a polygon, and its bounding box"""
+        self._insert_points(polygon)
+        self._box_put(polygon)
+
+    def _insert_points(self, polygon: Polygon) -> None:
+        entries = self._entries.setdefault(polygon, {})
+        for vertex_index, (x, y) in enumerate(polygon.vertices.tolist()):
+            self._put(polygon, vertex_index, x, y, entries)
+        centroid = polygon.centroid
+        self._put(polygon, self.CENTROID, centroid.x, centroid.y, entries)
+
+    def remove(self, polygon: Polygon) -> None:
+        """Removes all the points of a polygon, and its bounding box"""
+        self._remove_points(polygon)
+        box = self._boxes.pop(polygon, None)
+        if box is not None:
+            self._box_cells_discard(polygon, box)
+
+    def _remove_points(self, polygon: Polygon) -> None:
+        entries = self._entries.pop(polygon, None)
+        if not entries:
+            return
+        for vertex_index, (_, _, cell) in entries.items():
+            self._cell_discard(cell, (polygon, vertex_index))
+
+    def update(self, polygon: Polygon) -> None:
+        """Re-index a polygon after its vertices changed (move, rotation, vertices added or removed)"""
+        if polygon not in self._entries:
+            return
+        self._remove_points(polygon)
+        self._insert_points(polygon)
+        self._box_put(polygon)
+
+    def update_vertex(self, polygon: Polygon, vertex_index: int) -> None:
+        """Re-index a single vertex of a polygon, and its centroid that moved along with it"""
+        entries = self._entries.get(polygon)
+        if entries is None:
+            return
+        x, y = polygon.vertices[vertex_index].tolist()
+        self._put(polygon, vertex_index, x, y, entries)
+        centroid = polygon.centroid
+        self._put(polygon, self.CENTROID, centroid.x, centroid.y, entries)
+        self._box_put(polygon)
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._entries.clear()
+        self._box_cells.clear()
+        self._boxes.clear()
+        self._box_order = 0
+
+    def query_rect(self, min_x: float, min_y: float, max_x: float, max_y: float) -> list[Polygon]:
+        """Finds the polygons whose bounding box overlaps the rectangle, in the order they were inserted (the order
+        they are drawn). Only the box cells under the rectangle are checked, all the boxes when they are fewer
+
+        :return: list[Polygon]
+        """
+        cell_min_x, cell_min_y = self._box_cell_of(min_x, min_y)
+        cell_max_x, cell_max_y = self._box_cell_of(max_x, max_y)
+        if (cell_max_x - cell_min_x + 1) * (cell_max_y - cell_min_y + 1) > len(self._boxes):
+            candidates = self._boxes
+        else:
+            candidates = set()
+            for cell_x in range(cell_min_x, cell_max_x + 1):
+                for cell_y in range(cell_min_y, cell_max_y + 1):
+                    bucket = self._box_cells.get((cell_x, cell_y))
+                    if bucket:
+                        candidates.update(bucket)
+
+        found = []
+        for polygon in candidates:
+            bounds = polygon.bounds
+            if bounds[0] <= max_x and bounds[2] >= min_x and bounds[1] <= max_y and bounds[3] >= min_y:
+                found.append(polygon)
+        if candidates is not self._boxes:
+            boxes = self._boxes
+            found.sort(key=lambda polygon: boxes[polygon][0])
+        return found
+
+    def query(self, point: tuple, margin: float, polygon: Optional[Polygon] = None) -> list[tuple[float, Polygon, int]]:
+        """Finds the points near to point, within a square of margin size (same check of
+        ShapeController.shape_vertex_is_near_mouse_pointer)
+
+        :param point: tuple x,y coordinates
+        :param margin: float
+        :param polygon: Polygon|None if given, only the points of this polygon are checked
+        :return: list of (squared distance, polygon, vertex index), closest first
+        """
+        x, y = point[0], point[1]
+        cell_min_x, cell_min_y = self.cell_of(x - margin, y - margin)
+        cell_max_x, cell_max_y = self.cell_of(x + margin, y + margin)
+
+        matches: list[tuple[float, Polygon, int]] = []
+        for cell_x in range(cell_min_x, cell_max_x + 1):
+            for cell_y in range(cell_min_y, cell_max_y + 1):
+                bucket = self._cells.get((cell_x, cell_y))
+                if not bucket:
+                    continue
+                for owner, vertex_index in bucket:
+                    if polygon is not None and owner is not polygon:
+                        continue
+                    point_x, point_y, _ = self._entries[owner][vertex_index]
+                    diff_x, diff_y = abs(x - point_x), abs(y - point_y)
+                    if diff_x < margin and diff_y < margin:
+                        matches.append((diff_x * diff_x + diff_y * diff_y, owner, vertex_index))
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    def _put(self, polygon: Polygon, vertex_index: int, x: float, y: float, entries: dict) -> None:
+        key = (polygon, vertex_index)
+        cell = self.cell_of(x, y)
+        previous = entries.get(vertex_index)
+        if previous is not None and previous[2] != cell:
+            self._cell_discard(previous[2], key)
+        entries[vertex_index] = (x, y, cell)
+        self._cells.setdefault(cell, set()).add(key)
+
+    def _box_cell_of(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.box_cell_size), math.floor(y / self.box_cell_size)
+
+    def _box_put(self, polygon: Polygon) -> None:
+        """Moves the bounding box of the polygon to the cells it overlaps now, when they changed"""
+        min_x, min_y, max_x, max_y = polygon.bounds
+        cells = (*self._box_cell_of(min_x, min_y), *self._box_cell_of(max_x, max_y))
+        previous = self._boxes.get(polygon)
+        if previous is not None:
+            if previous[1:] == cells:
+                return
+            self._box_cells_discard(polygon, previous)
+            order = previous[0]
+        else:
+            order = self._box_order
+            self._box_order += 1
+        self._boxes[polygon] = (order, *cells)
+        cell_min_x, cell_min_y, cell_max_x, cell_max_y = cells
+        for cell_x in range(cell_min_x, cell_max_x + 1):
+            for cell_y in range(cell_min_y, cell_max_y + 1):
+                self._box_cells.setdefault((cell_x, cell_y), set()).add(polygon)
+
+    def _box_cells_discard(self, polygon: Polygon, box: tuple[int, int, int, int, int]) -> None:
+        _, cell_min_x, cell_min_y, cell_max_x, cell_max_y = box
+        for cell_x in range(cell_min_x, cell_max_x + 1):
+            for cell_y in range(cell_min_y, cell_max_y + 1):
+                bucket = self._box_cells.get((cell_x, cell_y))
+                if bucket is None:
+                    continue
+                bucket.discard(polygon)
+                if not bucket:
+                    del self._box_cells[(cell_x, cell_y)]
+
+    def _cell_discard(self, cell: tuple[int, int], key: tuple[Polygon, int]) -> None:
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            return
+        bucket.discard(key)
+        if not bucket:
+            del self._cells[cell]
@@ -0,0 +1,63 @@
+from time import perf_counter
+from typing import Optional
+
+
+class StartupTimer:
+    """Time to the first frame of the app, split in the steps of the startup:
+
+            startup = StartupTimer()
+            ...  # open the window
+            startup.mark('window')
+            ...
+            startup.finish()  # at the end of the first frame
+
+        Each mark is the time since the previous one. The timer can be started before pygame and the app are imported
+        (see main.py) by giving it the time the process started at.
+    """
+    FIRST_FRAME: str = 'first_frame'
+
+    def __init__(self, start: Optional[float] = None):
+        """
+        :param start: float|None perf_counter time the startup began at, now when None
+        """
+        self.start: float = perf_counter() if start is None else start
+        self.steps: dict[str, float] = {}  # step name -> seconds
+        self.finished: bool = False
+        self._last: float = self.start
+
+    def mark(self, name: str) -> None:
+        """Ends the step name, which began at the previous mark. A step marked twice adds up, the marks after the first
+        frame are ignored (e.g. a view built later)"""
+        if self.finished:
+            return
+        now = perf_counter()
+        self.steps[name] = self.steps.get(name, 0.) + now - self._last
+        self._last = now
+
+    def finish(self) -> bool:
+        """Marks the first frame, the next calls do nothing
+
+        :return: bool the startup just finished
+        """
+        if self.finished:
+            return False
+        self.mark(self.FIRST_FRAME)
+        self.finished = True
+        return True
+
+    @property
+    def total(self) -> float:
+        """Seconds from the start to the latest mark"""
+        return self._last - self.start
+
+    def as_dict(self) -> dict[str, float]:
+        """Milliseconds of every step, and their total"""
+        return {**{name: round(seconds * 1000, 3) for name, seconds in self.steps.items()},
+                'total': round(self.total * 1000, 3)}
+
+    def report(self) -> str:
+        total = self.total or 1.
+        lines = [f"Startup {self.total * 1000:.1f} ms to the first frame"]
+        for name, seconds in self.steps.items():
+            lines.append(f"  {name:<12} {seconds * 1000:8.1f} ms {seconds / total:6.1%}")
+        return '\n'.join(lines)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+from typing import Optional
+
+from ..shapes import Polygon
+
+
+class _Endpoint:
+    """An end of the x interval of a polygon bounding box"""
+    __slots__ = ('value', 'is_max', 'polygon', 'index')
+
+    def __init__(self, value: float, is_max: bool, polygon: Polygon, index: int):
+        self.value: float = value
+        self.is_max: bool = is_max
+        self.polygon: Polygon = polygon
+        self.index: int = index  # position in SweepAndPrune._endpoints
+
+    def before(self, other: _Endpoint) -> bool:
+        """Sort order of the endpoints: by value, a min before a max of the same value (touching boxes overlap)"""
+        return self.value < other.value or self.value == other.value and not self.is_max and other.is_max
+
+
+class SweepAndPrune:
+    """Which polygons overlap, without testing every pair of them.
+
+        Broad phase: the ends of the bounding boxes on the x axis are kept sorted, and the pairs of polygons whose x
+        intervals overlap are kept along. When a polygon moves its two ends are moved in the sorted list, one swap with
+        a neighbour at the time (insertion sort, a polygon that moves a little makes a few swaps), and each swap with the
+        end of another polygon adds or removes their pair. Polygons tell when they change, see Polygon.broad_phase.
+
+        Narrow phase: the pairs whose boxes also overlap on the y axis are tested with Polygon.intersects (separating
+        axis theorem for convex polygons, edge crossings for the others). Only the new pairs and the pairs of the
+        polygons that changed are tested again, the intersecting pairs are kept in between, so the cost of a query
+        follows the swaps and the pairs of the polygons that moved, not the square of the polygons.
+    """
+    REBUILD_RATIO: float = .25  # when more polygons than this changed, they are all sorted again at once
+    REBUILD_MIN: int = 32
+
+    def __init__(self):
+        self._endpoints: list[_Endpoint] = []
+        self._boxes: dict[Polygon, tuple[_Endpoint, _Endpoint]] = {}
+        # pairs of polygons whose x intervals overlap: key -> [polygon, polygon, version, version, intersect or None]
+        self._pairs: dict[tuple[int, int], list] = {}
+        self._partners: dict[Polygon, set[Polygon]] = {}
+        self._moved: dict[Polygon, None] = {}  # changed since the latest update, in order
+        self._untested: dict[tuple[int, int], None] = {}  # pairs to test again at the next query
+        self._intersecting: dict[tuple[int, int], tuple[Polygon, Polygon]] = {}
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def __contains__(self, polygon: Polygon) -> bool:
+        return polygon in self._boxes
+
+    def insert(self, polygon: Polygon) -> None:
+        """Adds a polygon, its pairs are found at the next update"""
+        if polygon in self._boxes:
+            return
+        # the new box starts at the far right, beyond every other box, then slides to its place
+        count = len(self._endpoints)
+        low = _Endpoint(float('inf'), False, polygon, count)
+        high = _Endpoint(float('inf'), True, polygon, count + 1)
+        self._endpoints += (low, high)
+        self._boxes[polygon] = (low, high)
+        self._partners[polygon] = set()
+        self._moved[polygon] = None
+
+    def moved(self, polygon: Polygon) -> None:
+        """The polygon changed, its box is updated at the next update"""
+        if polygon in self._boxes:
+            self._moved[polygon] = None
+
+    def remove(self, polygon: Polygon) -> None:
+        """Removes a polygon and its pairs"""
+        box = self._boxes.pop(polygon, None)
+        if box is None:
+            return
+        for partner in self._partners.pop(polygon):
+            self._partners[partner].discard(polygon)
+            key = self._key(polygon, partner)
+            self._pairs.pop(key, None)
+            self._untested.pop(key, None)
+            self._intersecting.pop(key, None)
+        self._moved.pop(polygon, None)
+        low, high = box
+        first, last = sorted((low.index, high.index))
+        del self._endpoints[last]
+        del self._endpoints[first]
+        for index in range(first, len(self._endpoints)):
+            self._endpoints[index].index = index
+
+    def clear(self) -> None:
+        self._endpoints.clear()
+        self._boxes.clear()
+        self._pairs.clear()
+        self._partners.clear()
+        self._moved.clear()
+        self._untested.clear()
+        self._intersecting.clear()
+
+    def update(self) -> None:
+        """Moves the boxes of the polygons changed since the previous update to their place"""
+        if not self._moved:
+            return
+        if len(self._moved) > max(self.REBUILD_MIN, len(self._boxes) * self.REBUILD_RATIO):
+            self._rebuild()  # all the pairs are found again, so tested again
+        else:
+            for polygon in self._moved:
+                min_x, _, max_x, _ = polygon.bounds
+                low, high = self._boxes[polygon]
+                low.value = min_x
+                self._sift(low)
+                high.value = max_x
+                self._sift(high)
+            for polygon in self._moved:
+                for partner in self._partners[polygon]:
+                    self._untested[self._key(polygon, partner)] = None
+        self._moved.clear()
+
+    def candidates(self) -> list[tuple[Polygon, Polygon]]:
+        """Pairs of polygons whose bounding boxes overlap (goes through all the pairs overlapping on the x axis)"""
+        self.update()
+        return [(pair[0], pair[1]) for pair in self._pairs.values() if self._y_overlap(pair[0], pair[1])]
+
+    def overlapping(self) -> list[tuple[Polygon, Polygon]]:
+        """Pairs of polygons that intersect (see Polygon.intersects)"""
+        self._test()
+        return list(self._intersecting.values())
+
+    def overlapping_with(self, polygon: Polygon) -> list[Polygon]:
+        """Polygons that intersect polygon"""
+        self._test()
+        return [partner for partner in self._partners.get(polygon, ()) if self._key(polygon, partner) in self._intersecting]
+
+    def _test(self) -> None:
+        """Updates the boxes, then runs the narrow phase of the pairs that are new or whose polygons changed"""
+        self.update()
+        for key in self._untested:
+            pair = self._pairs[key]
+            if self._intersect(pair):
+                self._intersecting[key] = (pair[0], pair[1])
+            else:
+                self._intersecting.pop(key, None)
+        self._untested.clear()
+
+    def _intersect(self, pair: list) -> bool:
+        """Narrow phase of a pair, kept with the versions of the polygons (a pair found again by a rebuild)"""
+        a, b, version_a, version_b, intersect = pair
+        if intersect is None or version_a != a.version or version_b != b.version:
+            intersect = self._y_overlap(a, b) and a.intersects(b)
+            pair[2:] = a.version, b.version, intersect
+        return intersect
+
+    @staticmethod
+    def _y_overlap(a: Polygon, b: Polygon) -> bool:
+        _, a_min_y, _, a_max_y = a.bounds
+        _, b_min_y, _, b_max_y = b.bounds
+        return a_min_y <= b_max_y and b_min_y <= a_max_y
+
+    @staticmethod
+    def _key(a: Polygon, b: Polygon) -> tuple[int, int]:
+        id_a, id_b = id(a), id(b)
+        return (id_a, id_b) if id_a < id_b else (id_b, id_a)
+
+    def _sift(self, endpoint: _Endpoint) -> None:
+        """Moves an endpoint whose value changed to its place, one swap at the time"""
+        endpoints = self._endpoints
+        index = endpoint.index
+        while index > 0 and endpoint.before(endpoints[index - 1]):
+            self._swap(index - 1, index)
+            index -= 1
+        while index + 1 < len(endpoints) and endpoints[index + 1].before(endpoint):
+            self._swap(index, index + 1)
+            index += 1
+
+    def _swap(self, left: int, right: int) -> None:
+        endpoints = self._endpoints
+        first, second = endpoints[left], endpoints[right]
+        endpoints[left], endpoints[right] = second, first
+        second.index, first.index = left, right
+        if first.is_max == second.is_max or first.polygon is second.polygon:
+            return  # two mins (or two maxes) swapped: no interval starts nor ends overlapping
+        a, b = first.polygon, second.polygon
+        a_low, a_high = self._boxes[a]
+        b_low, b_high = self._boxes[b]
+        # from the order of the four ends, so a box still moving (its ends out of order) ends up right
+        if a_low.index < b_high.index and b_low.index < a_high.index:
+            self._pair_add(a, b)
+        else:
+            self._pair_remove(a, b)
+
+    def _pair_add(self, a: Polygon, b: Polygon, pair: Optional[list] = None) -> None:
+        key = self._key(a, b)
+        if key not in self._pairs:
+            self._pairs[key] = pair or [a, b, -1, -1, None]
+            self._partners[a].add(b)
+            self._partners[b].add(a)
+            if self._y_overlap(a, b):  # otherwise not intersecting until one of them moves, which tests it again
+                self._untested[key] = None
+
+    def _pair_remove(self, a: Polygon, b: Polygon) -> None:
+        key = self._key(a, b)
+        if self._pairs.pop(key, None) is not None:
+            self._untested.pop(key, None)
+            self._intersecting.pop(key, None)
+            self._partners[a].discard(b)
+            self._partners[b].discard(a)
+
+    def _rebuild(self) -> None:
+        """Sorts all the ends again and sweeps them once to find the pairs, the narrow phase results are kept"""
+        for polygon, (low, high) in self._boxes.items():
+            low.value, _, high.value, _ = polygon.bounds
+        self._endpoints.sort(key=lambda endpoint: (endpoint.value, endpoint.is_max))
+        pairs_old = self._pairs
+        self._pairs = {}
+        self._untested.clear()
+        self._intersecting.clear()
+        for partners in self._partners.values():
+            partners.clear()
+
+        active: dict[Polygon, None] = {}
+        for index, endpoint in enumerate(self._endpoints):
+            endpoint.index = index
+            polygon = endpoint.polygon
+            if endpoint.is_max:
+                del active[polygon]
+                continue
+            for other in active:
+                self._pair_add(polygon, other, pairs_old.get(self._key(polygon, other)))
+            active[polygon] = None
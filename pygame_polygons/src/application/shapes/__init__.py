@@ -1 +1,4 @@
-from .polygon import Polygon
\ No newline at end of file
+from .vertex_store import VertexStore
+from .polygon import Polygon
+from .polygon_lod import PolygonLod
+from .polygon_renderer import PolygonRenderer
@@ -0,0 +1,159 @@
+"""Geometry kernels over (n, 2) vertex arrays.
+
+    They read their input and return new arrays (or answers), never changing the polygons, so they can run in a worker thread on a
+    snapshot of the vertices (see services.GeometryJobs). The work is done by whole-array NumPy operations, which
+    release the GIL while they run.
+"""
+import numpy as np
+
+from .simplify import simplify
+
+AXES_CHUNK: int = 1024  # separating axes tested at once
+PAIRS_CHUNK: int = 1 << 16  # pairs of edges tested at once: bounds the memory, and stops early at the first crossing
+
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    """Convex hull of the points (quickhull): each split of the hull is a few whole-array operations
+
+    :param points: (n, 2) array of x,y coordinates
+    :return: np.ndarray (m, 2) the hull vertices, in order around the hull, without collinear points
+    """
+    points = np.unique(np.asarray(points, dtype=np.float64).reshape(-1, 2), axis=0)  # sorted by x, then y
+    if len(points) < 3:
+        return points
+    first, last = points[0], points[-1]
+
+    hull = [first]
+    # edges of the hull still to split: (start, end, points on the outer side of start -> end), the next one on top
+    stack = [(last, first, _outside(points, last, first)), (first, last, _outside(points, first, last))]
+    while stack:
+        start, end, outside = stack.pop()
+        if not len(outside):
+            hull.append(end)
+            continue
+        farthest = outside[np.argmax(_cross(outside, start, end))]
+        # start -> farthest first, then farthest -> end
+        stack.append((farthest, end, _outside(outside, farthest, end)))
+        stack.append((start, farthest, _outside(outside, start, farthest)))
+    return np.array(hull[:-1])  # the last edge ends where the hull began
+
+
+def _cross(points: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Cross product of start -> end with start -> each point, positive on one side of the line"""
+    return (end[0] - start[0]) * (points[:, 1] - start[1]) - (end[1] - start[1]) * (points[:, 0] - start[0])
+
+
+def _outside(points: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    return points[_cross(points, start, end) > 0]
+
+
+def simplified(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """The vertices kept by the Ramer–Douglas–Peucker simplification of a polygon, see shapes.simplify
+
+    :param points: (n, 2) array of x,y coordinates
+    :param tolerance: float vertices closer than tolerance to the simplified outline are dropped
+    :return: np.ndarray (m, 2)
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return points[simplify(points, tolerance)]
+
+
+def is_convex(points: np.ndarray) -> bool:
+    """The polygon is convex: its edges all turn the same way, around it once (a pentagram turns one way but twice)
+
+    :param points: (n, 2) array of x,y coordinates
+    :return: bool
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    edges = np.roll(points, -1, axis=0) - points
+    edges = edges[(edges != 0).any(axis=1)]  # repeated vertices
+    if len(edges) < 3:
+        return True
+    following = np.roll(edges, -1, axis=0)
+    turns = edges[:, 0] * following[:, 1] - edges[:, 1] * following[:, 0]
+    if (turns > 0).any() and (turns < 0).any():
+        return False
+    angles = np.arctan2(turns, (edges * following).sum(axis=1))
+    return abs(abs(angles.sum()) - 2 * np.pi) < 1e-6
+
+
+def polygons_intersect(a: np.ndarray, b: np.ndarray, a_convex: bool = False, b_convex: bool = False) -> bool:
+    """Two polygons intersect: they overlap, one contains the other or they only touch (their outlines included)
+
+        Two convex polygons are tested by the separating axis theorem. Otherwise either a vertex of one polygon is
+        inside the other or their edges cross (only the edges through the overlap of their bounding boxes are tested).
+
+    :param a: (n, 2) array of x,y coordinates
+    :param b: (m, 2) array of x,y coordinates
+    :param a_convex: bool a is convex (see is_convex)
+    :param b_convex: bool b is convex
+    :return: bool
+    """
+    a = np.asarray(a, dtype=np.float64).reshape(-1, 2)
+    b = np.asarray(b, dtype=np.float64).reshape(-1, 2)
+    if not len(a) or not len(b):
+        return False
+    if a_convex and b_convex:
+        return not _separating_axis(a, b) and not _separating_axis(b, a)
+    # containment first, linear: an overlap often has a vertex inside the other polygon
+    return point_in_polygon(a[0], b) or point_in_polygon(b[0], a) or _edges_cross(a, b)
+
+
+def point_in_polygon(point, points: np.ndarray) -> bool:
+    """The point is inside the polygon (even-odd rule)"""
+    x, y = float(point[0]), float(point[1])
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    starts, ends = points, np.roll(points, -1, axis=0)
+    straddles = (starts[:, 1] > y) != (ends[:, 1] > y)
+    starts, ends = starts[straddles], ends[straddles]
+    crossings_x = starts[:, 0] + (y - starts[:, 1]) * (ends[:, 0] - starts[:, 0]) / (ends[:, 1] - starts[:, 1])
+    return bool(np.count_nonzero(crossings_x > x) % 2)
+
+
+def _separating_axis(a: np.ndarray, b: np.ndarray) -> bool:
+    """One of the edge normals of a separates the projections of a and b"""
+    edges = np.roll(a, -1, axis=0) - a
+    for start in range(0, len(edges), AXES_CHUNK):
+        axes = edges[start:start + AXES_CHUNK][:, ::-1] * (1, -1)  # normals, not normalized: only signs matter
+        projected_a, projected_b = a @ axes.T, b @ axes.T
+        if ((projected_a.max(axis=0) < projected_b.min(axis=0)) |
+                (projected_b.max(axis=0) < projected_a.min(axis=0))).any():
+            return True
+    return False
+
+
+def _edges_cross(a: np.ndarray, b: np.ndarray) -> bool:
+    """An edge of a crosses (or touches) an edge of b"""
+    # a crossing is in both bounding boxes: only the edges through their overlap are tested
+    low, high = np.maximum(a.min(axis=0), b.min(axis=0)), np.minimum(a.max(axis=0), b.max(axis=0))
+    if (low > high).any():
+        return False
+    a_starts, a_ends = _edges_in(a, low, high)
+    b_starts, b_ends = _edges_in(b, low, high)
+    if not len(a_starts) or not len(b_starts):
+        return False
+    b_min, b_max = np.minimum(b_starts, b_ends), np.maximum(b_starts, b_ends)
+    rows = max(1, PAIRS_CHUNK // len(b_starts))
+    for start in range(0, len(a_starts), rows):
+        p, r = a_starts[start:start + rows, None], a_ends[start:start + rows, None]
+        # the ends of each segment are on both sides of the line of the other one (or on it)
+        side_1, side_2 = _orientation(p, r, b_starts), _orientation(p, r, b_ends)
+        side_3, side_4 = _orientation(b_starts, b_ends, p), _orientation(b_starts, b_ends, r)
+        # with collinear segments the orientations are all 0, their boxes tell whether they overlap
+        boxes = ((np.minimum(p, r) <= b_max) & (np.maximum(p, r) >= b_min)).all(axis=2)
+        if ((side_1 * side_2 <= 0) & (side_3 * side_4 <= 0) & boxes).any():
+            return True
+    return False
+
+
+def _edges_in(points: np.ndarray, low: np.ndarray, high: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Edges of the polygon whose bounding box overlaps the box low - high, as (starts, ends)"""
+    starts, ends = points, np.roll(points, -1, axis=0)
+    near = ((np.minimum(starts, ends) <= high) & (np.maximum(starts, ends) >= low)).all(axis=1)
+    return starts[near], ends[near]
+
+
+def _orientation(start: np.ndarray, end: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Sign of the turn start -> end -> point, broadcast over the arrays"""
+    return np.sign((end[..., 0] - start[..., 0]) * (points[..., 1] - start[..., 1]) -
+                   (end[..., 1] - start[..., 1]) * (points[..., 0] - start[..., 0]))
@@ -1,17 +1,47 @@
-import math
-import copy
-from typing import Union, Optional
-import pygame
+from array import array
+from typing import Union, Optional, Sequence
+import numpy as np
 from pygame.math import Vector2
 import random
 
+from .vertex_store import VertexStore, rotate_points
+from .trig_tables import unit_polygon
+from .geometry import is_convex, polygons_intersect
+
+
 class Polygon:
+    """A polygon of the scene: the geometry (a handle to its slot in the VertexStore) and its style.
+
+        The class is slotted and does not reference the app nor any surface, so that thousands of shapes stay cheap:
+        drawing is done by the PolygonRenderer. The attributes that are not geometry (spatial_index, broad_phase,
+        journal) are set by the view the polygon is added to.
+    """
+    __slots__ = (
+        'store',
+        'handle',
+        'radius',
+        'position_initial',
+        'vertex_count_initial',
+        'vertices_original',
+        'vertices_added',
+        'version',
+        'shape_version',
+        'spatial_index',
+        'broad_phase',
+        'journal',
+        '_centroid',
+        '_bounds',
+        '_bounds_version',
+        '_convex',
+        '_convex_version',
+        '_border_color',
+        '_background_color',
+        '_border_width',
+        '__weakref__',  # the renderer caches rasters in a WeakKeyDictionary
+    )
+
     BORDER_WIDTH: int = 1
-    DOT_CIRCLE_RADIUS: int = 5
 
-    TEXT_COLOR: tuple[int, int, int] = (255, 255, 255)
-    VERTEX_DOT_COLOR: tuple[int, int, int] = (255, 0, 0)
-    CENTROID_DOT_COLOR: tuple[int, int, int] = (79, 0, 153)
     # TODO: Check https://superuser.com/questions/361297/what-colour-is-the-dark-green-on-old-fashioned-green-screen-computer-displays
     TERMINAL_COLORS: dict[str, tuple[int, int, int]] = {
         'amber': (255, 176, 0),
@@ -26,41 +56,241 @@ class Polygon:
     }
     DEFAULT_TERMINAL_COLORS: tuple[str] = tuple(TERMINAL_COLORS.keys())
 
-    def __init__(self, app, vertex_count: int, radius: int, position: Vector2):
-        self.app = app
-        self.screen: pygame.Surface = self.app.background
-        self.vertex_count: int = vertex_count
+    def __init__(self, store: VertexStore, vertex_count: int, radius: int, position: Sequence,
+                 handle: Optional[int] = None, centroid: Optional[Sequence] = None):
+        """
+        :param store: VertexStore of the scene
+        :param vertex_count: int vertices of the regular polygon drawn initially (and on reset)
+        :param radius: int
+        :param position: Sequence x,y center of the regular polygon
+        :param handle: int|None slot of vertices already in the store (e.g. a loaded scene), the regular polygon is
+            drawn in a new slot when None
+        :param centroid: Sequence|None centroid of the vertices of handle when known, so they are not read
+        """
         self.radius: int = radius
-        self.position_initial: Vector2
+        self.position_initial: tuple[float, float] = (float(position[0]), float(position[1]))
+        self.vertex_count_initial: int = vertex_count
+        # outline restored on reset when the polygon was not drawn as a regular polygon (e.g. an imported outline)
+        self.vertices_original: Optional[np.ndarray] = None
+
+        # the vertices live in the scene vertex store, the polygon only keeps its slot handle
+        self.store: VertexStore = store
+        if handle is None:
+            handle = self.store.add(Polygon.draw_regular_polygon(vertex_count, radius, position))
+        self.handle: int = handle
+        self._centroid: Vector2 = Vector2(*self.store.centroid(self.handle)) if centroid is None else \
+            Vector2(centroid[0], centroid[1])
+
+        self.vertices_added: array = array('i')  # indexes of the vertices added by the user, latest last
+
+        # bumped at every change of the vertices or of the style
+        self.version: int = 0
+        # bumped at every change of the look of the polygon, that is any change but translations
+        self.shape_version: int = 0
+
+        # bounding box, computed again only after the vertices changed (see bounds)
+        self._bounds: tuple[float, float, float, float] = (0., 0., 0., 0.)
+        self._bounds_version: int = -1
+        # convexity, computed again only after the shape changed (see is_convex)
+        self._convex: bool = False
+        self._convex_version: int = -1
+
+        self._border_color: tuple = self.TERMINAL_COLORS[self.DEFAULT_TERMINAL_COLORS[random.randint(0, len(self.DEFAULT_TERMINAL_COLORS) - 1)]]
+        self._background_color: Optional[tuple] = None
+
+        self._border_width: int = self.BORDER_WIDTH
+
+        # hit-testing index of the view the polygon belongs to (SpatialHash), kept up to date on every change
+        self.spatial_index = None
+        # overlap queries of the view the polygon belongs to (SweepAndPrune), told of every move or change
+        self.broad_phase = None
+        # undo / redo history of the view the polygon belongs to (EditJournal), every change is recorded as a delta
+        self.journal = None
 
-        self._vertices: list[Vector2] = Polygon.draw_regular_polygon(vertex_count, radius, position)
-        self._centroid: Vector2 = Polygon.get_polygon_centroid(self.vertices)
+    @property
+    def vertices(self) -> np.ndarray:
+        """The vertices property, a (n, 2) view on the vertex store. Don't keep it around, see VertexStore.view"""
+        return self.store.view(self.handle)
 
-        self._vertices_original: list[Vector2] = copy.deepcopy(self._vertices) # old values of the original polygon
-        self.vertices_added: list[tuple[int, Vector2]] = []
+    @vertices.setter
+    def vertices(self, value: Union[np.ndarray, Sequence]) -> None:
+        """Sets the vertices"""
+        vertices_old = self.vertices.copy() if self.journal is not None else None
+        self.store.set(self.handle, value)
+        self.centroid = None
+        self._on_change()
+        if vertices_old is not None:
+            added = array('i', self.vertices_added)
+            self.journal.vertices_replaced(self, vertices_old, self.vertices.copy(), added, added)
+
+    @property
+    def vertex_count(self) -> int:
+        return self.store.length(self.handle)
+
+    def vertices_reset(self):
+        """Resets the vertices at its initial value. The original polygon is vertices_original when set, otherwise it
+        is drawn again from its initial vertex count, radius and position. The reset is recorded in the journal so it
+        can be undone too"""
+        vertices_old = self.vertices.copy()
+        added_old = array('i', self.vertices_added)
+        if self.vertices_original is not None:
+            vertices_original = self.vertices_original.copy()
+        else:
+            vertices_original = Polygon.draw_regular_polygon(self.vertex_count_initial, self.radius,
+                                                             self.position_initial)
 
-        self.border_color: tuple = self.TERMINAL_COLORS[self.DEFAULT_TERMINAL_COLORS[random.randint(0, len(self.DEFAULT_TERMINAL_COLORS) - 1)]]
-        self.background_color: Optional[tuple] = None
+        self.vertices_added = array('i')  # remove all added verticex
+        self.store.set(self.handle, vertices_original)  # reset vertices to its original
+        self.centroid = None
+        self._on_change()
+        if self.journal is not None:
+            self.journal.vertices_replaced(self, vertices_old, vertices_original, added_old, array('i'))
+
+    def vertices_replace(self, vertices: Union[np.ndarray, Sequence]) -> None:
+        """Replaces the whole outline by new vertices (e.g. its convex hull or its simplification), the vertices added
+        by the user are not tracked anymore. The change is recorded in the journal so it can be undone
+
+        :param vertices: (n, 2) array of x,y coordinates
+        :return:
+        """
+        vertices_old = self.vertices.copy()
+        added_old = array('i', self.vertices_added)
+        self.vertices_added = array('i')
+        self.store.set(self.handle, vertices)
+        self.centroid = None
+        self._on_change()
+        if self.journal is not None:
+            self.journal.vertices_replaced(self, vertices_old, self.vertices.copy(), added_old, array('i'))
+
+    def vertex_insert(self, vertex_index: int, position: Sequence, added: bool = False) -> None:
+        """Inserts a new vertex at vertex_index
+
+        :param vertex_index: int
+        :param position: Sequence x, y
+        :param added: bool the vertex is added by the user, it is tracked in vertices_added
+        :return:
+        """
+        position = (float(position[0]), float(position[1]))
+        self.store.insert(self.handle, vertex_index, position)
+        if added:
+            self.vertices_added.append(vertex_index)
+        self.centroid = None
+        self._on_change()
+        if self.journal is not None:
+            self.journal.vertex_inserted(self, vertex_index, position, added)
+
+    def vertex_remove(self, vertex_index: int, added: bool = False) -> None:
+        """Removes the vertex at vertex_index
+
+        :param vertex_index: int
+        :param added: bool the vertex is the latest one added by the user, it is removed from vertices_added too
+        :return:
+        """
+        x, y = self.store.pop(self.handle, vertex_index)
+        if added and self.vertices_added:
+            self.vertices_added.pop()
+        self.centroid = None
+        self._on_change()
+        if self.journal is not None:
+            self.journal.vertex_removed(self, vertex_index, (float(x), float(y)), added)
+
+    def dispose(self) -> None:
+        """Releases the polygon vertices from the vertex store. The polygon can not be used afterwards"""
+        if self.spatial_index is not None:
+            self.spatial_index.remove(self)
+            self.spatial_index = None
+        if self.broad_phase is not None:
+            self.broad_phase.remove(self)
+            self.broad_phase = None
+        self.store.remove(self.handle)
+        self.version += 1  # results computed on the vertices in the meanwhile are stale (see GeometryJobs)
+
+    def _on_change(self, vertex_index: Optional[int] = None, translation: bool = False) -> None:
+        """Must be called after any change of the vertices
+
+        :param vertex_index: int|None the only vertex that changed, None if the whole polygon did
+        :param translation: bool the polygon was only moved, its look did not change
+        :return:
+        """
+        self.version += 1
+        if not translation:
+            self.shape_version += 1
+        if self.broad_phase is not None:
+            self.broad_phase.moved(self)
+        if self.spatial_index is None:
+            return
+        if vertex_index is None:
+            self.spatial_index.update(self)
+        else:
+            self.spatial_index.update_vertex(self, vertex_index)
 
-        self.border_width: int = self.BORDER_WIDTH
+    def _on_style_change(self) -> None:
+        self.version += 1
+        self.shape_version += 1
 
     @property
-    def vertices(self) -> list[Vector2]:
-        """The vertices property."""
-        return self._vertices
+    def border_color(self) -> tuple:
+        return self._border_color
 
-    @vertices.setter
-    def vertices(self, value: list[Vector2]) -> None:
-        """Sets the vertices"""
-        self._vertices = value
+    @border_color.setter
+    def border_color(self, value: tuple) -> None:
+        if value != self._border_color:
+            if self.journal is not None:
+                self.journal.style_changed(self, 'border_color', self._border_color, value)
+            self._border_color = value
+            self._on_style_change()
 
-    def vertices_reset(self):
-        """Resets the vertices at its initial value"""
-        self.vertices_added.clear()                  # remove all added verticex
-        self._vertices = copy.deepcopy(self._vertices_original) # reset vertices to its original
-        self.vertex_count = len(self.vertices)  # reset vertex count
+    @property
+    def background_color(self) -> Optional[tuple]:
+        return self._background_color
+
+    @background_color.setter
+    def background_color(self, value: Optional[tuple]) -> None:
+        if value != self._background_color:
+            if self.journal is not None:
+                self.journal.style_changed(self, 'background_color', self._background_color, value)
+            self._background_color = value
+            self._on_style_change()
+
+    @property
+    def border_width(self) -> int:
+        return self._border_width
+
+    @border_width.setter
+    def border_width(self, value: int) -> None:
+        if value != self._border_width:
+            if self.journal is not None:
+                self.journal.style_changed(self, 'border_width', self._border_width, value)
+            self._border_width = value
+            self._on_style_change()
 
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Bounding box of the vertices (min_x, min_y, max_x, max_y), cached until the polygon changes"""
+        if self._bounds_version != self.version:
+            self._bounds = self.store.bounds(self.handle)
+            self._bounds_version = self.version
+        return self._bounds
 
+    @property
+    def is_convex(self) -> bool:
+        """The polygon is convex, cached until its shape changes"""
+        if self._convex_version != self.shape_version:
+            self._convex = is_convex(self.vertices)
+            self._convex_version = self.shape_version
+        return self._convex
+
+    def intersects(self, other: 'Polygon') -> bool:
+        """The polygon overlaps other, contains it, is inside it or touches it (see shapes.geometry.polygons_intersect)
+
+        :param other: Polygon
+        :return: bool
+        """
+        min_x, min_y, max_x, max_y = self.bounds
+        other_min_x, other_min_y, other_max_x, other_max_y = other.bounds
+        if max_x < other_min_x or other_max_x < min_x or max_y < other_min_y or other_max_y < min_y:
+            return False
+        return polygons_intersect(self.vertices, other.vertices, self.is_convex, other.is_convex)
 
     @property
     def centroid(self) -> Vector2:
@@ -70,64 +300,12 @@ class Polygon:
     @centroid.setter
     def centroid(self, _: None = None) -> None:
         """Sets the Centroid"""
-        self._centroid = Polygon.get_polygon_centroid(self.vertices)
-
-    def draw(self):
-        """ Draws a polygon and its center dot (centroid / barycenter)
+        self._centroid = Vector2(*self.store.centroid(self.handle))
 
-        :return:
-        """
-
-        if self.background_color:
-            # add always transparency
-            if len(self.background_color) == 4:
-                background_color = self.background_color
-            else:
-                background_color = tuple([*self.background_color, 55])
-
-            pygame.draw.polygon(self.screen, background_color, self.vertices)
-            pygame.draw.polygon(self.screen, self.border_color, self.vertices, width=self.border_width+2)
-        else:
-            pygame.draw.polygon(self.screen, self.border_color, self.vertices, width=self.border_width)
-        pygame.draw.circle(
-            self.screen,
-            self.CENTROID_DOT_COLOR,
-            Vector2(self.centroid.x, self.centroid.y),
-            self.DOT_CIRCLE_RADIUS
-        )  # draw dot around center
-        self.write_vertex_coords(self.centroid)
-
-    def vertex_focus(self, vertex_index: int) -> None:
-        """Focus a Vertex, make it in a red dot
-
-        :param vertex_index:
-        :return:
-        """
-        try:
-            vertex = self.vertices[vertex_index]
-        except IndexError as err:
-            print(str(err))
-            return
-        pygame.draw.circle(
-            self.screen,
-            self.VERTEX_DOT_COLOR,
-            Vector2(vertex[0], vertex[1]),
-            self.DOT_CIRCLE_RADIUS
-        )  # draw red dot around vertex
-        if pygame.mouse.get_cursor() != pygame.SYSTEM_CURSOR_SIZEALL:
-            pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_SIZEALL)
-
-    def write_vertex_coords(self, vertex: Vector2):
-        """Write the coordinates of a particualr vertex"""
-        # write vertex coordinates into the vertex
-        about_text1 = f"{round(vertex.x, 2)}-{round(vertex.y, 2)}"
-        font_img = self.app.font_small.render(about_text1, True, (255, 255, 255))
-        self.screen.blit(font_img, Vector2(vertex.x + 5, vertex.y + 5))
-
-    def update_vertices_positions(self, vertices: list[Vector2]):
+    def update_vertices_positions(self, vertices: Union[np.ndarray, list[Vector2]]):
         """Update the polygon's Vertices position
 
-        :param vertices: list[Vector2]
+        :param vertices: np.ndarray|list[Vector2]
         :return:
         """
         self.vertices = vertices
@@ -137,76 +315,72 @@ class Polygon:
     # ----------------
 
     @staticmethod
-    def draw_regular_polygon(vertex_count: int, radius: int, position: Vector2) -> list[Vector2]:
+    def draw_regular_polygon(vertex_count: int, radius: int, position: Sequence) -> np.ndarray:
         """@credit: https://stackoverflow.com/a/57638991/13903942 """
         n, r = vertex_count, radius
         x, y = position
-        return [
-            Vector2(x + r * math.cos(2 * math.pi * i / n), y + r * math.sin(2 * math.pi * i / n))
-            for i in range(n)
-        ]
+        return unit_polygon(n) * r + (x, y)  # the unit polygon is cached, this is just a scale and offset
 
     @staticmethod
-    def get_polygon_centroid(polygon: list[Vector2]) -> Vector2:
+    def get_polygon_centroid(polygon: Union[np.ndarray, list[Vector2]]) -> Vector2:
         """Finds the centroid /  barycenter of a polygon
 
-        :param polygon: list[Vector2]
+        :param polygon: np.ndarray|list[Vector2]
         :return: Vector2 x,y coordinates of the centroid/ barycenter of the given polygon
         """
         # finds the center of a polygon
-        vertices_x: list = []
-        vertices_y: list = []
-        for vertex in polygon:
-            vertices_x.append(vertex[0])
-            vertices_y.append(vertex[1])
-        vertices_count: int = len(polygon)
-        centroid = Vector2(sum(vertices_x) / vertices_count,
-                           sum(vertices_y) / vertices_count)  # finds the center of a polygon
-        return centroid
+        return Vector2(*np.asarray(polygon, dtype=np.float64).reshape(-1, 2).mean(axis=0))
 
     def move(self, move_to: Vector2) -> None:
         """Move a polygon following its x, y coordinates
 
-        :param vertices:
         :param move_to:
         :return:
         """
-        vertices: list[Vector2] = self._vertices
-        centroid = Polygon.get_polygon_centroid(vertices)  # get the polygon centroid
+        centroid = self.store.centroid(self.handle)  # get the polygon centroid
+        self.translate(Vector2(move_to[0] - centroid[0], move_to[1] - centroid[1]))
 
-        pos_x, pos_y = move_to
-        for vertex_index, vertex in enumerate(vertices):
-            move_x = pos_x - centroid[0]
-            move_y = pos_y - centroid[1]
-            vertices[vertex_index][0] += move_x
-            vertices[vertex_index][1] += move_y
+    def translate(self, delta: Vector2) -> None:
+        """Moves the whole polygon by delta"""
+        self.store.translate(self.handle, delta)
+        self.centroid = None  # reset the polygon centroid
+        self._on_change(translation=True)
+        if self.journal is not None:
+            self.journal.translated(self, delta)
 
-        self.centroid = vertices # reset the polygon centroid
     def move_vertix(self, vertex_index: int, position: Vector2) -> None:
         try:
-            _: Vector2 = self._vertices[vertex_index]  # test check that the vertex exits
+            x, y = self.store.view(self.handle)[vertex_index]
+            self.store.set_vertex(self.handle, vertex_index, position)
         except IndexError:
             return
-        self._vertices[vertex_index] = position
-        self.centroid = self._vertices  # reset the polygon centroid
+        self.centroid = None  # reset the polygon centroid
+        self._on_change(vertex_index if vertex_index >= 0 else None)
+        if self.journal is not None:
+            self.journal.vertex_moved(self, vertex_index, (float(x), float(y)),
+                                      (float(position[0]), float(position[1])))
+
+    def rotate(self, angle: Union[float, int]) -> None:
+        """Rotates the polygon around its centroid by the given angle
+        Positve angle: anti-clockwise
+        Negative angle: clockwise
+        """
+        self.store.rotate(self.handle, angle)
+        self.centroid = None  # reset the polygon centroid
+        self._on_change()
+        if self.journal is not None:
+            self.journal.rotated(self, angle)
 
     @staticmethod
-    def polygon_rotate(polygon: list[Vector2], centroid: Vector2, angle: Union[float, int]) -> list[Vector2]:
+    def polygon_rotate(polygon: Union[np.ndarray, list[Vector2]], centroid: Vector2, angle: Union[float, int]) -> np.ndarray:
         """Rotates a polygon to its centroid as its origin by the given angle
         Positve angle: anti-clockwise
         Negative angle: clockwise
 
-        :param polygon: list[Vector2]
+        :param polygon: np.ndarray|list[Vector2]
         :param centroid: Vector2 Center of the polygon
         :param angle: float|int   Angle
         :return:
         """
-        return [
-            Vector2(
-                centroid[0] + ((vertex[0] - centroid[0]) * math.cos(angle)) - (
-                        (vertex[1] - centroid[1]) * math.sin(angle)),
-                centroid[1] + ((vertex[0] - centroid[0]) * math.sin(angle)) + (
-                        (vertex[1] - centroid[1]) * math.cos(angle))
-            )
-            for vertex_index, vertex in enumerate(polygon)
-        ]
+        points = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+        return rotate_points(points, np.array((centroid[0], centroid[1])), angle)
@@ -0,0 +1,90 @@
+from typing import Optional
+from weakref import WeakKeyDictionary
+import numpy as np
+
+from .polygon import Polygon
+from .simplify import significance
+
+
+class PolygonLod:
+    """Levels of detail of the polygons: the Ramer–Douglas–Peucker simplifications of each polygon at the TOLERANCES.
+
+        The levels of a polygon are computed from a single refinement (see shapes.simplify.significance) and again
+        only when its look changes (see Polygon.shape_version): a moved polygon keeps its levels. A polygon that is
+        changing (e.g. a vertex being dragged) is drawn whole, its levels are computed once it stayed the same for a
+        frame, and at most FRAME_BUDGET vertices are refined in a frame (see frame; a polygon bigger than it is
+        refined alone in its frame), so a big scene that was just opened gets its levels over a few frames. Like the rasters of the PolygonRenderer, the levels are kept here
+        and go away with the polygons.
+    """
+    TOLERANCES: tuple[float, ...] = (.25, .5, 1., 2., 4., 8., 16., 32.)  # world units, finest first
+    MAX_ERROR: float = 1.  # pixels, the level drawn is the coarsest one whose error is below it
+    MIN_VERTICES: int = 64  # smaller polygons are always drawn whole
+    FRAME_BUDGET: int = 2000  # vertices refined in a frame at most (about 30ms)
+
+    def __init__(self):
+        # polygon -> (shape version, vertex count, [(tolerance, kept vertex indexes) ...] or None while changing)
+        self._levels: WeakKeyDictionary = WeakKeyDictionary()
+        self._budget: int = self.FRAME_BUDGET
+
+    def frame(self) -> None:
+        """A new frame starts, levels can be computed again"""
+        self._budget = self.FRAME_BUDGET
+
+    def levels(self, polygon: Polygon) -> Optional[list[tuple[float, np.ndarray]]]:
+        """The levels of detail of the polygon, finest first: the tolerance and the indexes of the vertices kept.
+        None when the polygon is new or changed since the previous call (it may be changing again), or the frame
+        budget is over
+
+        :param polygon: Polygon
+        :return: list|None
+        """
+        cached = self._levels.get(polygon)
+        key = (polygon.shape_version, polygon.vertex_count)
+        if cached is not None and cached[:2] == key:
+            # unchanged since the previous call, and fits in the budget (the first polygon of a frame always does,
+            # so a polygon bigger than the budget still gets its levels)
+            if cached[2] is None and (key[1] <= self._budget or self._budget == self.FRAME_BUDGET):
+                self._budget -= key[1]
+                cached = (*key, self._simplify(polygon.vertices))
+                self._levels[polygon] = cached
+            return cached[2]
+        self._levels[polygon] = (*key, None)
+        return None
+
+    def select(self, polygon: Polygon, scale: float = 1.) -> tuple[float, Optional[np.ndarray]]:
+        """The level of detail to draw the polygon with
+
+        :param polygon: Polygon
+        :param scale: float pixels per world unit
+        :return: tuple the level tolerance (0 for the whole polygon) and the indexes of the vertices kept, None when
+            all of them are
+        """
+        if polygon.vertex_count < self.MIN_VERTICES:
+            return 0., None
+        selected = (0., None)
+        for tolerance, indexes in self.levels(polygon) or ():
+            if tolerance * scale >= self.MAX_ERROR:
+                break
+            selected = (tolerance, indexes)
+        if selected[1] is not None and len(selected[1]) == polygon.vertex_count:
+            return 0., None
+        return selected
+
+    def _simplify(self, vertices: np.ndarray) -> list[tuple[float, np.ndarray]]:
+        rates = significance(vertices, self.TOLERANCES[0])
+        # a level is a polygon, the 3 most significant vertices are always kept
+        top = np.argpartition(rates, len(rates) - 3)[-3:]
+        levels = []
+        for tolerance in self.TOLERANCES:
+            kept = rates > tolerance
+            kept[top] = True
+            levels.append((tolerance, np.flatnonzero(kept)))
+        return levels
+
+    def clear(self) -> None:
+        """Drops all the levels"""
+        self._levels.clear()
+
+    @property
+    def polygon_count(self) -> int:
+        return len(self._levels)
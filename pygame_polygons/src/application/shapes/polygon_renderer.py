@@ -0,0 +1,174 @@
+import math
+from typing import Optional, Sequence
+from weakref import WeakKeyDictionary
+import numpy as np
+import pygame
+from pygame.math import Vector2
+
+from ..display import display_format
+from .polygon import Polygon
+from .polygon_lod import PolygonLod
+
+
+class PolygonRenderer:
+    """Draws the polygons on a surface: shape, centroid dot, coordinates labels and focused vertex.
+
+        Every polygon is rasterized in its own transparent surface, which is re-used as long as the polygon look does
+        not change (see Polygon.shape_version): a moved polygon is the same raster blitted somewhere else. The rasters
+        are kept here, not in the polygons, and go away with them.
+
+        The polygons are in world coordinates and drawn through the camera: the rasters are in screen pixels, they are
+        re-used while panning and drawn again when the zoom changes. Polygons with many vertices are rasterized at
+        their coarsest level of detail that looks the same at the zoom (see PolygonLod), the vertices it drops are not
+        labelled either.
+    """
+    DOT_CIRCLE_RADIUS: int = 5
+    BACKGROUND_ALPHA: int = 55  # transparency of the background color when is given without alpha
+    RASTER_CACHE_MAX_AREA: int = 1024 * 1024  # bigger polygons are rasterized every frame, not cached
+
+    VERTEX_DOT_COLOR: tuple[int, int, int] = (255, 0, 0)
+    CENTROID_DOT_COLOR: tuple[int, int, int] = (79, 0, 153)
+
+    def __init__(self, screen: pygame.Surface, label_cache, dirty_rects, camera):
+        """
+        :param screen: pygame.Surface where the polygons are drawn
+        :param label_cache: LabelCache rendered coordinates labels
+        :param dirty_rects: DirtyRects where the drawn regions are reported
+        :param camera: Camera world to screen transform, the polygons are in world coordinates
+        """
+        self.screen: pygame.Surface = screen
+        self.label_cache = label_cache
+        self.dirty_rects = dirty_rects
+        self.camera = camera
+        self.lod: PolygonLod = PolygonLod()
+
+        # polygon -> (raster, top-left corner, shape version, screen centroid when rasterized, level of detail
+        # tolerance, zoom)
+        self._rasters: WeakKeyDictionary = WeakKeyDictionary()
+
+    def draw(self, polygon: Polygon) -> Optional[np.ndarray]:
+        """ Draws a polygon and its center dot (centroid / barycenter)
+
+        :param polygon: Polygon
+        :return: np.ndarray|None indexes of the vertices drawn by the level of detail, None when all of them are
+        """
+        zoom = self.camera.zoom
+        centroid = polygon.centroid
+        centroid_screen = self.camera.to_screen((centroid.x, centroid.y))
+        tolerance, indexes = self.lod.select(polygon, zoom)
+        cached = self._rasters.get(polygon)
+        if cached is None or cached[2] != polygon.shape_version or cached[4] != tolerance or cached[5] != zoom:
+            min_x, min_y, max_x, max_y = self.screen_bounds(polygon)
+            if (max_x - min_x) * (max_y - min_y) > self.RASTER_CACHE_MAX_AREA:
+                # too big to keep in memory (e.g. zoomed in), draw only what is on the screen and forget it
+                self._rasters.pop(polygon, None)
+                raster, offset = self.rasterize(polygon, indexes, self.screen.get_rect())
+                self.dirty_rects.add(self.screen.blit(raster, (round(offset.x), round(offset.y))))
+                self.write_vertex_coords(centroid, centroid_screen)
+                return indexes
+            raster, offset = self.rasterize(polygon, indexes)
+            raster = display_format(raster)  # blitted as long as the polygon look does not change
+            cached = (raster, offset, polygon.shape_version, Vector2(*centroid_screen), tolerance, zoom)
+            self._rasters[polygon] = cached
+
+        raster, offset, _, anchor, _, _ = cached
+        # the polygon (or the camera) may have been moved since it was rasterized
+        x, y = offset.x + centroid_screen[0] - anchor.x, offset.y + centroid_screen[1] - anchor.y
+        self.dirty_rects.add(self.screen.blit(raster, (round(x), round(y))))
+        self.write_vertex_coords(centroid, centroid_screen)
+        return indexes
+
+    def screen_bounds(self, polygon: Polygon) -> tuple[float, float, float, float]:
+        """Bounding box of the polygon on the screen (min_x, min_y, max_x, max_y)"""
+        min_x, min_y, max_x, max_y = polygon.bounds
+        (min_x, min_y), (max_x, max_y) = self.camera.to_screen(((min_x, min_y), (max_x, max_y))).tolist()
+        return min_x, min_y, max_x, max_y
+
+    def rasterize(self, polygon: Polygon, indexes: Optional[np.ndarray] = None,
+                  clip: Optional[pygame.Rect] = None) -> tuple[pygame.Surface, Vector2]:
+        """Draws the polygon (background, border and centroid dot) in a transparent surface as big as its bounding box
+        on the screen. Being the surface transparent, a translucent background color is blended when the surface is
+        blitted, instead of overwriting the alpha of the screen
+
+        :param polygon: Polygon
+        :param indexes: np.ndarray|None the vertices to draw (a level of detail), all of them when None
+        :param clip: pygame.Rect|None screen region the surface is limited to
+        :return: tuple[pygame.Surface, Vector2] the surface and the screen position of its top-left corner
+        """
+        if polygon.background_color:
+            # add always transparency
+            if len(polygon.background_color) == 4:
+                background_color = polygon.background_color
+            else:
+                background_color = (*polygon.background_color, self.BACKGROUND_ALPHA)
+            border_width = polygon.border_width + 2
+        else:
+            background_color = None
+            border_width = polygon.border_width
+
+        padding = max(border_width, self.DOT_CIRCLE_RADIUS) + 2
+        min_x, min_y, max_x, max_y = self.screen_bounds(polygon)
+        area = pygame.Rect(math.floor(min_x) - padding, math.floor(min_y) - padding, 0, 0)
+        area.size = (math.ceil(max_x) + padding - area.x + 1, math.ceil(max_y) + padding - area.y + 1)
+        if clip is not None:
+            area = area.clip(clip)
+        offset = Vector2(area.topleft)
+
+        raster = pygame.Surface(area.size, pygame.SRCALPHA)
+        vertices = self.camera.to_screen(polygon.vertices if indexes is None else polygon.vertices[indexes])
+        vertices -= (offset.x, offset.y)
+        if background_color:
+            pygame.draw.polygon(raster, background_color, vertices)
+        pygame.draw.polygon(raster, polygon.border_color, vertices, width=border_width)
+        centroid = polygon.centroid
+        pygame.draw.circle(
+            raster,
+            self.CENTROID_DOT_COLOR,
+            self.camera.to_screen((centroid.x, centroid.y)) - (offset.x, offset.y),
+            self.DOT_CIRCLE_RADIUS
+        )  # draw dot around center
+        return raster, offset
+
+    def vertex_focus(self, polygon: Polygon, vertex_index: int) -> None:
+        """Focus a Vertex, make it in a red dot
+
+        :param polygon: Polygon
+        :param vertex_index:
+        :return:
+        """
+        try:
+            vertex = polygon.vertices[vertex_index]
+        except IndexError as err:
+            print(str(err))
+            return
+        rect = pygame.draw.circle(
+            self.screen,
+            self.VERTEX_DOT_COLOR,
+            self.camera.to_screen(vertex),
+            self.DOT_CIRCLE_RADIUS
+        )  # draw red dot around vertex
+        self.dirty_rects.add(rect)
+        if pygame.mouse.get_cursor() != pygame.SYSTEM_CURSOR_SIZEALL:
+            pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_SIZEALL)
+
+    def write_vertex_coords(self, vertex: Sequence, position: Optional[Sequence] = None):
+        """Write the coordinates of a particualr vertex
+
+        :param vertex: Sequence x,y world coordinates, the text of the label
+        :param position: Sequence|None x,y screen coordinates of the vertex, same as vertex when None
+        """
+        if position is None:
+            position = vertex
+        # write vertex coordinates into the vertex
+        about_text1 = f"{round(vertex[0], 2)}-{round(vertex[1], 2)}"
+        font_img = self.label_cache.render(about_text1)  # cached, re-rendered only when the text changes
+        self.dirty_rects.add(self.screen.blit(font_img, (position[0] + 5, position[1] + 5)))
+
+    def clear(self) -> None:
+        """Drops all the cached rasters and levels of detail"""
+        self._rasters.clear()
+        self.lod.clear()
+
+    @property
+    def raster_count(self) -> int:
+        return len(self._rasters)
@@ -0,0 +1,122 @@
+"""Polyline / polygon simplification (Ramer–Douglas–Peucker).
+
+    The classic RDP recursion keeps the vertex farthest from the segment joining two kept vertices, as long as it is
+    farther than a tolerance. Here the segments wait in a heap ordered by that distance, so the most significant
+    vertices are always kept first: the simplification can stop either at a tolerance or at a vertex budget, and the
+    result for a budget of n vertices is the best n vertices RDP would keep.
+
+    significance() runs the same refinement once and rates every vertex with the largest tolerance that keeps it, so
+    the simplifications at several tolerances (levels of detail) are just thresholds on the same array.
+"""
+import heapq
+from typing import Optional
+import numpy as np
+
+
+def simplify(points: np.ndarray, tolerance: float = 0., max_vertices: Optional[int] = None,
+             closed: bool = True) -> np.ndarray:
+    """Indexes of the vertices kept by the simplification of points
+
+    :param points: (n, 2) array of x,y coordinates
+    :param tolerance: float vertices closer than tolerance to the simplified outline are dropped
+    :param max_vertices: int|None vertices kept at most (at least 3 for a closed outline, 2 for an open one)
+    :param closed: bool points are a polygon, the last vertex joins the first one
+    :return: np.ndarray sorted int indexes in points
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    count = len(points)
+    minimum = 3 if closed else 2
+    if max_vertices is not None:
+        max_vertices = max(minimum, max_vertices)
+    if count <= minimum or (max_vertices is not None and count <= max_vertices and tolerance <= 0):
+        return np.arange(count)
+
+    if closed:
+        # split the ring at its first vertex and at the farthest vertex from it, the ring end is the first vertex again
+        path = np.vstack((points, points[:1]))
+        farthest = int(np.argmax(((points - points[0]) ** 2).sum(axis=1)))
+        if farthest == 0:  # all the vertices are the same point
+            return np.arange(minimum)
+        kept = [0, farthest]
+        segments = [(0, farthest), (farthest, count)]
+    else:
+        path = points
+        kept = [0, count - 1]
+        segments = [(0, count - 1)]
+
+    heap = []
+    for start, end in segments:
+        _segment_push(heap, path, start, end)
+
+    while heap and (max_vertices is None or len(kept) < max_vertices):
+        distance, start, end, index = heapq.heappop(heap)
+        if -distance <= tolerance and len(kept) >= minimum:
+            break
+        kept.append(index)
+        _segment_push(heap, path, start, index)
+        _segment_push(heap, path, index, end)
+
+    kept = np.array(sorted(kept))
+    return kept[kept < count]
+
+
+def significance(points: np.ndarray, tolerance: float = 0., closed: bool = True) -> np.ndarray:
+    """Largest tolerance at which each vertex is kept by simplify: simplify(points, t) are the indexes whose
+    significance is greater than t. The vertices that start the simplification are infinitely significant
+
+    :param points: (n, 2) array of x,y coordinates
+    :param tolerance: float vertices not kept at this tolerance are not rated, their significance is 0 (the
+        refinement stops earlier on dense outlines)
+    :param closed: bool points are a polygon, the last vertex joins the first one
+    :return: np.ndarray (n,) float significance of each vertex
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    count = len(points)
+    rates = np.zeros(count)
+    if count <= (3 if closed else 2):
+        rates[:] = np.inf
+        return rates
+
+    if closed:
+        path = np.vstack((points, points[:1]))
+        farthest = int(np.argmax(((points - points[0]) ** 2).sum(axis=1)))
+        if farthest == 0:
+            rates[:3] = np.inf
+            return rates
+        rates[[0, farthest]] = np.inf
+        segments = [(0, farthest), (farthest, count)]
+    else:
+        path = points
+        rates[[0, count - 1]] = np.inf
+        segments = [(0, count - 1)]
+
+    heap = []
+    for start, end in segments:
+        _segment_push(heap, path, start, end)
+
+    while heap:
+        distance, start, end, index = heapq.heappop(heap)
+        if -distance <= tolerance:
+            break
+        # kept at a tolerance only if the vertex that split its segment is kept too
+        rates[index] = min(-distance, rates[start], rates[end % count])
+        _segment_push(heap, path, start, index)
+        _segment_push(heap, path, index, end)
+    return rates
+
+
+def _segment_push(heap: list, path: np.ndarray, start: int, end: int) -> None:
+    """Pushes in heap the farthest vertex of path between start and end from the segment start-end"""
+    if end - start < 2:
+        return
+    a, b = path[start], path[end]
+    inner = path[start + 1:end]
+    ab = b - a
+    length = float(ab @ ab)
+    if length == 0.:
+        distances = ((inner - a) ** 2).sum(axis=1)
+    else:
+        cross = ab[0] * (inner[:, 1] - a[1]) - ab[1] * (inner[:, 0] - a[0])
+        distances = cross * cross / length
+    index = int(np.argmax(distances))
+    heapq.heappush(heap, (-float(np.sqrt(distances[index])), start, end, start + 1 + index))
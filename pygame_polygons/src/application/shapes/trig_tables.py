@@ -0,0 +1,49 @@
+"""Memoized trigonometry shared by all the polygon construction and rotation paths.
+
+    A regular polygon of n vertices is always the same unit polygon scaled by its radius and moved to its position,
+    and the same few rotation angles are used over and over (mouse wheel, stars), so both the unit polygons and the
+    rotation matrices are computed once and kept in bounded LRU caches.
+    The returned arrays are read-only, since they are shared.
+"""
+import math
+from functools import lru_cache
+import numpy as np
+
+UNIT_POLYGON_CACHE_SIZE: int = 256
+ROTATION_CACHE_SIZE: int = 512
+
+
+@lru_cache(maxsize=UNIT_POLYGON_CACHE_SIZE)
+def unit_polygon(vertex_count: int) -> np.ndarray:
+    """Vertices of the regular polygon of radius 1 centered in 0,0, starting at angle 0
+
+    :param vertex_count: int
+    :return: np.ndarray (vertex_count, 2) read-only
+    """
+    angles = 2 * np.pi * np.arange(vertex_count) / vertex_count
+    table = np.column_stack((np.cos(angles), np.sin(angles)))
+    table.setflags(write=False)
+    return table
+
+
+@lru_cache(maxsize=ROTATION_CACHE_SIZE)
+def rotation_matrix(angle: float) -> np.ndarray:
+    """Transposed 2d rotation matrix of angle (radians), so that points @ matrix rotates (n, 2) points
+    Positve angle: anti-clockwise
+    Negative angle: clockwise
+
+    :param angle: float
+    :return: np.ndarray (2, 2) read-only
+    """
+    cos_a, sin_a = math.cos(angle), math.sin(angle)
+    matrix = np.array(((cos_a, sin_a), (-sin_a, cos_a)))
+    matrix.setflags(write=False)
+    return matrix
+
+
+def cache_info() -> dict:
+    """Hits / misses of the tables caches"""
+    return {
+        'unit_polygon': unit_polygon.cache_info()._asdict(),
+        'rotation_matrix': rotation_matrix.cache_info()._asdict(),
+    }
@@ -0,0 +1,348 @@
+from typing import Iterable, Optional, Sequence, Union
+import numpy as np
+
+from .trig_tables import rotation_matrix
+
+
+class VertexStore:
+    """Scene level storage of the polygons vertices.
+
+        All the vertices of all the polygons live in one contiguous float64 (or float32, see dtype) block of shape
+        (capacity, 2), every polygon owns a slot described by an offset, a length and a capacity (kept in parallel int
+        arrays, one entry per slot). A Polygon is just a handle to its slot, so moving, rotating or finding the
+        centroid of one or of all polygons is a single numpy call instead of a python loop over Vector2.
+
+        Slots have some head-room so that adding vertices does not always relocate them, when a slot is too small
+        it is moved at the end of the block. Released or relocated slots leave holes that are reclaimed by compact()
+
+        NOTE: the arrays returned by view() are views on the block, they are invalidated by any call that may
+        relocate the data (add, set, insert, compact) so never keep them around.
+    """
+    DEFAULT_CAPACITY: int = 1024
+    DEFAULT_SLOTS: int = 64
+    SLOT_HEADROOM: int = 4  # extra vertices reserved for each polygon slot
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, slots: int = DEFAULT_SLOTS, dtype: type = np.float64):
+        """
+        :param capacity: int initial vertices capacity of the block
+        :param slots: int initial polygons capacity
+        :param dtype: np.float64 or np.float32, the latter halves the memory at the cost of a sub-pixel precision loss
+        """
+        self.dtype: np.dtype = np.dtype(dtype)
+        self._xy: np.ndarray = np.zeros((max(1, capacity), 2), dtype=self.dtype)
+        self._top: int = 0  # first free row of the block
+        self._wasted: int = 0  # rows that belong to no live slot
+
+        slots = max(1, slots)
+        self.offsets: np.ndarray = np.zeros(slots, dtype=np.int64)
+        self.lengths: np.ndarray = np.zeros(slots, dtype=np.int64)
+        self.capacities: np.ndarray = np.zeros(slots, dtype=np.int64)
+        self.alive: np.ndarray = np.zeros(slots, dtype=bool)
+        self._free_slots: list[int] = []
+        self._slot_top: int = 0
+
+    @classmethod
+    def from_block(cls, xy: np.ndarray, lengths: np.ndarray, offsets: Optional[np.ndarray] = None) -> 'VertexStore':
+        """Creates a store around an existing block of vertices, e.g. a memory-mapped file. The block is not copied
+        nor read: its rows are paged in only when the polygons using them are accessed
+
+        :param xy: (n, 2) array of x,y coordinates
+        :param lengths: int array, vertices of each polygon; polygon i gets the handle i
+        :param offsets: int array|None, first row of each polygon, the polygons follow each other when None
+        :return: VertexStore
+        """
+        lengths = np.asarray(lengths, dtype=np.int64)
+        if offsets is None:
+            offsets = np.cumsum(lengths) - lengths
+        store = cls(capacity=1, slots=len(lengths), dtype=xy.dtype)
+        store._xy = xy
+        store._top = len(xy)
+        store._slot_top = len(lengths)
+        store.offsets[:len(lengths)] = offsets
+        store.lengths[:len(lengths)] = lengths
+        store.capacities[:len(lengths)] = lengths  # no head-room, a polygon that grows is relocated
+        store.alive[:len(lengths)] = True
+        store._wasted = store._top - int(lengths.sum())
+        return store
+
+    def __len__(self) -> int:
+        """Number of live polygons in the store"""
+        return int(self.alive[:self._slot_top].sum())
+
+    @property
+    def vertex_total(self) -> int:
+        """Number of vertices of all the live polygons"""
+        return int(self.lengths[:self._slot_top].sum())
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the store arrays, in bytes"""
+        return self._xy.nbytes + self.offsets.nbytes + self.lengths.nbytes + self.capacities.nbytes + self.alive.nbytes
+
+    @property
+    def handles(self) -> np.ndarray:
+        """Handles of all the live polygons"""
+        return np.flatnonzero(self.alive[:self._slot_top])
+
+    # -----------------------
+    # Slots
+    # -----------------------
+
+    def add(self, points: Union[np.ndarray, Sequence]) -> int:
+        """Stores the vertices of a new polygon
+
+        :param points: (n, 2) array-like of x,y coordinates
+        :return: int handle of the polygon slot
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        handle = self._slot_new()
+        length = len(points)
+        offset = self._rows_reserve(length + self.SLOT_HEADROOM)
+        self._xy[offset:offset + length] = points
+        self.offsets[handle] = offset
+        self.lengths[handle] = length
+        self.capacities[handle] = length + self.SLOT_HEADROOM
+        self.alive[handle] = True
+        return handle
+
+    def remove(self, handle: int) -> None:
+        """Releases the slot of a polygon"""
+        if not self.alive[handle]:
+            return
+        self._wasted += int(self.capacities[handle])
+        self.alive[handle] = False
+        self.lengths[handle] = 0
+        self.capacities[handle] = 0
+        self._free_slots.append(handle)
+        self._compact_if_needed()
+
+    def clear(self) -> None:
+        """Releases all the slots"""
+        self._top = 0
+        self._wasted = 0
+        self._slot_top = 0
+        self._free_slots.clear()
+        self.alive[:] = False
+        self.lengths[:] = 0
+        self.capacities[:] = 0
+
+    def view(self, handle: int) -> np.ndarray:
+        """Returns the (n, 2) vertices of a polygon, as a view on the store block"""
+        offset = self.offsets[handle]
+        return self._xy[offset:offset + self.lengths[handle]]
+
+    def length(self, handle: int) -> int:
+        return int(self.lengths[handle])
+
+    def gather(self, handles: Optional[Iterable[int]] = None) -> np.ndarray:
+        """Returns the vertices of many polygons (all the live ones when handles is None), one polygon after the
+        other in the order of handles, as a (n, 2) copy"""
+        handles = self._handles(handles)
+        if not len(handles):
+            return np.zeros((0, 2), dtype=self.dtype)
+        rows, _ = self._rows(handles)
+        return self._xy[rows]
+
+    def set(self, handle: int, points: Union[np.ndarray, Sequence]) -> None:
+        """Replaces all the vertices of a polygon"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        length = len(points)
+        if length > self.capacities[handle]:
+            self._slot_grow(handle, length)
+        offset = self.offsets[handle]
+        self._xy[offset:offset + length] = points
+        self.lengths[handle] = length
+
+    def set_vertex(self, handle: int, index: int, point: Sequence) -> None:
+        """Moves a single vertex of a polygon
+
+        :raises IndexError: when the index is out of the polygon range
+        """
+        self.view(handle)[index] = point[0], point[1]
+
+    def insert(self, handle: int, index: int, point: Sequence) -> None:
+        """Inserts a vertex at index, shifting the following vertices"""
+        length = int(self.lengths[handle])
+        index = max(0, min(index, length))
+        if length + 1 > self.capacities[handle]:
+            self._slot_grow(handle, length + 1)
+        offset = int(self.offsets[handle])
+        self._xy[offset + index + 1:offset + length + 1] = self._xy[offset + index:offset + length]
+        self._xy[offset + index] = point[0], point[1]
+        self.lengths[handle] = length + 1
+
+    def pop(self, handle: int, index: int = -1) -> np.ndarray:
+        """Removes and returns the vertex at index
+
+        :raises IndexError: when the index is out of the polygon range
+        """
+        length = int(self.lengths[handle])
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(f'vertex index {index} out of range')
+        offset = int(self.offsets[handle])
+        vertex = self._xy[offset + index].copy()
+        self._xy[offset + index:offset + length - 1] = self._xy[offset + index + 1:offset + length]
+        self.lengths[handle] = length - 1
+        return vertex
+
+    # -----------------------
+    # Geometry
+    # -----------------------
+
+    def centroid(self, handle: int) -> np.ndarray:
+        """Vertices average of a polygon"""
+        vertices = self.view(handle)
+        if not len(vertices):
+            return np.zeros(2)
+        return vertices.mean(axis=0)
+
+    def centroids(self, handles: Optional[Iterable[int]] = None) -> np.ndarray:
+        """Vertices average of many polygons (all the live ones when handles is None) in one pass
+
+        :return: (k, 2) array ordered as the handles
+        """
+        handles = self._handles(handles)
+        if not len(handles):
+            return np.zeros((0, 2))
+        rows, owners = self._rows(handles)
+        points = self._xy[rows]
+        sums = np.empty((len(handles), 2))
+        sums[:, 0] = np.bincount(owners, weights=points[:, 0], minlength=len(handles))
+        sums[:, 1] = np.bincount(owners, weights=points[:, 1], minlength=len(handles))
+        lengths = np.maximum(self.lengths[handles], 1)
+        return sums / lengths[:, None]
+
+    def translate(self, handle: int, delta: Sequence) -> None:
+        """Moves every vertex of a polygon by delta"""
+        self.view(handle)[:] += (delta[0], delta[1])
+
+    def translate_all(self, delta: Sequence) -> None:
+        """Moves every vertex of every polygon by delta"""
+        self._xy[:self._top] += (delta[0], delta[1])
+
+    def rotate(self, handle: int, angle: float, origin: Optional[Sequence] = None) -> None:
+        """Rotates a polygon by angle (radians) around origin, its centroid by default"""
+        vertices = self.view(handle)
+        if not len(vertices):
+            return
+        origin = self.centroid(handle) if origin is None else np.asarray(origin, dtype=np.float64)
+        vertices[:] = rotate_points(vertices, origin, angle)
+
+    def rotate_many(self, handles: Optional[Iterable[int]], angle: float) -> None:
+        """Rotates many polygons (all the live ones when handles is None) each around its own centroid"""
+        handles = self._handles(handles)
+        if not len(handles):
+            return
+        centroids = self.centroids(handles)
+        rows, owners = self._rows(handles)
+        origins = centroids[owners]
+        self._xy[rows] = rotate_points(self._xy[rows], origins, angle)
+
+    def bounds(self, handle: int) -> tuple[float, float, float, float]:
+        """Bounding box of a polygon (min_x, min_y, max_x, max_y)"""
+        vertices = self.view(handle)
+        if not len(vertices):
+            return 0., 0., 0., 0.
+        min_x, min_y = vertices.min(axis=0)
+        max_x, max_y = vertices.max(axis=0)
+        return float(min_x), float(min_y), float(max_x), float(max_y)
+
+    # -----------------------
+    # Memory
+    # -----------------------
+
+    def compact(self) -> None:
+        """Packs all the live slots at the beginning of the block, reclaiming the holes"""
+        handles = self.handles
+        if not len(handles):
+            self._top = 0
+            self._wasted = 0
+            return
+        handles = handles[np.argsort(self.offsets[handles], kind='stable')]
+        top = 0
+        for handle in handles:
+            offset, length = int(self.offsets[handle]), int(self.lengths[handle])
+            capacity = length + self.SLOT_HEADROOM
+            if offset != top:
+                self._xy[top:top + length] = self._xy[offset:offset + length]  # moves backward, never overlaps badly
+            self.offsets[handle] = top
+            self.capacities[handle] = capacity
+            top += capacity
+        self._top = top
+        self._wasted = 0
+
+    @property
+    def mapped_file(self) -> Optional[str]:
+        """Path of the file the block is memory-mapped on (see from_block), None when the block is in memory"""
+        return self._xy.filename if isinstance(self._xy, np.memmap) else None
+
+    def load_in_memory(self) -> None:
+        """Copies a memory-mapped block to memory and releases the mapping, so the file can be replaced or deleted"""
+        if isinstance(self._xy, np.memmap):
+            self._xy = np.array(self._xy)
+
+    def _compact_if_needed(self) -> None:
+        if self._wasted > 64 and self._wasted * 2 > self._top:
+            self.compact()
+
+    def _handles(self, handles: Optional[Iterable[int]]) -> np.ndarray:
+        if handles is None:
+            return self.handles
+        return np.fromiter(handles, dtype=np.int64)
+
+    def _rows(self, handles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the block rows of the given polygons and, for each row, the position of its polygon in handles"""
+        lengths = self.lengths[handles]
+        owners = np.repeat(np.arange(len(handles)), lengths)
+        starts = np.cumsum(lengths) - lengths
+        rows = np.arange(int(lengths.sum())) - np.repeat(starts, lengths) + np.repeat(self.offsets[handles], lengths)
+        return rows, owners
+
+    def _slot_new(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+        if self._slot_top == len(self.offsets):
+            size = len(self.offsets) * 2
+            self.offsets = np.resize(self.offsets, size)
+            self.lengths = np.resize(self.lengths, size)
+            self.capacities = np.resize(self.capacities, size)
+            self.alive = np.resize(self.alive, size)
+            self.alive[self._slot_top:] = False
+        handle = self._slot_top
+        self._slot_top += 1
+        return handle
+
+    def _slot_grow(self, handle: int, length: int) -> None:
+        """Relocates a slot at the end of the block with room for at least length vertices"""
+        capacity = length + self.SLOT_HEADROOM
+        offset = self._rows_reserve(capacity)  # may compact, so read the old slot only afterwards
+        old_offset, old_length = int(self.offsets[handle]), int(self.lengths[handle])
+        self._xy[offset:offset + old_length] = self._xy[old_offset:old_offset + old_length]
+        self._wasted += int(self.capacities[handle])
+        self.offsets[handle] = offset
+        self.capacities[handle] = capacity
+
+    def _rows_reserve(self, rows: int) -> int:
+        """Reserves rows at the end of the block, growing it when needed. Returns the first reserved row"""
+        if self._top + rows > len(self._xy):
+            self._compact_if_needed()
+        if self._top + rows > len(self._xy):
+            size = max(len(self._xy) * 2, self._top + rows)
+            xy = np.zeros((size, 2), dtype=self.dtype)
+            xy[:self._top] = self._xy[:self._top]
+            self._xy = xy
+        offset = self._top
+        self._top += rows
+        return offset
+
+
+def rotate_points(points: np.ndarray, origin: np.ndarray, angle: float) -> np.ndarray:
+    """Rotates (n, 2) points by angle (radians) around origin, either one (2,) point or one per row (n, 2)
+    Positve angle: anti-clockwise
+    Negative angle: clockwise
+    """
+    rotated = (points - origin) @ rotation_matrix(float(angle))
+    rotated += origin
+    return rotated
@@ -5,21 +5,38 @@ from .about import ViewAbout
 class Views(ViewManager):
 
     DEFAULT_VIEW: str = "home"
+    # view name -> view class, each view is built the first time it is shown
+    VIEWS: dict = {
+        'home': ViewHome,
+        'about': ViewAbout,
+    }
 
     def __init__(self, *args):
         super().__init__(*args)
+        self.views: dict[str, ViewManager] = {}
+
+    def game_beat(self):
+        """The container draws no frame of its own: it runs the current view, whose game_beat runs the frames until
+        the view is closed, then the next current view. So the profiler and the frame pacer only see the frames of the
+        views"""
+        run_view = self.view_logic()
+        while self.app.run:
+            run_view()
+        self.clean_up_resources()
 
     def view_logic(self):
         self.app.view_current = self.DEFAULT_VIEW
-        home = ViewHome(self.app)
-        about = ViewAbout(self.app)
 
         def _update():
-            if self.app.view_current == 'home':
-                home.game_beat()
-            elif self.app.view_current == 'about':
-                about.game_beat()
-            else:
-                home.game_beat()
-
-        return _update
\ No newline at end of file
+            name = self.app.view_current if self.app.view_current in self.VIEWS else self.DEFAULT_VIEW
+            self.view_get(name).game_beat()
+
+        return _update
+
+    def view_get(self, name: str) -> ViewManager:
+        """The view name, built at its first use"""
+        view = self.views.get(name)
+        if view is None:
+            view = self.views[name] = self.VIEWS[name](self.app)
+            self.app.startup.mark(f'view {name}')
+        return view
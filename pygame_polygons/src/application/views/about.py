@@ -64,16 +64,13 @@ class ViewAbout(ViewManager):
         {app_info['__app__']}    
         """
 
-        font_imgs = []
-        for line in about_text.split('\n'):
-            font_imgs.append(self.app.font.render(line, True, (255, 255, 255)))
+        for i, line in enumerate(about_text.split('\n')):
+            div.overlay_set(f'about_text_{i}', self.app.font.render(line, True, (255, 255, 255)), (50, 150 + (i * 25)))
 
         def _update():
-            components_gui.draw(self.app.background)
             components_gui.update()
-
-            for i, text in enumerate(font_imgs):
-                div.image.blit(text, (50, 150 + ( i * 25)))
+            components_gui.draw(self.app.background)
+            self.app.dirty_rects.add_sprites(components_gui)
 
 
 
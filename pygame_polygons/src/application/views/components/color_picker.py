@@ -1,4 +1,7 @@
 import pygame
+import numpy as np
+
+from ...display import display_format
 
 class ColorPicker:
     """Color Picker Bar
@@ -13,50 +16,43 @@ class ColorPicker:
         self.rad = h // 2
         self.pwidth = w - self.rad * 2
         self.rect = pygame.Rect(x, y, self.pwidth + 12, h)
-        self.image = pygame.Surface((self.pwidth + 12, h), flags=pygame.SRCALPHA)
+        self.image = display_format(pygame.Surface((self.pwidth + 12, h), flags=pygame.SRCALPHA))
         SEE_BOX: bool = False
         if SEE_BOX:
             # use it to better see the actual size of the surface , however most of cases is better leave it off
             # because is tremendously ugly!
             self.image.fill((255, 255, 255))
 
-        self.current_color = None
-        self.c_m = {}
+        # picker colors, indexed by the quantized knob position (see _index)
+        self.colors: list[pygame.Color] = []
         for i in range(self.pwidth):
             color = pygame.Color(0)
             color.hsla = (int(360 * i / self.pwidth), 100, 50, 100)
-            width = i + self.rad
-            self.c_m[width] = color
-            pygame.draw.rect(self.image, color, (width, 2, 1, h - 5))
+            self.colors.append(color)
+        self.current_color: pygame.Color = self.colors[0]
         self.p = 0
 
-    def get_color(self, first_value: bool = False):
+        # draw the gradient bar at once, one column per color
+        pixels = pygame.surfarray.pixels3d(self.image)
+        pixels[self.rad:self.rad + self.pwidth, 2:h - 3] = np.array([color[:3] for color in self.colors],
+                                                                     dtype=np.uint8)[:, np.newaxis, :]
+        del pixels
+        alpha = pygame.surfarray.pixels_alpha(self.image)
+        alpha[self.rad:self.rad + self.pwidth, 2:h - 3] = 255
+        del alpha  # unlocks the surface
+
+    def _index(self) -> int:
+        """Index of the knob position in self.colors"""
+        return min(int(self.p * self.pwidth), self.pwidth - 1)
+
+    def get_color(self, first_value: bool = False) -> pygame.Color:
         """
         Get the current picker Color
-        :return:
+        :param first_value: bool get the first color of the picker instead
+        :return: pygame.Color
         """
-        if first_value:
-            self.current_color = list(self.c_m.values())[0]
-            return self.current_color
-        pos = int(self.rad + self.p * self.pwidth)
-
-        color = None
-        total_colors = len(self.c_m)
-        count = 0
-        while count < total_colors:
-            try:
-                color = self.c_m[pos]
-                if color:
-                    break
-            except KeyError:
-                pass
-
-            count += 1
-            pos += 1
-        if not color:
-            color = pygame.Color(0)
-        self.current_color = color
-        return color
+        self.current_color = self.colors[0 if first_value else self._index()]
+        return self.current_color
 
     def update(self):
         moude_buttons = pygame.mouse.get_pressed()
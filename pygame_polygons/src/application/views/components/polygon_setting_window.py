@@ -97,11 +97,15 @@ class PolygonSettingWindow(GuiComponent):
             )
 
             self.gui_group.add(btn)
-            btn.add_event_listener("click", self.change_polygon_color, rgb)
+            if color == 'custom':
+                btn.add_event_listener("click", self.change_polygon_color_custom)
+            else:
+                btn.add_event_listener("click", self.change_polygon_color, rgb)
 
             self.color_picker_colors.append((btn, rgb))
 
         self.margin_width_slider: Slider = Slider(0, 0, 150, 8)
+        self.margin_width_slider_value: Optional[int] = None  # slider value applied to the polygon
 
         # ----------------------------
         # Shape Settings
@@ -162,6 +166,13 @@ class PolygonSettingWindow(GuiComponent):
         self.gui_group.add(self.btn_reset)
         self.btn_reset.add_event_listener("click", self.vertex_reset)
 
+        # state the window was rendered with, the guis are changed only when it changes (see _pre_render)
+        self.window_position_rendered: Optional[tuple] = None
+        self.color_picker_value: Optional[float] = None
+        self.polygon_style: Optional[tuple] = None
+
+        self._color_picker_mode_apply()
+
     def _render(self):
         super()._render()
 
@@ -179,89 +190,81 @@ class PolygonSettingWindow(GuiComponent):
         super()._pre_render(*args, **kwargs)
         if self.polygon_current and polygon is not self.polygon_current:
             self._clean_up()
+        if polygon is not self.polygon_current:
+            # show the border width of the polygon, without applying it back
+            self.margin_width_slider.set_slider_value(polygon.border_width)
+            self.margin_width_slider_value = self.margin_width_slider.slide_value
         self.polygon_current = polygon
 
         # ----------------------------
         # Color Settings
 
-        polygon.border_width = self.margin_width_slider.slide_value
+        if self.margin_width_slider.slide_value != self.margin_width_slider_value:
+            # only when the slider moves, otherwise it would override an undo of the border width
+            self.margin_width_slider_value = self.margin_width_slider.slide_value
+            polygon.border_width = self.margin_width_slider_value
 
-        custom_color = self.cp.current_color
-        custom_color_btn = self.color_picker_colors[0][0]
+        if self.cp.p != self.color_picker_value:
+            self.color_picker_value = self.cp.p
+            custom_color = self.cp.get_color()
+            self.color_picker_colors[0][0].change_default_colors(
+                (custom_color[0], custom_color[1], custom_color[2], 55), custom_color)
 
-        custom_color_btn.remove_event_listeners("click")
-        custom_color_btn.add_event_listener("click", self.change_polygon_color, custom_color)
-        custom_color_btn.background_color_default = [custom_color[0], custom_color[1], custom_color[2], 55]
-        custom_color_btn.border_color_default = custom_color
+        polygon_style = (polygon.background_color, polygon.border_color)
+        if polygon_style != self.polygon_style:
+            self.polygon_style = polygon_style
+            self.color_picker.change_default_colors(polygon.background_color or None, polygon.border_color)
 
-        if polygon.background_color:
-            self.color_picker.background_color_default = polygon.background_color
-        self.color_picker.border_color_default = polygon.border_color
-        self.color_picker.move_gui_into(Vector2(self.window_position.x + 50, self.window_position.y + 50))
+        # ----------------------------
+        # Layout
 
-        if self.color_picker_mode == 'background':
-            self.color_picker_btn_background.background_color_default = (255, 255, 255)
-            self.color_picker_btn_background.change_text_color((0, 0, 0))
+        window_position = (self.window_position.x, self.window_position.y)
+        if window_position != self.window_position_rendered:
+            self.window_position_rendered = window_position
+            self._layout()
 
-            self.color_picker_btn_border.background_color_default = self.DEFAULT_WINDOW_BACKGROUND_COLOR
-            self.color_picker_btn_border.change_text_color((125, 125, 125))
+    def _layout(self) -> None:
+        """Moves the window guis relatively to the window position"""
+        x, y = self.window_position_rendered
 
-        else:
-            self.color_picker_btn_border.background_color_default = (255, 255, 255)
-            self.color_picker_btn_border.change_text_color((0, 0, 0))
+        # ----------------------------
+        # Color Settings
 
-            self.color_picker_btn_background.background_color_default = self.DEFAULT_WINDOW_BACKGROUND_COLOR
-            self.color_picker_btn_background.change_text_color((125, 125, 125))
+        self.color_picker.move_gui_into(Vector2(x + 50, y + 50))
 
         # render color picker mode btns
-        self.color_picker_btn_background.move_gui_into(
-            Vector2(self.window_position.x + 50, self.window_position.y + 15))
-        self.color_picker_btn_border.move_gui_into(
-            Vector2(self.window_position.x + 50 + self.color_picker_btn_mode_size.x, self.window_position.y + 15))
+        self.color_picker_btn_background.move_gui_into(Vector2(x + 50, y + 15))
+        self.color_picker_btn_border.move_gui_into(Vector2(x + 50 + self.color_picker_btn_mode_size.x, y + 15))
 
         for i, (color, rgb) in enumerate(self.color_picker_colors):
-            color.move_gui_into(
-                Vector2(
-                    self.window_position.x + 125,
-                    (i * 20) + self.window_position.y + 45
-                )
-            )
+            color.move_gui_into(Vector2(x + 125, (i * 20) + y + 45))
+
+        self.cp.rect.topleft = (x + 125 + 90, y + 45)
+        self.margin_width_slider.rect.topleft = (x + 125 + 90, y + 65)
 
         # ----------------------------
         # Shape Settings
 
-        self.btn_vertex_add.move_gui_into(Vector2(self.window_position.x + 50, self.window_position.y + 120))
-        self.btn_vertex_remove.move_gui_into(Vector2(self.window_position.x + 80, self.window_position.y + 120))
+        self.btn_vertex_add.move_gui_into(Vector2(x + 50, y + 120))
+        self.btn_vertex_remove.move_gui_into(Vector2(x + 80, y + 120))
 
-        self.btn_remove_all.move_gui_into(Vector2(self.window_position.x + 50, self.window_position.y + 155))
-        self.btn_reset.move_gui_into(Vector2(self.window_position.x + 50, self.window_position.y + 185))
+        self.btn_remove_all.move_gui_into(Vector2(x + 50, y + 155))
+        self.btn_reset.move_gui_into(Vector2(x + 50, y + 185))
 
     def _clean_up(self, *args, **kwargs):
         super()._clean_up()
         self.polygon_current = None
         self.view.current_selected_polygon = None
-
-        # TODO fixme currently the initial value of the slider cannot be set, it will alsway start from value 0
-        # self.margin_width_slider.set_slider_value(polygon.border_width)
+        self.margin_width_slider_value = None
+        self.polygon_style = None
 
         # reset custom color picker
-        custom_color = self.cp.get_color(first_value=True)
-        custom_color_btn = self.color_picker_colors[0][0]
-        custom_color_btn.remove_event_listeners("click")
-        custom_color_btn.add_event_listener("click", self.change_polygon_color, custom_color)
-        custom_color_btn.background_color_default = [custom_color[0], custom_color[1], custom_color[2], 55]
-        custom_color_btn.border_color_default = custom_color
+        self.cp.p = 0
+        self.color_picker_value = None
 
         # reset default color pickers
-        self.color_picker_mode: str = self.color_picker_modes[1]
-        self.color_picker.background_color_default = (255, 255, 0)
-        self.color_picker.border_color_default = (255, 255, 0)
-
-        self.color_picker_btn_border.background_color_default = (255, 255, 255)
-        self.color_picker_btn_border.change_text_color((0, 0, 0))
-
-        self.color_picker_btn_background.background_color_default = self.DEFAULT_WINDOW_BACKGROUND_COLOR
-        self.color_picker_btn_background.change_text_color((125, 125, 125))
+        self.color_picker.change_default_colors((255, 255, 0), (255, 255, 0))
+        self.color_picker_set_mode({}, self.color_picker_modes[1])
 
     # ---------------------
     # Settings methods
@@ -272,17 +275,27 @@ class PolygonSettingWindow(GuiComponent):
 
     def _render_color_picker(self) -> None:
         """Render to Component window the Color picker"""
-        cp_pos: Vector2 = Vector2(
-            Vector2(self.window_position.x + 125 + 90, self.window_position.y + 45)
-        )
-        self.cp.rect.topleft = cp_pos
-        self.cp.image.get_rect(topleft=cp_pos)
         self.cp.update()
         self.cp.draw(self.screen)
+        self.app.dirty_rects.add(self.cp.rect.inflate(self.cp.rect.height, 0))  # the knob goes a bit outside
 
     def color_picker_set_mode(self, _: dict, color_mode: str, *__, **___) -> None:
         """Set the picker color mode"""
-        self.color_picker_mode = color_mode
+        if color_mode != self.color_picker_mode:
+            self.color_picker_mode = color_mode
+            self._color_picker_mode_apply()
+
+    def _color_picker_mode_apply(self) -> None:
+        """Highlights the button of the current picker color mode"""
+        if self.color_picker_mode == 'background':
+            btn_selected, btn_unselected = self.color_picker_btn_background, self.color_picker_btn_border
+        else:
+            btn_selected, btn_unselected = self.color_picker_btn_border, self.color_picker_btn_background
+
+        btn_selected.change_default_colors((255, 255, 255), None)
+        btn_selected.change_text_color((0, 0, 0))
+        btn_unselected.change_default_colors(self.DEFAULT_WINDOW_BACKGROUND_COLOR, None)
+        btn_unselected.change_text_color((125, 125, 125))
 
     def change_polygon_color(self, _: dict, color: tuple, *__, **___) -> None:
         """Change the polygon background color or border color, depending on the current mode"""
@@ -299,15 +312,15 @@ class PolygonSettingWindow(GuiComponent):
 
             self.polygon_current.border_color = color
 
+    def change_polygon_color_custom(self, event: dict, *_, **__) -> None:
+        """Change the polygon color to the one of the color picker"""
+        self.change_polygon_color(event, self.cp.get_color())
+
     def _render_margin_width_slider(self) -> None:
         """Render to Component window the Color picker"""
-        pos: Vector2 = Vector2(
-            Vector2(self.window_position.x + 125 + 90, self.window_position.y + 65)
-        )
-        self.margin_width_slider.rect.topleft = pos
-        self.margin_width_slider.image.get_rect(topleft=pos)
         self.margin_width_slider.update()
         self.margin_width_slider.draw(self.screen)
+        self.app.dirty_rects.add(self.margin_width_slider.rect.inflate(self.margin_width_slider.rect.height, 0))
 
     # ----------------------------
     # Shape Settings
@@ -326,18 +339,15 @@ class PolygonSettingWindow(GuiComponent):
         polygon: Polygon = self.polygon_current
 
         # Increase the vertices count and get new vertices
-        polygon.vertex_count += 1
-        vertices: list[Vector2] = Polygon.draw_regular_polygon(polygon.vertex_count, polygon.radius, polygon.centroid)
+        vertices = Polygon.draw_regular_polygon(polygon.vertex_count + 1, polygon.radius, polygon.centroid)
 
         # now we need to determine the new vertex position
         vertices_added_current = polygon.vertices_added
         vertices_added_total = len(vertices_added_current)
         if not vertices_added_total:
             add_vertex_in = 1
-            polygon.vertices_added = [(1, vertices[0])]
         else:
-            get_latest_added_vertex = vertices_added_current[-1]
-            latest_index = get_latest_added_vertex[0]
+            latest_index = vertices_added_current[-1]
 
             add_vertex_in = (latest_index + 2)
             if add_vertex_in == len(vertices) - 2:
@@ -345,21 +355,12 @@ class PolygonSettingWindow(GuiComponent):
             elif add_vertex_in >= len(vertices) - 1:  # FIXME_IS_BROKEN:(
                 add_vertex_in = 1
 
-            try:
-                polygon.vertices_added.append((add_vertex_in, vertices[add_vertex_in]))
-            except IndexError as err:
-                print(err)
-                traceback.print_exc()
-
-        vertices_current = polygon.vertices
         try:
-            vertices_current.insert(add_vertex_in, vertices[add_vertex_in])
+            polygon.vertex_insert(add_vertex_in, vertices[add_vertex_in], added=True)
         except IndexError as err:
             print(err)
             traceback.print_exc()
 
-        polygon.vertices = vertices_current
-
     def vertex_remove(self, event: dict, *_, **__):
         """Removes latest added vertix"""
         if 'MOUSE_LEFT' not in event:
@@ -367,14 +368,8 @@ class PolygonSettingWindow(GuiComponent):
         polygon: Polygon = self.polygon_current
         if polygon.vertex_count == 3 or not polygon.vertices_added:
             return
-        polygon.vertex_count -= 1
-        polygon_vertices = polygon.vertices
-
-        vertices_added_current = polygon.vertices_added
-        get_latest_added_vertex = vertices_added_current.pop()
-        latest_index = get_latest_added_vertex[0]
-        polygon_vertices.pop(latest_index)  # remove last inserted vertex
-        polygon.vertices = polygon_vertices
+        latest_index = polygon.vertices_added[-1]
+        polygon.vertex_remove(latest_index, added=True)  # remove last inserted vertex
 
     def vertex_remove_all(self, event: dict, *_, **__):
         """Remove all added vertices to the polygon however the original vertices x,y position won't change"""
@@ -384,15 +379,9 @@ class PolygonSettingWindow(GuiComponent):
         polygon: Polygon = self.polygon_current
         if polygon.vertex_count == 3 or not polygon.vertices_added:
             return
-        polygon.vertex_count -= len(polygon.vertices_added)
-        polygon_vertices = polygon.vertices
-
-        for vertex_added in reversed(polygon.vertices_added):
-            index = vertex_added[0]
-            polygon_vertices.pop(index)  # remove last inserted vertex
-
-        polygon.vertices_added.clear()
-        polygon.vertices = polygon_vertices
+        while polygon.vertices_added:
+            index = polygon.vertices_added[-1]
+            polygon.vertex_remove(index, added=True)  # remove last inserted vertex
 
     def vertex_reset(self, event: dict, *_, **__):
         """Reset the current Polygon to its initial values"""
@@ -1,6 +1,7 @@
-from typing import Optional
 import pygame
 
+from ...display import display_format
+
 
 class Slider:
     """Component representation of a range slider
@@ -14,73 +15,55 @@ class Slider:
         self.rad = h // 2
         self.pwidth = w - self.rad * 2
         self.rect = pygame.Rect(x, y, self.pwidth + 12, h)
-        self.image = pygame.Surface((self.pwidth + 12, h), flags=pygame.SRCALPHA)
+        self.image = display_format(pygame.Surface((self.pwidth + 12, h), flags=pygame.SRCALPHA))
         SEE_BOX: bool = False
         if SEE_BOX:
             # use it to better see the actual size of the surface , however most of cases is better leave it off
             # because is tremendously ugly!
             self.image.fill((255, 255, 255))
 
-        color = pygame.Color("white")
-
+        # slider values, indexed by the quantized knob position (see _index)
+        self.values: list[int] = [max(1, i) for i in range(self.pwidth)]
         self.slide_value: int = 1
-        self.slide_mapping: dict = {}
-        for i in range(self.pwidth):
-            width = i + self.rad
-            self.slide_mapping[width] = i
-            pygame.draw.rect(self.image, color, (width, 2, 1, h - 5))
         self.p = 0
 
+        # draw the bar at once
+        pixels = pygame.surfarray.pixels3d(self.image)
+        pixels[self.rad:self.rad + self.pwidth, 2:h - 3] = 255
+        del pixels
+        alpha = pygame.surfarray.pixels_alpha(self.image)
+        alpha[self.rad:self.rad + self.pwidth, 2:h - 3] = 255
+        del alpha  # unlocks the surface
+
+    def _index(self) -> int:
+        """Index of the knob position in self.values"""
+        return min(int(self.p * self.pwidth), self.pwidth - 1)
+
     def get_slider_value(self) -> int:
         """
         Get the current slide value
         :return: int
         """
+        self.slide_value = self.values[self._index()]
+        return self.slide_value
 
-        pos = int(self.rad + self.p * self.pwidth)
-
-        value: Optional[int] = None
-        total_values = len(self.slide_mapping)
-        count = 0
-        while count < total_values:
-            try:
-                value = self.slide_mapping[pos]
-                if value:
-                    break
-            except KeyError:
-                pass
+    def set_slider_value(self, value: int) -> None:
+        """Moves the slider knob to the given value, clamped to the slider range
 
-            count += 1
-            pos += 1
-        if value is None:  # grap last value
-            value = list(self.slide_mapping)[-1]
-        value = max(1, value)
-        self.slide_value = value
-        return value
-
-    def set_slider_value(self, value: int):
-        """set the slider to the given int value
-        TODO: fix me, how to set the initiali value of the slider ????
-        :param value:
+        :param value: int
         :return:
         """
-
-        # reverse the mapping (value are key and key ase value
-        slide_mapping_reversed = {v : k for k, v in self.slide_mapping.items()}
-        if value in slide_mapping_reversed:
-            key = slide_mapping_reversed[value]
+        index = max(0, min(value, self.pwidth - 1))
+        self.p = (index + .5) / self.pwidth  # the middle of the position, see _index
+        self.get_slider_value()
 
     def update(self):
-        # TODO: fix me, we should be able to set self.p by a parameter so that
-        # when we open a particular value x, we can request and which level is currently the slider!
         moude_buttons = pygame.mouse.get_pressed()
         mouse_pos = pygame.mouse.get_pos()
         if moude_buttons[0] and self.rect.collidepoint(mouse_pos):
             self.p = (mouse_pos[0] - self.rect.left - self.rad) / self.pwidth
             self.p = (max(0, min(self.p, 1)))
 
-
-
         self.get_slider_value()
 
     def draw(self, surf):
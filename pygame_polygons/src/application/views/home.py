@@ -1,18 +1,29 @@
+import threading
+from time import perf_counter
 import pygame
 from pygame.math import Vector2
-from typing import Optional
+from typing import Iterator, Optional
+import numpy as np
 from ..gui import GuiPanel, GuiButton
 from .view_manager import ViewManager
+from ...config.constants import JOURNAL_MAX_EDITS, JOURNAL_MAX_SIZE, UNDO_KEY, REDO_KEY, SCENE_FILE, \
+    SCENE_SAVE_KEY, SCENE_LOAD_KEY, SCENE_EXPORT_FILE, SCENE_EXPORT_KEY, SCENE_IMPORT_FILE, SCENE_IMPORT_KEY, \
+    IMPORT_MAX_VERTICES, IMPORT_MARGIN, CAMERA_PAN_BUTTONS, CAMERA_RESET_KEY, CAMERA_CULL_MARGIN, STAR_ROTATION_SPEED, \
+    HULL_KEY, SIMPLIFY_KEY, SIMPLIFY_TOLERANCE, OVERLAPS_VISIBLE, OVERLAPS_TOGGLE_KEY, OVERLAPS_COLOR, OVERLAPS_WIDTH
 
 from .components import PolygonSettingWindow
 
-from ..services import ShapeController
+from ..services import ShapeController, SpatialHash, EditJournal, SceneFile, SceneExporter, ShapeImporter, \
+    SweepAndPrune
 from ..shapes import Polygon
+from ..shapes.geometry import convex_hull, simplified
 
 
 class ViewHome(ViewManager):
     SHAPE_VERTEX_MIN: int = 3
     SHAPE_VERTEX_MAX: int = 100
+    PANEL_LEFT_WIDTH: int = 250
+    POINTER_MARGIN: int = 3  # pixels around the mouse pointer that 'hooks' a vertex or a centroid (on the screen)
 
     VIEW_MODES: tuple = ('polygons', 'polygon_selecting', 'polygon_selected')
 
@@ -22,6 +33,14 @@ class ViewHome(ViewManager):
         # Shapes
         self.polygons: list[Polygon] = []
         self.stars: list[Polygon] = []
+        self.spatial_index: SpatialHash = SpatialHash(self.app.chunk)  # mouse hit-testing of the polygons
+        self.journal: EditJournal = EditJournal(JOURNAL_MAX_EDITS, JOURNAL_MAX_SIZE)  # undo / redo of the polygons
+        self.broad_phase: SweepAndPrune = SweepAndPrune()  # which polygons intersect
+        self.polygons_visible: list[Polygon] = []  # in the view of the camera, found once per frame
+        self.polygon_indexes: dict[Polygon, int] = {}  # polygon -> its index in polygons, for the hit-testing
+        self.overlaps_visible: bool = OVERLAPS_VISIBLE
+        self.scene_export_thread: Optional[threading.Thread] = None  # export running in background
+        self.scene_import_batches: Optional[Iterator[list[np.ndarray]]] = None  # import running, one batch per frame
 
         self.shape_new_vertex: int = 3
         self.current_figure: tuple = ()
@@ -30,17 +49,29 @@ class ViewHome(ViewManager):
         self.mode: str = self.VIEW_MODES[0]
 
         # ------------- GUI components ------------- #
-        self.gui_polygon_settings: PolygonSettingWindow = PolygonSettingWindow(self.app, self)
+        self._gui_polygon_settings: Optional[PolygonSettingWindow] = None  # built when first opened
 
         # ------------- INPUTS ------------- #
 
         # mouse
         self.current_figure_wheel: bool = False
         self.current_figure_drag: bool = False
+        self.camera_pan_from: Optional[tuple] = None  # screen position of the mouse while dragging the view
 
         # keyboard
         self.event_ctrl_l: Optional[str] = None
 
+    @property
+    def gui_polygon_settings(self) -> PolygonSettingWindow:
+        """The polygon settings window, built the first time it is opened (it has many components)"""
+        if self._gui_polygon_settings is None:
+            self._gui_polygon_settings = PolygonSettingWindow(self.app, self)
+        return self._gui_polygon_settings
+
+    def simulation_step(self, step: float) -> None:
+        """The stars spin at the same speed whatever the frame rate"""
+        ShapeController.rotate_stars(self.stars, STAR_ROTATION_SPEED * step)
+
     def register_mouse_action(self, hooked: bool):
         """Register user mouse actions.
         If hooked is True, that means that an object is currenly performing an action
@@ -60,11 +91,31 @@ class ViewHome(ViewManager):
                 self.mouse_init_drag()
             elif self.app.event_listener.is_mouse_button_released_event():  # mouse release
                 self.mouse_reset_drag()
+                self.journal.seal()  # the drag is over, it is one undo step
 
     def register_keyboard_action(self, hooked: bool):
 
         if not hooked:
             ...
+        if self.app.event_listener.is_key_pressed_event(OVERLAPS_TOGGLE_KEY):
+            self.overlaps_visible = not self.overlaps_visible
+        if self.app.event_listener.is_ctrl_key_pressed_event(UNDO_KEY):
+            self.journal.undo()
+        elif self.app.event_listener.is_ctrl_key_pressed_event(REDO_KEY):
+            self.journal.redo()
+        elif self.app.event_listener.is_ctrl_key_pressed_event(SCENE_SAVE_KEY):
+            self.scene_save(SCENE_FILE)
+        elif self.app.event_listener.is_ctrl_key_pressed_event(SCENE_LOAD_KEY):
+            self.scene_load(SCENE_FILE)
+        elif self.app.event_listener.is_ctrl_key_pressed_event(SCENE_EXPORT_KEY):
+            self.scene_export(SCENE_EXPORT_FILE)
+        elif self.app.event_listener.is_ctrl_key_pressed_event(SCENE_IMPORT_KEY):
+            self.scene_import(SCENE_IMPORT_FILE)
+        elif self.app.event_listener.is_ctrl_key_pressed_event(HULL_KEY):
+            self.polygon_convex_hull()
+        elif self.app.event_listener.is_ctrl_key_pressed_event(SIMPLIFY_KEY):
+            self.polygons_simplify(SIMPLIFY_TOLERANCE)
+
         if self.event_ctrl_l == 'PRESSED':
             is_ctrl_l_released = self.app.event_listener.is_ctrl_left_released_event()
             self.event_ctrl_l = is_ctrl_l_released and 'RELEASED' or 'PRESSED'
@@ -79,6 +130,33 @@ class ViewHome(ViewManager):
             # Initalize the 'selection' mode
             self.mode = self.VIEW_MODES[1]
 
+    def register_camera_action(self, hooked: bool, mouse_screen: tuple) -> None:
+        """Pan (central or right mouse button drag) and zoom (mouse wheel) of the view, when no polygon nor gui
+        element is under the mouse. The mouse wheel over a centroid still rotates the polygon
+
+        :param hooked: bool a polygon is under the mouse
+        :param mouse_screen: tuple x,y mouse position on the screen
+        :return:
+        """
+        camera = self.app.camera
+        if self.app.event_listener.is_key_pressed_event(CAMERA_RESET_KEY):
+            camera.reset()
+
+        free = not hooked and not self.app.event_listener.element_hovered
+        pressed = pygame.mouse.get_pressed()
+        if any(pressed[button] for button in CAMERA_PAN_BUTTONS):
+            if self.camera_pan_from is not None:
+                camera.pan((mouse_screen[0] - self.camera_pan_from[0], mouse_screen[1] - self.camera_pan_from[1]))
+                self.camera_pan_from = mouse_screen
+            elif free:
+                self.camera_pan_from = mouse_screen
+        else:
+            self.camera_pan_from = None
+
+        wheel = self.app.event_listener.event_get_mouse_wheel()
+        if wheel and free:
+            camera.zoom_at(mouse_screen, camera.ZOOM_STEP if wheel == 'WHEEL_UP' else 1 / camera.ZOOM_STEP)
+
     def keyboard_reset_selected_polygon(self):
         self.current_selected_polygon = None
         self.mode = self.VIEW_MODES[0]
@@ -124,7 +202,7 @@ class ViewHome(ViewManager):
         :return:
         """
         # first we check the center, if is grabbed then it has priority over vertices
-        margin = 3
+        margin = self.POINTER_MARGIN / self.app.camera.zoom  # the mouse is in world coordinates
         if self.current_figure_center == poly_index:
             # draggin multiplier
             # fast user (like me) that move the mouse quick will notice that, so we need to
@@ -134,15 +212,18 @@ class ViewHome(ViewManager):
 
         if ShapeController.shape_vertex_is_near_mouse_pointer(mouse_current, centroid,
                                                               margin):  # give some pixel of margin
-
-            self.current_figure = ()
-            self.current_figure_center = poly_index
-            if pygame.mouse.get_cursor() != pygame.SYSTEM_CURSOR_CROSSHAIR:
-                pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_CROSSHAIR)
+            self.hook_polygon_centroid(poly_index)
             return True
 
         return False
 
+    def hook_polygon_centroid(self, poly_index: int) -> None:
+        """Hooks the centroid of a polygon, making it the current figure"""
+        self.current_figure = ()
+        self.current_figure_center = poly_index
+        if pygame.mouse.get_cursor() != pygame.SYSTEM_CURSOR_CROSSHAIR:
+            pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_CROSSHAIR)
+
     def highlight_polygon_vertex(self, matches_previous_polygon: Optional[Vector2], matches: list[Vector2]) -> bool:
 
         # when matches_previous_polygon then user is still on the previous polygon - area / functionality
@@ -153,7 +234,7 @@ class ViewHome(ViewManager):
             return True
         # Then a new vertex is approached
         if matches:
-            match = matches[0]  # todo: should get the vertex with closest to mouse and not the first found
+            match = matches[0]  # matches are sorted by distance, so this is the vertex closest to the mouse
             self.vertex_dot_focus(match)
             self.current_figure = (int(match[0]), int(match[1]))
             self.current_figure_center = None
@@ -162,65 +243,145 @@ class ViewHome(ViewManager):
 
         return False
 
+    def hook_polygon(self, mouse_current: tuple, polygon: Optional[Polygon] = None) -> Optional[str]:
+        """Finds the polygon centroid or vertex under the mouse pointer and 'hook' it.
+        What was hooked in the previous frame has priority (with a wider margin, so that a fast drag does not lose
+        it), then come the centroids and at last the vertex closest to the mouse.
+        Only the spatial index cells around the mouse are checked, so the cost does not depend on the scene size
+
+        :param mouse_current: tuple x,y mouse coordinates in the world
+        :param polygon: Polygon|None if given, only this polygon can be hooked
+        :return: str|None "HOOKED_CENTER", "HOOKED_VERTEX" or None
+        """
+        # 1) the object hooked in the previous frame
+        if self.current_figure_center is not None:
+            previous: Optional[Polygon] = self._get_polygon(self.current_figure_center)
+            if previous and (polygon is None or previous is polygon) and \
+                    self.is_near_poly_centroid(self.current_figure_center, mouse_current, previous.centroid):
+                return "HOOKED_CENTER"
+
+        if self.current_figure:
+            poly_index, vertex_index = self.current_figure
+            previous: Optional[Polygon] = self._get_polygon(poly_index)
+            margin, current = self._get_point_detection_margin(poly_index, vertex_index)
+            if current and previous and (polygon is None or previous is polygon) \
+                    and vertex_index < len(previous.vertices) \
+                    and ShapeController.shape_vertex_is_near_mouse_pointer(mouse_current,
+                                                                           previous.vertices[vertex_index], margin):
+                self.highlight_polygon_vertex(Vector2(poly_index, vertex_index), [])
+                return "HOOKED_VERTEX"
+
+        # 2) the closest centroid or vertex under the mouse
+        matches = self.spatial_index.query(mouse_current, self.POINTER_MARGIN / self.app.camera.zoom, polygon)
+        if not matches:
+            return None
+        for _, owner, vertex_index in matches:
+            if vertex_index == SpatialHash.CENTROID:  # centroids have priority over vertices
+                self.hook_polygon_centroid(self.polygon_indexes[owner])
+                return "HOOKED_CENTER"
+
+        _, owner, vertex_index = matches[0]
+        self.highlight_polygon_vertex(None, [Vector2(self.polygon_indexes[owner], vertex_index)])
+        return "HOOKED_VERTEX"
+
     def _render_polygons(self, mouse_current: tuple) -> bool:
         """Render the polygons
         Returns whether or not a polygon is 'hooked' by a user event, for instance a mouse hover
         mouse drag, mouse rotation etc..
 
-        :param mouse_current: tuple x,y mouse coordinates
+        :param mouse_current: tuple x,y mouse coordinates in the world
         :return: bool True if a polygon is currently withing a user event , False otherwise
         """
-
-        hooked: Optional[str] = None
-        for poly_index, poly in enumerate(self.polygons):
-            is_hooked = self._render_polygon(poly_index, mouse_current, hooked, is_selected=False)
-            if is_hooked and not hooked:
-                hooked = is_hooked
-
-            if hooked == "HOOKED_CENTER":
-                # Check the mode.
-                if self.mode == 'polygon_selecting':
-                    self.current_selected_polygon = poly_index
-                    self.mode = self.VIEW_MODES[2]
-                    break  # break execution of loop immediatelly
+        renderer = self.app.polygon_renderer
+        renderer.lod.frame()
+        self.polygons_visible = self._visible_polygons()
+        for polygon in self.polygons_visible:
+            self._render_polygon_vertices(polygon, renderer.draw(polygon))
+        self.app.profiler.count('polygons', len(self.polygons_visible))
+
+        hooked: Optional[str] = self.hook_polygon(mouse_current)
+        if hooked == "HOOKED_CENTER":
+            # Check the mode.
+            if self.mode == 'polygon_selecting':
+                self.current_selected_polygon = self.current_figure_center
+                self.mode = self.VIEW_MODES[2]
         return bool(hooked)
 
-    def _render_polygon(self, poly_index: int, mouse_current: tuple, hooked: Optional[str], is_selected: bool = False) -> \
-    Optional[str]:
+    def _render_polygon(self, poly_index: int, mouse_current: tuple, is_selected: bool = False) -> Optional[str]:
         polygon: Polygon = self.get_selected_polygon(poly_index)
-        if not polygon and is_selected:
-            self.keyboard_reset_selected_polygon()
+        if not polygon:
+            if is_selected:
+                self.keyboard_reset_selected_polygon()
             return None
 
-        polygon.draw()
-        centroid: Vector2 = polygon.centroid
-
-        matches: list[Vector2] = []
-        # First, wee need to collect all vertex and check if there is a match. That's because
-        # we need to know whether the user is still draggin the same vertex around. Else if we have a match
-        # the new match found is the new vertex.
-        matches_previous_polygon: Optional[Vector2] = self._render_polygon_vertices(polygon, matches, poly_index,
-                                                                                    mouse_current)
-        # Check if the user is near the center of the polygon
-        if not hooked:
-            is_it = self.is_near_poly_centroid(poly_index, mouse_current, centroid)
-            if is_it:
-                return "HOOKED_CENTER"
-
-        hooked = self.highlight_polygon_vertex(matches_previous_polygon, matches)
-        return hooked and "HOOKED_VERTEX" or None
+        self._render_polygon_vertices(polygon, self.app.polygon_renderer.draw(polygon))
+        self.app.profiler.count('polygons')
+        return self.hook_polygon(mouse_current, polygon)
 
-    def _render_polygon_vertices(self, polygon: Polygon, matches: list[Vector2], poly_index: int, mouse_current: tuple):
-        vertices: list[Vector2] = polygon.vertices
-        for vertex_index, vertex in enumerate(vertices):
-            polygon.write_vertex_coords(vertex)
+    def _render_overlaps(self) -> int:
+        """Outlines the polygons that intersect another polygon (only the selected one in the selected mode)
 
-            margin, current = self._get_point_detection_margin(poly_index, vertex_index)
-            if ShapeController.shape_vertex_is_near_mouse_pointer(mouse_current, vertex,
-                                                                  margin):  # give some pixel of margin
-                matches.append(Vector2(poly_index, vertex_index))
-                if current:  # if the current object then we can just exit the loop
-                    return Vector2(poly_index, vertex_index)
+        :return: int the pairs of polygons that intersect
+        """
+        if self.mode == 'polygon_selected' and self.current_selected_polygon is not None:
+            polygon = self.get_selected_polygon(self.current_selected_polygon)
+            partners = self.broad_phase.overlapping_with(polygon) if polygon else []
+            pairs = len(partners)
+            outlined = {polygon} if partners else set()
+            drawn = list(outlined)  # the only polygon drawn
+        else:
+            overlapping = self.broad_phase.overlapping()
+            pairs = len(overlapping)
+            outlined = {polygon for pair in overlapping for polygon in pair}
+            drawn = self.polygons_visible  # found by _render_polygons in this frame
+
+        camera = self.app.camera
+        for polygon in drawn:
+            if polygon in outlined:
+                points = camera.to_screen(polygon.vertices).tolist()
+                rect = pygame.draw.polygon(self.app.background, OVERLAPS_COLOR, points, OVERLAPS_WIDTH)
+                self.app.dirty_rects.add(rect)
+        return pairs
+
+    def _visible_polygons(self) -> list[Polygon]:
+        """The polygons whose bounding box is in the view of the camera, in the order they are drawn. Found in the
+        boxes of the spatial index, so the cost follows the polygons around the view, not the scene size"""
+        camera = self.app.camera
+        margin = CAMERA_CULL_MARGIN / camera.zoom
+        min_x, min_y, max_x, max_y = camera.world_rect()
+        return self.spatial_index.query_rect(min_x - margin, min_y - margin, max_x + margin, max_y + margin)
+
+    def _render_polygon_vertices(self, polygon: Polygon, indexes: Optional[np.ndarray] = None) -> None:
+        """Writes the coordinates of the vertices of the polygon that are on the screen
+
+        :param polygon: Polygon
+        :param indexes: np.ndarray|None the vertices kept by the level of detail the polygon is drawn with (see
+            PolygonRenderer.draw), all of them when None
+        :return:
+        """
+        camera = self.app.camera
+        vertices = polygon.vertices if indexes is None else polygon.vertices[indexes]
+        positions = None if camera.is_identity else camera.to_screen(vertices)
+        viewport = camera.viewport.inflate(CAMERA_CULL_MARGIN * 2, CAMERA_CULL_MARGIN * 2)
+        min_x, min_y, max_x, max_y = self.app.polygon_renderer.screen_bounds(polygon)
+        if min_x < viewport.left or max_x >= viewport.right or min_y < viewport.top or max_y >= viewport.bottom:
+            # partly out of the view, only the vertices on the screen are labelled
+            screen = vertices if positions is None else positions
+            inside = (screen[:, 0] >= viewport.left) & (screen[:, 0] < viewport.right) & \
+                     (screen[:, 1] >= viewport.top) & (screen[:, 1] < viewport.bottom)
+            vertices = vertices[inside]
+            positions = None if positions is None else positions[inside]
+
+        write_vertex_coords = self.app.polygon_renderer.write_vertex_coords
+        # plain floats are way faster to read than numpy rows
+        if positions is None:
+            for vertex in vertices.tolist():
+                write_vertex_coords(vertex)
+        else:
+            for vertex, position in zip(vertices.tolist(), positions.tolist()):
+                write_vertex_coords(vertex, position)
+        self.app.profiler.count('vertices', len(vertices))
+        self.app.profiler.count('labels', len(vertices) + 1)  # + the centroid one, see PolygonRenderer.draw
 
     def view_logic(self):
         # inputs
@@ -228,7 +389,7 @@ class ViewHome(ViewManager):
 
         components_gui = pygame.sprite.Group()
         # panel
-        panel_left_size = Vector2(250, self.app.win_height)
+        panel_left_size = Vector2(self.PANEL_LEFT_WIDTH, self.app.win_height)
         panel_left = GuiPanel(Vector2(0, 0), panel_left_size, self.app, self.app.background, None, {})
         components_gui.add(panel_left)
 
@@ -236,11 +397,10 @@ class ViewHome(ViewManager):
         def action(event: dict, *_, **__):
             if 'MOUSE_LEFT' not in event:
                 return
-            # Make a new draw
-            half_w = self.app.win_width / 2
-            half_h = self.app.win_height / 2
+            # Make a new draw, in the center of the view
+            half_w, half_h = self.app.camera.to_world((self.app.win_width / 2, self.app.win_height / 2))
             polygon = ShapeController.make_polygon(self.app, self.shape_new_vertex, 150, (half_w, half_h))
-            self.polygons.append(polygon)
+            self.polygon_add(polygon)
 
             # reset the new vertex counter
             self.shape_new_vertex = self.SHAPE_VERTEX_MIN
@@ -280,11 +440,31 @@ class ViewHome(ViewManager):
         # add child to panel
         panel_left.children_add(btn_vertex_add)
 
+        def undo(event: dict, *_, **__):
+            if 'MOUSE_LEFT' not in event:
+                return
+            self.journal.undo()
+
+        def redo(event: dict, *_, **__):
+            if 'MOUSE_LEFT' not in event:
+                return
+            self.journal.redo()
+
+        # undo / redo buttons
+        btn_undo = GuiButton("Undo", Vector2((panel_left_size.x / 2 - 40), 250), Vector2(70, 25),
+                             self.app, panel_left.image, panel_left, {})
+        btn_undo.add_event_listener("click", undo)
+        panel_left.children_add(btn_undo)
+
+        btn_redo = GuiButton("Redo", Vector2((panel_left_size.x / 2 + 40), 250), Vector2(70, 25),
+                             self.app, panel_left.image, panel_left, {})
+        btn_redo.add_event_listener("click", redo)
+        panel_left.children_add(btn_redo)
+
         def screen_clear(event: dict, *_, **__):
             if 'MOUSE_LEFT' not in event:
                 return
-            self.polygons.clear()
-            self.stars.clear()
+            self.polygons_clear()
 
         # screen clear
         btn_screen_clear = GuiButton("Clear", Vector2((panel_left_size.x / 2), 350), None,
@@ -304,13 +484,14 @@ class ViewHome(ViewManager):
             else:
                 half_h = self.app.win_height / 2 + ((len(self.stars) * len(self.stars)) - 50)
 
-            self.stars.append(ShapeController.make_polygon(self.app, 3, 150, (half_w, half_h)))
+            position = self.app.camera.to_world((half_w, half_h))  # the stars are placed in the view
+            self.stars.append(ShapeController.make_polygon(self.app, 3, 150, position))
 
         def remove_star(event: dict, *_, **__):
             if 'MOUSE_LEFT' not in event:
                 return
             if self.stars:
-                self.stars.pop()
+                self.stars.pop().dispose()
 
         btn_star = GuiButton("Make star", Vector2((panel_left_size.x / 2), 450), None,
                              self.app, panel_left.image, panel_left, {})
@@ -341,42 +522,60 @@ class ViewHome(ViewManager):
         panel_left.children_add(button_navigate_about)
 
         app_version = self.app.font_small.render(f'{self.app.app_info["__app__"]}', True, (255, 255, 255))
-
+        panel_left.overlay_set('app_version', app_version, (15, self.app.win_height - 30))
+        vertex_count_rendered: Optional[int] = None  # vertex count shown in the panel
 
         def _update():
+            profiler = self.app.profiler
+            time_start = perf_counter()
+
+            # Render Text, only when the vertex count changes
+            nonlocal vertex_count_rendered
+            if vertex_count_rendered != self.shape_new_vertex:
+                vertex_count_rendered = self.shape_new_vertex
+                font_img = self.app.font.render(f"Vertex = {self.shape_new_vertex}", True, (255, 255, 255))
+                panel_left.overlay_set('vertex_count', font_img,
+                                       ((panel_left_size.x / 2 - (font_img.get_rect().width / 2)), 100))
 
             # Update Gui Components
-            components_gui.draw(self.app.background)
             components_gui.update()
+            components_gui.draw(self.app.background)
+            self.app.dirty_rects.add_sprites(components_gui)
 
-            # Render Text
-            about_text1 = f"Vertex = {self.shape_new_vertex}"
-            font_img = self.app.font.render(about_text1, True, (255, 255, 255))
-            panel_left.image.blit(font_img, Vector2((panel_left_size.x / 2 - (font_img.get_rect().width / 2)), 100))
-
-            # make draws
-            mouse_current = pygame.mouse.get_pos()
+            # make draws, the shapes are hooked and dragged in world coordinates
+            mouse_screen = pygame.mouse.get_pos()
+            mouse_current = self.app.camera.to_world(mouse_screen)
             mouse_x = mouse_current[0]
             mouse_y = mouse_current[1]
 
-            panel_left.image.blit(app_version, Vector2(15, self.app.win_height - 30))
+            time_start = profiler.measure('gui', time_start)
 
             if self.mode == 'polygon_selected' and self.current_selected_polygon is not None:
                 polygon: Polygon = self.get_selected_polygon(self.current_selected_polygon)
                 if not polygon:
                     self.keyboard_reset_selected_polygon()
                 else:
-                    self.gui_polygon_settings.render(polygon.centroid, polygon)
+                    centroid = self.app.camera.to_screen((polygon.centroid.x, polygon.centroid.y))
+                    self.gui_polygon_settings.render(Vector2(*centroid), polygon)
+                    time_start = profiler.measure('polygon_settings', time_start)
 
+            if self.scene_import_batches is not None:
+                self.scene_import_step()
+                time_start = profiler.measure('import', time_start)
 
             # ---------------------------------------------------------
             # SHAPES
             # ---------------------------------------------------------
             if self.mode == 'polygon_selected' and self.current_selected_polygon is not None:
                 hooked: bool = bool(
-                    self._render_polygon(self.current_selected_polygon, mouse_current, None, is_selected=True))
+                    self._render_polygon(self.current_selected_polygon, mouse_current, is_selected=True))
             else:
                 hooked: bool = self._render_polygons(mouse_current)
+            time_start = profiler.measure('render_polygons', time_start)
+
+            if self.overlaps_visible:
+                profiler.count('overlaps', self._render_overlaps())
+                time_start = profiler.measure('overlaps', time_start)
 
             # -------------------------------------------------------- #
 
@@ -385,6 +584,7 @@ class ViewHome(ViewManager):
             # ---------------------------------------------------------
             self.register_mouse_action(hooked)
             self.register_keyboard_action(hooked)
+            self.register_camera_action(hooked, mouse_screen)
 
             # .............. drag center ............... #
             if self.current_figure_center is not None and self.current_figure_drag:
@@ -402,16 +602,138 @@ class ViewHome(ViewManager):
 
                 ShapeController().rotate_polygon(self.polygons, self.current_figure_center, direction)
 
+            if not pygame.mouse.get_pressed()[0] and self.current_figure_center is None:
+                # nothing is dragged nor rotated, the next change starts a new undo step
+                self.journal.seal()
+            time_start = profiler.measure('input', time_start)
+
             # ---------------------------------------------------------
             #  STARTS
             # ---------------------------------------------------------
-            ShapeController().draw_stars(self.app.background, self.stars)
+            ShapeController().draw_stars(self.app.background, self.stars, self.app.dirty_rects, self.app.camera)
+            profiler.measure('stars', time_start)
+            profiler.count('stars', len(self.stars))
 
         return _update
 
     # -----------------
     # Utility functions
     # -----------------
+    def polygon_add(self, polygon: Polygon) -> None:
+        """Adds a polygon to the scene, registering it to the mouse hit-testing index"""
+        polygon.spatial_index = self.spatial_index
+        polygon.journal = self.journal
+        polygon.broad_phase = self.broad_phase
+        self.spatial_index.insert(polygon)
+        self.broad_phase.insert(polygon)
+        self.polygon_indexes[polygon] = len(self.polygons)
+        self.polygons.append(polygon)
+
+    def polygons_clear(self) -> None:
+        """Removes all the polygons and stars from the scene"""
+        self.broad_phase.clear()  # before the dispose, which would remove the polygons one by one
+        for shape in (*self.polygons, *self.stars):
+            shape.dispose()
+        self.polygons.clear()
+        self.polygon_indexes.clear()
+        self.stars.clear()
+        self.spatial_index.clear()
+        self.journal.clear()
+
+    def scene_save(self, path: str) -> None:
+        """Saves the polygons and the stars to a scene file"""
+        try:
+            SceneFile.save(path, self.polygons, self.stars)
+        except OSError as err:
+            print(f"Error while saving the scene {path} | {err!r}")
+
+    def scene_load(self, path: str) -> None:
+        """Replaces the polygons and the stars with the ones of a scene file"""
+        try:
+            store, polygons, stars = SceneFile.load(path)
+        except (OSError, ValueError) as err:
+            print(f"Error while opening the scene {path} | {err!r}")
+            return
+        self.polygons_clear()
+        self.keyboard_reset_selected_polygon()
+        self.mouse_reset_drag()
+        self.app.vertex_store = store  # the new shapes are made in the store of the scene
+        for polygon in polygons:
+            self.polygon_add(polygon)
+        self.stars.extend(stars)
+
+    def scene_export(self, path: str) -> None:
+        """Exports the polygons coordinates, the file is written in background (see SceneExporter)"""
+        if self.scene_export_thread is not None and self.scene_export_thread.is_alive():
+            print(f"Export of the scene already running, {path} not exported")
+            return
+
+        def on_done(path_done: str, error: Optional[Exception]) -> None:
+            if error:
+                print(f"Error while exporting the scene {path_done} | {error!r}")
+
+        exporter = SceneExporter(self.polygons, (self.app.win_width, self.app.win_height))  # snapshot
+        self.scene_export_thread = exporter.write_in_background(path, on_done=on_done)
+
+    def scene_import(self, path: str) -> None:
+        """Starts importing the outlines of a GeoJSON or WKT file as polygons, fitted to the free area of the view.
+        The outlines are added a batch at the time, see scene_import_step"""
+        area = pygame.Rect(self.PANEL_LEFT_WIDTH, 0, self.app.win_width - self.PANEL_LEFT_WIDTH, self.app.win_height)
+        area = area.inflate(-IMPORT_MARGIN * 2, -IMPORT_MARGIN * 2)
+        left, top = self.app.camera.to_world(area.topleft)
+        right, bottom = self.app.camera.to_world(area.bottomright)
+        try:
+            importer = ShapeImporter(path, (left, top, right - left, bottom - top), IMPORT_MAX_VERTICES)
+        except ValueError as err:
+            print(f"Error while importing {path} | {err!r}")
+            return
+        self.scene_import_batches = importer.batches()
+
+    def scene_import_step(self) -> None:
+        """Adds the next batch of imported outlines to the scene"""
+        try:
+            outlines = next(self.scene_import_batches, None)
+        except (OSError, ValueError) as err:
+            print(f"Error while importing | {err!r}")
+            outlines = None
+        if outlines is None:
+            self.scene_import_batches = None
+            return
+        for outline in outlines:
+            self.polygon_add(ShapeController.make_polygon_from_vertices(self.app, outline))
+
+    def polygon_convex_hull(self) -> None:
+        """The polygon under the mouse pointer (or the selected one) becomes its convex hull, computed in background
+        (see GeometryJobs)"""
+        poly_index = self.current_figure_center
+        if poly_index is None:
+            poly_index = self.current_selected_polygon
+        polygon = self._get_polygon(poly_index) if poly_index is not None else None
+        if polygon is not None:
+            self.app.geometry_jobs.submit('outline', polygon, convex_hull, self._polygon_outline_apply)
+
+    def polygons_simplify(self, tolerance: float) -> None:
+        """Simplifies all the polygons, computed in background (see GeometryJobs)
+
+        :param tolerance: float pixels, see shapes.simplify
+        :return:
+        """
+        for polygon in self.polygons:
+            self.app.geometry_jobs.submit('outline', polygon, simplified, self._polygon_outline_apply, tolerance)
+
+    @staticmethod
+    def _polygon_outline_apply(polygon: Polygon, vertices: np.ndarray) -> None:
+        """Replaces the outline of a polygon with the one computed by a geometry job, if it changed"""
+        if len(vertices) < 3 or len(vertices) == polygon.vertex_count and np.array_equal(vertices, polygon.vertices):
+            return
+        polygon.vertices_replace(vertices)
+
+    def _get_polygon(self, poly_index: int) -> Optional[Polygon]:
+        """Same of get_selected_polygon, without complaining when the polygon does not exist"""
+        if 0 <= poly_index < len(self.polygons):
+            return self.polygons[poly_index]
+        return None
+
     def get_selected_polygon(self, poly_index: int) -> Optional[Polygon]:
         """Retrieves the selected Polygon
         :param poly_index: int
@@ -437,7 +759,7 @@ class ViewHome(ViewManager):
             print(str(err))
             return
         else:
-            polygon.vertex_focus(int(polygon_index.y))
+            self.app.polygon_renderer.vertex_focus(polygon, int(polygon_index.y))
 
     def _get_point_detection_margin(self, poly_index: int, vertex_index: int) -> tuple:
         """Detects the margin by witch a point is sensible to a mouse detection when is near
@@ -448,7 +770,7 @@ class ViewHome(ViewManager):
         :param vertex_index:
         :return:
         """
-        margin = 3
+        margin = self.POINTER_MARGIN / self.app.camera.zoom  # the mouse is in world coordinates
         current = False
         if self.is_current_object_used(poly_index, vertex_index):
             # draggin multiplier
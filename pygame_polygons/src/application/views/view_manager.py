@@ -1,6 +1,9 @@
 import sys
+from time import perf_counter
+from typing import Callable
 import pygame
 from ...app import App
+from ...config.constants import HUD_TOGGLE_KEY, STARTUP_REPORT
 
 
 class ViewManager:
@@ -12,16 +15,31 @@ class ViewManager:
         self.close_view: bool = False
 
     def screen_clear(self):
+        dirty_rects = self.app.dirty_rects
+        if dirty_rects.enabled:
+            # only what was drawn in the previous frame is on the background
+            for rect in dirty_rects.previous:
+                self.app.background.fill(pygame.Color("black"), rect)
+            return
         self.app.background.fill(pygame.Color("black"))
 
     def screen_paint(self):
+        dirty_rects = self.app.dirty_rects
+        if dirty_rects.enabled:
+            for rect in dirty_rects.frame_end():
+                self.app.window.blit(self.app.background, rect, rect)
+            return
         self.app.window.blit(self.app.background, (0, 0))
 
     def game_update(self):
+        dirty_rects = self.app.dirty_rects
+        if dirty_rects.enabled:
+            pygame.display.update(dirty_rects.painted)
+            return
         pygame.display.update()
 
     def game_tick(self):
-        self.app.clock.tick(self.app.frames)
+        self.app.pacer.tick()
 
     def events_handler(self):
         self.app.event_listener.events_listen()
@@ -30,6 +48,12 @@ class ViewManager:
         """@overide"""
         pass
 
+    def simulation_step(self, step: float) -> None:
+        """@overide Advances the animations of the view by step seconds, always the same amount (see FixedTimestep).
+        Called before the frame is drawn, as many times as the time elapsed requires
+        """
+        pass
+
     def view_logic(self):
 
         def _update():
@@ -44,35 +68,77 @@ class ViewManager:
             if self.close_view:
                 self._reset_view()
                 return  # exit without break the loop!
-            self.screen_clear()  # screen clear
-
-            # ==============================================================================
-            #                               GAME LOGIC HERE
-            # ==============================================================================
-
-            # ....
-            game_update()
-
-            # ==============================================================================
-            # ..............................................................................
-            # ==============================================================================
-
-            # This in order
-            self.events_handler()  # 1) Events
-            self.game_update()  # 2) Update the game
-            self.screen_paint()  # 3) Repaint the screen
-            self.game_tick()  # 4) Wait 60 Frames
+            self.game_frame(game_update)
 
         # Do some resource clean up ...
         self.clean_up_resources()
 
+    def game_frame(self, game_update: Callable[[], None]) -> None:
+        """Runs a single frame of the view, timing each phase in the app profiler
+
+        :param game_update: Callable the view logic, see view_logic
+        :return:
+        """
+        profiler = self.app.profiler
+        time_start = perf_counter()
+
+        # the simulation catches up with the time elapsed in the previous frame, in fixed steps
+        timestep = self.app.timestep
+        steps = timestep.advance(self.app.pacer.elapsed)
+        for _ in range(steps):
+            self.simulation_step(timestep.step)
+        profiler.count('steps', steps)
+        time_start = profiler.measure('simulation', time_start)
+
+        # results of the geometry computed in background, the polygons only change between two frames
+        profiler.count('jobs', self.app.geometry_jobs.apply_completed())
+        time_start = profiler.measure('jobs', time_start)
+
+        self.screen_clear()  # screen clear
+        time_start = profiler.measure('clear', time_start)
+
+        # ==============================================================================
+        #                               GAME LOGIC HERE
+        # ==============================================================================
+
+        # ....
+        game_update()
+        time_start = profiler.measure('logic', time_start)
+        self.app.dirty_rects.add(self.app.hud.draw(self.app.background))
+        time_start = profiler.measure('hud', time_start)
+
+        # ==============================================================================
+        # ..............................................................................
+        # ==============================================================================
+
+        # This in order
+        self.events_handler()  # 1) Events
+        if self.app.event_listener.is_key_pressed_event(HUD_TOGGLE_KEY):
+            self.app.hud.toggle()
+        self.app.pointer_router.route()  # mouse enter / leave / click of the gui elements
+        time_start = profiler.measure('events', time_start)
+        self.game_update()  # 2) Update the game
+        time_start = profiler.measure('update', time_start)
+        self.screen_paint()  # 3) Repaint the screen
+        time_start = profiler.measure('paint', time_start)
+        self.game_tick()  # 4) Wait for the next frame, see FramePacer
+        profiler.measure('tick', time_start)
+        profiler.frame_end()
+        if self.app.startup.finish() and STARTUP_REPORT:
+            print(self.app.startup.report())
 
     def _reinit_view(self):
         """Perform intial view set-up"""
         self.close_view = False  #
+        # the time spent by the previous view is not simulated by this one
+        self.app.timestep.reset()
+        self.app.pacer.restart()
+        self.app.dirty_rects.reset()  # what the previous view drew is cleared at the first frame
 
 
     def _reset_view(self):
         """Perform clean up of the view"""
+        self.app.pointer_router.reset()
+        self.app.geometry_jobs.cancel()  # the polygons of the view are gone
         if pygame.mouse.get_cursor() != pygame.SYSTEM_CURSOR_ARROW:
             pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
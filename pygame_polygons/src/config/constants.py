@@ -1,49 +1,28 @@
+import math
+import os
 import pygame
 
 # pygame constants
 CLOCK = pygame.time.Clock()
 FRAMES: int = 60
+FRAME_PACING: str = "capped"  # capped, vsync, busy_loop (less jitter, more CPU) or uncapped, see FramePacer
+SIMULATION_RATE: int = 60  # animation steps per second, whatever the frame rate
+SIMULATION_MAX_STEPS: int = 5  # animation steps run in a frame at most, when frames are late
+# radians per second of the spinning stars: the stars used to turn by -45 radians each frame at 60 fps, which looks
+# like -45 + 14 pi (about -1.02) radians each 1/60 s
+STAR_ROTATION_SPEED: float = (-45 + 14 * math.pi) * 60
 
-# world
-display_info = pygame.display.Info()
-DISPLAY_WIDTH: int = display_info.current_w
-DISPLAY_HEIGHT: int = display_info.current_h
-
+# world: the window size is computed from the display when the app starts, see AppRunner.probe_display
 FLOOR_CHUNK: int = 64
 SCREEN_SIZE: list = ["small", "medium", "large"]
 SCREEN_SELECT: str = SCREEN_SIZE[2]
 SCREEN_SIZE_CALCS: list = ["static", "dynamic"]  # static: fix number | dynamic : calcualtes from the pc display size
 SCREEN_SIZE_TYPE: str = SCREEN_SIZE_CALCS[1]
-if SCREEN_SIZE_TYPE == "static":
-    if SCREEN_SELECT == "large":
-        WIN_WIDTH = FLOOR_CHUNK * 30  # 1920
-        WIN_HEIGHT = int(FLOOR_CHUNK * 16.875)  # 1080
-    elif SCREEN_SELECT == "medium":
-        WIN_WIDTH = FLOOR_CHUNK * 20  # 1280
-        WIN_HEIGHT = FLOOR_CHUNK * 10  # 640
-    else:  # Small
-        WIN_WIDTH = FLOOR_CHUNK * 10  # 640
-        WIN_HEIGHT = FLOOR_CHUNK * 5  # 320
-else:
-    if SCREEN_SELECT == "large":
-        WIN_WIDTH = DISPLAY_WIDTH - 0
-        WIN_HEIGHT = DISPLAY_HEIGHT - 0
-        FLOOR_CHUNK = int(WIN_WIDTH / 30)  # at best should be 64
-    elif SCREEN_SELECT == "medium":
-        WIN_WIDTH = int(DISPLAY_WIDTH / 1.5)
-        WIN_HEIGHT = int(DISPLAY_HEIGHT / 1.5)
-        FLOOR_CHUNK = int(WIN_WIDTH / 20)
-    else:  # Small
-        WIN_WIDTH = int(DISPLAY_WIDTH / 3)
-        WIN_HEIGHT = int(DISPLAY_HEIGHT / 3.375)
-        FLOOR_CHUNK = int(WIN_WIDTH / 10)
 
-# ensure no decimal in the screen size
-WIN_WIDTH: int = int(WIN_WIDTH)
-WIN_HEIGHT: int = int(WIN_HEIGHT)
-FLOOR_CHUNK: int = int(FLOOR_CHUNK)
+# startup
+FONT_CACHE_FILE: str = os.path.join(os.path.expanduser("~"), ".cache", "pygame_polygons", "fonts.json")
+STARTUP_REPORT: bool = False  # prints the time spent in each step of the startup, up to the first frame
 
-WIN_SIZE: tuple = (WIN_WIDTH, WIN_HEIGHT)
 # inputs
 MOUSE_BUTTON_MAP: dict = {
     1: 'MOUSE_LEFT',
@@ -58,6 +37,50 @@ MOUSE_WHEEL: dict = {
     1: 'WHEEL_UP'
 }
 
+# rendering
+LABEL_CACHE_SIZE: int = 4096  # max rendered coordinates labels kept in memory
+LABEL_CACHE_COLOR: tuple = (255, 255, 255)
+DIRTY_RECTS: bool = False  # repaint only the screen regions that changed, instead of the whole screen each frame
+RENDER_SCALE: float = 1.  # below 1 the app is drawn at a lower resolution, scaled up to the window (e.g. .5 on 4K)
+
+# profiling
+PROFILER_FRAMES: int = 120  # frames kept by the frame profiler
+HUD_VISIBLE: bool = False  # show the frame timings overlay at start
+HUD_TOGGLE_KEY: int = pygame.K_F3
+
+# editing
+JOURNAL_MAX_EDITS: int = 512  # undo steps kept in memory
+JOURNAL_MAX_SIZE: int = 100_000  # vertices kept by the undo steps (only the resets keep whole polygons)
+UNDO_KEY: int = pygame.K_z  # with CTRL
+REDO_KEY: int = pygame.K_y  # with CTRL
+
+# scene file
+SCENE_FILE: str = "scene.pgs"  # saved / opened in the working directory
+SCENE_SAVE_KEY: int = pygame.K_s  # with CTRL
+SCENE_LOAD_KEY: int = pygame.K_o  # with CTRL
+SCENE_EXPORT_FILE: str = "scene.json"  # the extension picks the format: .json, .csv, .svg or .py
+SCENE_EXPORT_KEY: int = pygame.K_e  # with CTRL
+SCENE_IMPORT_FILE: str = "import.geojson"  # outlines to import: GeoJSON (.geojson, .json) or WKT (.wkt, .txt)
+SCENE_IMPORT_KEY: int = pygame.K_i  # with CTRL
+IMPORT_MAX_VERTICES: int = 1000  # vertices of each imported outline at most, the outlines are simplified
+IMPORT_MARGIN: int = 20  # pixels around the imported outlines
+
+# camera
+CAMERA_PAN_BUTTONS: tuple = (1, 2)  # indexes in pygame.mouse.get_pressed(): central and right buttons drag the view
+CAMERA_RESET_KEY: int = pygame.K_HOME  # back to no pan and no zoom
+CAMERA_CULL_MARGIN: int = 100  # pixels around the screen where polygons are still drawn (labels overflow them)
+
+# geometry jobs
+GEOMETRY_WORKERS: int = 4  # threads computing the heavy geometry in background, see GeometryJobs
+HULL_KEY: int = pygame.K_h  # with CTRL: the polygon under the mouse pointer becomes its convex hull
+SIMPLIFY_KEY: int = pygame.K_l  # with CTRL: all the polygons are simplified
+SIMPLIFY_TOLERANCE: float = 1.  # pixels, see shapes.simplify
+
+# intersections
+OVERLAPS_VISIBLE: bool = False  # highlight the polygons that intersect another one at start, see SweepAndPrune
+OVERLAPS_TOGGLE_KEY: int = pygame.K_F4
+OVERLAPS_COLOR: tuple = (255, 60, 60)
+OVERLAPS_WIDTH: int = 3  # pixels
 
 # Settings
 GUI_STYLES: dict = { # todo: make a json setting????